@@ -9,6 +9,7 @@ import time
 import warnings
 import math
 import numpy as np
+import numba as nb
 
 from neuronumba.basic.attr import Attr, HasAttr
 from neuronumba.simulator.models import Hopf, Deco2014, Montbrio
@@ -27,24 +28,179 @@ class CompactBoldSimulatorBase(HasAttr):
     weights = Attr(required=True, doc="Structural connectivity weights")
     use_temporal_avg_monitor = Attr(default=False, doc="Use the TemporalAverage monitor? Defaults to using the RawSubmonitor")
 
+    obs_var = None  # Observed model variable, set by every subclass
+
     def generate_bold(
         self,
         warmup_time: float,
-        simulated_time: float
+        simulated_time: float,
+        seed: int = None
     ) -> np.ndarray:
         start_time = time.perf_counter()
-        simulated_bold = self._generate_bold(warmup_time, simulated_time)
+        simulated_bold = self._generate_bold(warmup_time, simulated_time, seed)
         elapsed_time = time.perf_counter() - start_time
         print(f"Bold simulation completed. Took: {elapsed_time:.3e}s")
         return simulated_bold
 
+    def session(self, warmup_time: float = 0.0, simulated_time: float = None, lengths_seed: int = 0):
+        """Build the simulation objects once, for many runs (see CompactSimulationSession)."""
+        return CompactSimulationSession(self, warmup_time, simulated_time, lengths_seed)
+
     def _generate_bold(
         self,
         warmup_time: float,
-        simulated_time: float
+        simulated_time: float,
+        seed: int = None
     ) -> np.ndarray:
+        # One-shot: every object is built for this call only
+        model = self._build_model()
+        model.configure(weights=self.weights, g=self.g)
+        n_roi = np.shape(self.weights)[0]
+        sim, monitor = self._build_simulator(model, np.random.rand(n_roi, n_roi))
+        if seed is not None:
+            np.random.seed(seed)
+            _seed_numba(seed)
+
+        # Run simulation
+        sim.run(0, warmup_time + simulated_time)
+
+        return self._postprocess(monitor, warmup_time, simulated_time)
+
+    def _build_simulator(self, model, lengths):
+        """Connectivity, history, integrator, monitor and Simulator for a configured model."""
+        integrator = EulerStochastic(dt=self._integration_dt(), sigmas=model.get_noise_template() * self.sigma)
+        con = Connectivity(
+            weights=self.weights,
+            lengths=lengths*10.0 + 1.0,
+            speed=1.0
+        )
+        history = HistoryNoDelays()
+        monitor = self._make_monitor(model)
+        sim = Simulator(
+            connectivity=con,
+            model=model,
+            history=history,
+            integrator=integrator,
+            monitors=[monitor]
+        )
+        return sim, monitor
+
+    # --- Per-model hooks, used by CompactSimulationSession ---------------
+    def _build_model(self):
         raise NotImplementedError()
 
+    def _integration_dt(self) -> float:
+        return self.dt
+
+    def _monitor_period(self) -> float:
+        return self.tr / 1000.0
+
+    def _make_monitor(self, model):
+        monitor_class = TemporalAverage if self.use_temporal_avg_monitor else RawSubSample
+        return monitor_class(
+            period=self._monitor_period(),
+            monitor_vars=model.get_var_info([self.obs_var])
+        )
+
+    def _postprocess(self, monitor, warmup_time: float, simulated_time: float) -> np.ndarray:
+        # Retreive simulated data and remove warmup
+        sim_signal = monitor.data(self.obs_var)
+        start_idx = int(sim_signal.shape[0] * warmup_time / (warmup_time + simulated_time))
+        sim_signal = sim_signal[start_idx:, :]
+
+        # We can proceed to convert the signal to bold
+        bold_converter = BoldStephan2008(tr=self.tr)
+        bold_signal = bold_converter.compute_bold(sim_signal, monitor.period)
+
+        return bold_signal
+
+
+@nb.njit
+def _seed_numba(seed):
+    # Numba keeps its own random state, separate from NumPy's: it can only
+    # be seeded from compiled code.
+    np.random.seed(seed)
+
+
+# =======================================================================
+# CompactSimulationSession
+#
+# Builds the model, connectivity, history, integrator, monitor and
+# Simulator of a compact simulator once and keeps them alive across runs,
+# so a parameter sweep pays the setup once instead of on every call. run()
+# only touches what changes:
+#   - G:        the model is re-configured only when the coupling changes
+#   - seed:     NumPy's and numba's random states are re-seeded
+#   - duration: only the run length changes
+# Simulator.run() configures the history and the monitors for the requested
+# interval when it starts, which resets the initial state and the monitor
+# buffer; the returned signal is copied out of that buffer, so results of
+# earlier runs are not overwritten by later ones.
+#
+# Usage:
+#     session = CompactHopfSimulator(weights=sc, g=0.0, ...).session(warmup_time=100)
+#     for G in G_range:
+#         bold = session.run(G=G, seed=42, duration=1200)
+# =======================================================================
+class CompactSimulationSession:
+
+    def __init__(
+        self,
+        simulator: CompactBoldSimulatorBase,
+        warmup_time: float = 0.0,
+        simulated_time: float = None,
+        lengths_seed: int = 0
+    ):
+        # lengths_seed=None draws the lengths from np.random.rand (as
+        # generate_bold() always did)
+        self.simulator = simulator
+        self.warmup_time = warmup_time
+        self.simulated_time = simulated_time
+
+        self.model = simulator._build_model()
+        self.g = simulator.g
+        self.model.configure(weights=simulator.weights, g=self.g)
+
+        # Lengths are irrelevant without delays (HistoryNoDelays). A session
+        # draws them once, from their own generator, so runs do not consume
+        # the global random state
+        n_roi = np.shape(simulator.weights)[0]
+        if lengths_seed is None:
+            lengths = np.random.rand(n_roi, n_roi)
+        else:
+            lengths = np.random.default_rng(lengths_seed).random((n_roi, n_roi))
+        self.sim, self.monitor = simulator._build_simulator(self.model, lengths)
+
+    def run(
+        self,
+        G: float = None,
+        seed: int = None,
+        duration: float = None,
+        warmup_time: float = None
+    ) -> np.ndarray:
+        """
+        Simulate once with the session's objects.
+
+        G, duration and warmup_time default to the session's current values;
+        seed=None leaves the random state as it is.
+        """
+        warmup_time = self.warmup_time if warmup_time is None else warmup_time
+        duration = self.simulated_time if duration is None else duration
+        if duration is None:
+            raise ValueError("No duration given (neither to run() nor to the session)")
+
+        if G is not None and G != self.g:
+            self.model.configure(weights=self.simulator.weights, g=G)
+            self.g = G
+        if seed is not None:
+            np.random.seed(seed)
+            _seed_numba(seed)
+
+        # Run simulation
+        self.sim.run(0, warmup_time + duration)
+
+        return np.array(self.simulator._postprocess(self.monitor, warmup_time, duration))
+
 
 # =======================================================================
 # CompactHopfSimulator
@@ -60,60 +216,28 @@ class CompactHopfSimulator(CompactBoldSimulatorBase):
     dt = Attr(default=0.1, doc="Delta time for the simulation in milliseconds")
     model = Attr(default=None, doc="If need to custom configure the model. Must be a Hopf model")
 
+    obs_var = 'x'
+
     # IMPORTANT: Hopf is integrated in seconds, but to keep API consistency, we pass the parameters (tr and dt) in milliseconds.
     # So remember to convert back to seconds before using it for the Hopf simulation 
 
-    def _generate_bold(
-        self,
-        warmup_time: float,
-        simulated_time: float
-    ) -> np.ndarray:
-
+    def _build_model(self):
         model = self.model
         if model is None:
             model = Hopf()
         elif not isinstance(model, Hopf):
-            raise f"Model instance must be Hopf. Provided <{model.__class__.__name__}>"
+            raise TypeError(f"Model instance must be Hopf. Provided <{model.__class__.__name__}>")
         model.a = self.a
         model.omega = self.omega
-        model.configure(weights=self.weights, g=self.g)
+        return model
 
-        obs_var = 'x'
-        n_roi = np.shape(self.weights)[0]
-
-        # Prepare everything
+    def _integration_dt(self) -> float:
         # Remember that Hopf is integrated in seconds and not milliseconds
-        integrator = EulerStochastic(dt=(self.dt/1000.0), sigmas=model.get_noise_template() * self.sigma)
-        con = Connectivity(
-            weights=self.weights, 
-            lengths=np.random.rand(n_roi, n_roi)*10.0 + 1.0, 
-            speed=1.0
-        )
-        history = HistoryNoDelays()
-        monitor = None
-        if self.use_temporal_avg_monitor:
-            monitor = TemporalAverage(
-                period=(self.tr / 1000.0),
-                monitor_vars=model.get_var_info([obs_var])
-            )
-        else:
-            monitor = RawSubSample(
-                period=(self.tr / 1000.0),
-                monitor_vars=model.get_var_info([obs_var])
-            )
-        sim = Simulator(
-            connectivity=con,
-            model=model,
-            history=history,
-            integrator=integrator,
-            monitors=[monitor]
-        )
-
-        # Run simulation
-        sim.run(0, warmup_time + simulated_time)
+        return self.dt / 1000.0
 
+    def _postprocess(self, monitor, warmup_time: float, simulated_time: float) -> np.ndarray:
         # Retreive simulated data and remove warmup
-        sim_signal = monitor.data(obs_var)
+        sim_signal = monitor.data(self.obs_var)
         start_idx = int(warmup_time)
         sim_signal = sim_signal[start_idx:, :]
 
@@ -153,62 +277,15 @@ class CompactDeco2014Simulator(CompactBoldSimulatorBase):
     dt = Attr(default=0.1, doc="Delta time for the simulation in milliseconds")
     model = Attr(default=None, doc="If need to custom configure the model. It must be a Deco2014 model")
 
-    def _generate_bold(
-        self,
-        warmup_time: float,
-        simulated_time: float
-    ) -> np.ndarray:
+    obs_var = 're'
 
+    def _build_model(self):
         model = self.model
         if not model:
             model = Deco2014(auto_fic=True)
         elif not isinstance(model, Deco2014):
-            raise f"Model instance must be Deco2014. Provided <{model.__class__.__name__}>"
-        model.configure(weights=self.weights, g=self.g)
-
-        obs_var = 're'
-        n_roi = np.shape(self.weights)[0]
-
-        # Prepare everything
-        integrator = EulerStochastic(dt=self.dt, sigmas=model.get_noise_template() * self.sigma)
-        con = Connectivity(
-            weights=self.weights, 
-            lengths=np.random.rand(n_roi, n_roi)*10.0 + 1.0,
-            speed=1.0
-        )
-        history = HistoryNoDelays()
-        monitor = None
-        if self.use_temporal_avg_monitor:
-            monitor = TemporalAverage(
-                period=(self.tr / 1000.0),
-                monitor_vars=model.get_var_info([obs_var])
-            )
-        else:
-            monitor = RawSubSample(
-                period=(self.tr / 1000.0),
-                monitor_vars=model.get_var_info([obs_var])
-            )
-        sim = Simulator(
-            connectivity=con,
-            model=model,
-            history=history,
-            integrator=integrator,
-            monitors=[monitor]
-        )
-
-        # Run simulation
-        sim.run(0, warmup_time + simulated_time)
-
-        # Retreive simulated data and remove warmup
-        sim_signal = monitor.data(obs_var)
-        start_idx = int(sim_signal.shape[0] * warmup_time / (warmup_time + simulated_time))
-        sim_signal = sim_signal[start_idx:, :]
-
-        # We can proceed to convert the signal to bold
-        bold_converter = BoldStephan2008(tr=self.tr)
-        bold_signal = bold_converter.compute_bold(sim_signal, monitor.period)
-
-        return bold_signal
+            raise TypeError(f"Model instance must be Deco2014. Provided <{model.__class__.__name__}>")
+        return model
 
 # =======================================================================
 # CompactMontbrioSimulator
@@ -221,59 +298,12 @@ class CompactMontbrioSimulator(CompactBoldSimulatorBase):
     dt = Attr(default=0.1, doc="Delta time for the simulation in milliseconds")
     model = Attr(default=None, doc="If need to custom configure the model. It must be a Montbrio model")
 
-    def _generate_bold(
-        self,
-        warmup_time: float,
-        simulated_time: float
-    ) -> np.ndarray:
+    obs_var = 'r_e'
 
+    def _build_model(self):
         model = self.model
         if not model:
             model = Montbrio()
         elif not isinstance(model, Montbrio):
-            raise f"Model instance must be DecoMontbrio2014. Provided <{model.__class__.__name__}>"
-        model.configure(weights=self.weights, g=self.g)
-
-        obs_var = 'r_e'
-        n_roi = np.shape(self.weights)[0]
-
-        # Prepare everything
-        integrator = EulerStochastic(dt=self.dt, sigmas=model.get_noise_template() * self.sigma)
-        con = Connectivity(
-            weights=self.weights, 
-            lengths=np.random.rand(n_roi, n_roi)*10.0 + 1.0,
-            speed=1.0
-        )
-        history = HistoryNoDelays()
-        monitor = None
-        if self.use_temporal_avg_monitor:
-            monitor = TemporalAverage(
-                period=(self.tr / 1000.0),
-                monitor_vars=model.get_var_info([obs_var])
-            )
-        else:
-            monitor = RawSubSample(
-                period=(self.tr / 1000.0),
-                monitor_vars=model.get_var_info([obs_var])
-            )
-        sim = Simulator(
-            connectivity=con,
-            model=model,
-            history=history,
-            integrator=integrator,
-            monitors=[monitor]
-        )
-
-        # Run simulation
-        sim.run(0, warmup_time + simulated_time)
-
-        # Retreive simulated data and remove warmup
-        sim_signal = monitor.data(obs_var)
-        start_idx = int(sim_signal.shape[0] * warmup_time / (warmup_time + simulated_time))
-        sim_signal = sim_signal[start_idx:, :]
-
-        # We can proceed to convert the signal to bold
-        bold_converter = BoldStephan2008(tr=self.tr)
-        bold_signal = bold_converter.compute_bold(sim_signal, monitor.period)
-
-        return bold_signal
+            raise TypeError(f"Model instance must be DecoMontbrio2014. Provided <{model.__class__.__name__}>")
+        return model
@@ -4,16 +4,9 @@
 # By Albert Juncà
 # adapted by Gustavo Patow
 # =======================================================================
-import math
 import numpy as np
 
 from neuronumba.basic.attr import Attr
-from neuronumba.bold import BoldStephan2008
-from neuronumba.simulator.monitors import RawSubSample, TemporalAverage
-from neuronumba.simulator.simulator import Simulator
-from neuronumba.simulator.connectivity import Connectivity
-from neuronumba.simulator.history import HistoryNoDelays
-from neuronumba.simulator.integrators import EulerStochastic
 
 from MiniNeuroNumba.compact_bold_simulator import CompactBoldSimulatorBase
 
@@ -31,58 +24,17 @@ class Compact_Simulator(CompactBoldSimulatorBase):
     use_bold = Attr(default=True, doc="Perform a BOLD simulation, or directly return the activity")
     sampling_period = Attr(default=1.0, doc="Sampling period from the raw signal data in milliseconds")
 
-    def _generate_bold(
-        self,
-        warmup_time: float,
-        simulated_time: float
-    ) -> np.ndarray:
+    def _build_model(self):
+        return self.model
 
-        model = self.model
-        model.configure(weights=self.weights, g=self.g)
-
-        obs_var = self.obs_var
-        n_roi = np.shape(self.weights)[0]
-
-        # Prepare everything
-        integrator = EulerStochastic(dt=self.dt, sigmas=model.get_noise_template() * self.sigma)
-        con = Connectivity(
-            weights=self.weights,
-            lengths=np.random.rand(n_roi, n_roi)*10.0 + 1.0,
-            speed=1.0
-        )
-        history = HistoryNoDelays()
-        monitor = None
-        if self.use_temporal_avg_monitor:
-            monitor = TemporalAverage(
-                period=self.sampling_period,
-                monitor_vars=model.get_var_info([obs_var])
-            )
-        else:
-            monitor = RawSubSample(
-                period=self.sampling_period,
-                monitor_vars=model.get_var_info([obs_var])
-            )
-        sim = Simulator(
-            connectivity=con,
-            model=model,
-            history=history,
-            integrator=integrator,
-            monitors=[monitor]
-        )
-
-        # Run simulation
-        sim.run(0, warmup_time + simulated_time)
-
-        # Retreive simulated data and remove warmup
-        sim_signal = monitor.data(obs_var)
-        start_idx = int(sim_signal.shape[0] * warmup_time / (warmup_time + simulated_time))
-        sim_signal = sim_signal[start_idx:, :]
+    def _monitor_period(self) -> float:
+        return self.sampling_period
 
+    def _postprocess(self, monitor, warmup_time: float, simulated_time: float) -> np.ndarray:
         if not self.use_bold:
-            return sim_signal
-
-        # We can proceed to convert the signal to bold
-        bold_converter = BoldStephan2008(tr=self.tr)
-        bold_signal = bold_converter.compute_bold(sim_signal, monitor.period)
+            # Retreive simulated data and remove warmup
+            sim_signal = monitor.data(self.obs_var)
+            start_idx = int(sim_signal.shape[0] * warmup_time / (warmup_time + simulated_time))
+            return sim_signal[start_idx:, :]
 
-        return bold_signal
+        return super()._postprocess(monitor, warmup_time, simulated_time)
@@ -0,0 +1,75 @@
+# =======================================================================
+# Per-call cost of generate_bold() (everything rebuilt on every call)
+# versus CompactSimulationSession.run() (objects built once), for short
+# simulations as found in parameter sweeps.
+#
+# Usage:
+#     python main_session_timing.py --model Hopf --runs 10
+# =======================================================================
+import argparse
+import time
+
+import numpy as np
+
+from compact_bold_simulator import CompactHopfSimulator, CompactDeco2014Simulator, CompactMontbrioSimulator
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument("--model", help="Model to use (Hopf, Deco2014, Montbrio)", type=str, default='Hopf')
+    parser.add_argument("--runs", help="Timed calls per variant (after one warm-up call)", type=int, default=10)
+    parser.add_argument("--nrois", help="Number of nodes", type=int, default=70)
+    parser.add_argument("--warmup", help="Warmup time (model time units)", type=float, default=10.0)
+    parser.add_argument("--length", help="Simulated time (model time units)", type=float, default=60.0)
+
+    return parser.parse_args()
+
+
+def make_simulator(model, n_rois):
+    sc_norm = np.random.default_rng(0).uniform(0.05, 0.2, size=(n_rois, n_rois))
+    np.fill_diagonal(sc_norm, 0.0)
+    if model == 'Hopf':
+        omega = np.random.default_rng(1).uniform(0.04, 0.07, size=n_rois)
+        return CompactHopfSimulator(weights=sc_norm, a=-0.02, omega=omega, g=1.0,
+                                    sigma=1e-03, tr=2000.0, dt=100.0)
+    if model == 'Deco2014':
+        return CompactDeco2014Simulator(weights=sc_norm, g=1.0, sigma=1e-03, tr=2000.0, dt=0.1)
+    if model == 'Montbrio':
+        return CompactMontbrioSimulator(weights=sc_norm, g=1.0, sigma=1e-03, tr=2000.0, dt=0.1)
+    raise RuntimeError(f"Unknown model <{model}>")
+
+
+def timed(fn, runs):
+    t0 = time.perf_counter()
+    fn(0)                                   # first call: includes JIT compilation
+    first = time.perf_counter() - t0
+    times = []
+    for r in range(1, runs + 1):
+        t0 = time.perf_counter()
+        fn(r)
+        times.append(time.perf_counter() - t0)
+    return first, np.mean(times)
+
+
+def run():
+    args = parse_arguments()
+    simulator = make_simulator(args.model, args.nrois)
+    G_range = np.linspace(0.5, 1.5, args.runs + 1)
+
+    def one_shot(r):
+        simulator.g = G_range[r]
+        simulator._generate_bold(args.warmup, args.length, seed=r)
+
+    session = simulator.session(warmup_time=args.warmup, simulated_time=args.length)
+
+    def reused(r):
+        session.run(G=G_range[r], seed=r)
+
+    for name, fn in (('generate_bold', one_shot), ('session.run', reused)):
+        first, mean = timed(fn, args.runs)
+        print(f"{args.model:8s} {name:14s} first call {first:.3e}s | next calls {mean:.3e}s / call")
+
+
+if __name__ == '__main__':
+    run()
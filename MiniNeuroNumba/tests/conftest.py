@@ -0,0 +1,11 @@
+# LibBrain/MiniNeuroNumba/tests/conftest.py
+# --------------------------------------------------
+# Pytest path configuration for the MiniNeuroNumba tests: adds LibBrain/
+# (the repo root) to sys.path, so `from MiniNeuroNumba.compact_bold_simulator import ...`
+# works however pytest is invoked. Same approach as Neuroreduce/tests.
+import sys
+from pathlib import Path
+
+LIBBRAIN_ROOT = Path(__file__).resolve().parents[2]
+if str(LIBBRAIN_ROOT) not in sys.path:
+    sys.path.insert(0, str(LIBBRAIN_ROOT))
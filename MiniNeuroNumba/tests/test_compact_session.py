@@ -0,0 +1,71 @@
+"""
+MiniNeuroNumba/tests/test_compact_session.py
+----------------------------------------------
+Tests for CompactSimulationSession: a session must give the same BOLD as
+a one-shot generate_bold() under the same seed, and reusing it must not
+carry any state from one run to the next.
+
+Needs neuronumba; the whole module is skipped when it is not importable.
+
+Run with:  python -m pytest MiniNeuroNumba/tests -v
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("neuronumba")
+
+from MiniNeuroNumba.compact_bold_simulator import CompactHopfSimulator
+
+
+# ── shared parameters ─────────────────────────────────────────────────────────
+
+N       = 6
+WARMUP  = 10.0     # Hopf runs in seconds
+LENGTH  = 60.0
+SEED    = 11
+
+
+@pytest.fixture(scope="module")
+def simulator():
+    rng = np.random.default_rng(0)
+    sc = rng.uniform(0.05, 0.2, size=(N, N))
+    np.fill_diagonal(sc, 0.0)
+    return CompactHopfSimulator(
+        weights=sc,
+        a=-0.02,
+        omega=rng.uniform(0.04, 0.07, size=N),
+        g=0.5,
+        sigma=1e-03,
+        tr=2000.0,
+        dt=100.0,
+    )
+
+
+def test_session_matches_generate_bold(simulator):
+    session = simulator.session(warmup_time=WARMUP)
+    bold = session.run(seed=SEED, duration=LENGTH)
+    ref = simulator.generate_bold(WARMUP, LENGTH, seed=SEED)
+    assert bold.shape == ref.shape
+    np.testing.assert_array_equal(bold, ref)
+
+
+def test_runs_do_not_carry_state(simulator):
+    session = simulator.session(warmup_time=WARMUP)
+    first = session.run(seed=SEED, duration=LENGTH)
+    second = session.run(seed=SEED, duration=LENGTH)
+    np.testing.assert_array_equal(first, second)
+    assert not np.array_equal(first, session.run(seed=SEED + 1, duration=LENGTH))
+
+
+def test_changing_g_reconfigures(simulator):
+    session = simulator.session(warmup_time=WARMUP, simulated_time=LENGTH)
+    base = session.run(seed=SEED)
+    coupled = session.run(G=2.0, seed=SEED)
+    assert not np.array_equal(base, coupled)
+    np.testing.assert_array_equal(session.run(G=simulator.g, seed=SEED), base)
+
+
+def test_missing_duration_raises(simulator):
+    with pytest.raises(ValueError, match="duration"):
+        simulator.session().run(seed=SEED)
@@ -0,0 +1,103 @@
+"""
+Neuroreduce/fc.py
+-----------------
+Batched Pearson functional connectivity for stacks of subjects.
+
+Every subject's FC is the Gram matrix of its z-scored timeseries,
+
+    FC_s = Z_s Z_sᵀ / T,    Z_s = zscore(X_s, axis=T)
+
+so a whole stack is one batched matmul over (S, N, T) instead of a
+per-subject np.corrcoef loop. Subjects are processed in chunks whose
+working set fits a memory budget, and the result can be returned as full
+matrices, upper triangles only, and/or in Fisher-z space.
+
+Constant parcels get zero correlation (np.nan_to_num of np.corrcoef), as
+in FunctionalHarmonicsReducer.
+
+Notation follows the rest of Neuroreduce: X is (N, T). Kept at package
+level (like streaming.py) so that methods/ can use it without importing
+Neuroreduce.utils.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+
+# |r| is clipped to 1 − FISHER_Z_EPS before arctanh so that perfectly
+# correlated pairs (and the diagonal) stay finite
+FISHER_Z_EPS = 1e-7
+
+
+def batch_fc(
+    X:          np.ndarray,
+    upper:      bool = False,
+    fisher_z:   bool = False,
+    max_memory: Optional[int] = 2 ** 28,
+    dtype:      np.dtype = np.float64,
+) -> np.ndarray:
+    """
+    Pearson FC of every subject in a stack.
+
+    Parameters
+    ----------
+    X : np.ndarray, shape (S, N, T) or (N, T)
+        BOLD timeseries, rows = parcels.
+    upper : bool
+        Return only the strict upper triangle (np.triu_indices(N, k=1)) of
+        each FC. Default: False.
+    fisher_z : bool
+        Return arctanh(r), with |r| clipped to 1 − FISHER_Z_EPS.
+        Default: False.
+    max_memory : int or None
+        Approximate working-memory budget in bytes; subjects are processed
+        in chunks that fit it (at least one subject per chunk). None → all
+        subjects at once. Default: 256 MB.
+    dtype : numpy dtype
+        Computation and output dtype. Default: float64.
+
+    Returns
+    -------
+    FC : np.ndarray
+        (S, N, N), or (S, N(N−1)/2) with upper=True. The leading S axis is
+        dropped for a single (N, T) input.
+    """
+    X = np.asarray(X)
+    single = X.ndim == 2
+    if single:
+        X = X[np.newaxis]
+    if X.ndim != 3:
+        raise ValueError(
+            f"X must have shape (S, N, T) or (N, T), got shape {X.shape}"
+        )
+    S, N, T = X.shape
+    if T < 2:
+        raise ValueError(f"Need at least 2 timepoints, got T={T}.")
+
+    iu  = np.triu_indices(N, k=1) if upper else None
+    out = np.empty((S, len(iu[0])) if upper else (S, N, N), dtype=dtype)
+
+    # z-scored chunk (N·T) + its Gram matrix (N²), per subject
+    per_subject = (N * T + N * N) * np.dtype(dtype).itemsize
+    chunk = S if max_memory is None else max(1, int(max_memory // per_subject))
+
+    for s0 in range(0, S, chunk):
+        s1 = min(s0 + chunk, S)
+        Z  = np.array(X[s0:s1], dtype=dtype)                  # copy, (b, N, T)
+        Z -= Z.mean(axis=2, keepdims=True)
+        sd = np.sqrt(np.einsum('bnt,bnt->bn', Z, Z) / T)
+        # Constant parcels stay all-zero (centred) → zero correlation
+        np.divide(Z, sd[..., np.newaxis], out=Z, where=sd[..., np.newaxis] > 0)
+
+        FC = np.matmul(Z, Z.swapaxes(1, 2))                   # (b, N, N)
+        FC /= T
+        np.clip(FC, -1.0, 1.0, out=FC)
+        if fisher_z:
+            lim = 1.0 - FISHER_Z_EPS
+            FC  = np.arctanh(np.clip(FC, -lim, lim))
+        out[s0:s1] = FC[:, iu[0], iu[1]] if upper else FC
+
+    return out[0] if single else out
@@ -8,7 +8,8 @@ Both methods share an identical pipeline:
     Step 1 — Threshold and symmetrise the input matrix → adjacency A
     Step 2 — Compute degree matrix D
     Step 3 — Compute Laplacian L (unnormalised or symmetric)
-    Step 4 — Eigendecompose L via eigh (real, symmetric → sorted automatically)
+    Step 4 — Eigendecompose L via eigh (real, symmetric → sorted automatically),
+             or compute only the k lowest modes via sparse shift-invert eigsh
     Step 5 — Store the k lowest-frequency eigenvectors as the harmonic basis
 
 The variants differ only in what feeds into the pipeline:
@@ -31,6 +32,15 @@ Design note
 This is NOT a mixin — it is a full abstract DimensionalityReducer subclass.
 Subclasses only need to implement ``_get_input_matrix(X, SC)`` which extracts
 the matrix to feed into the Laplacian pipeline.
+
+The symmetric normalisation is a broadcast row/column scaling
+(``symmetric_normalise``), which also accepts sparse matrices and stacks of
+subject matrices (S, N, N).
+
+The input matrix may be a dense ndarray or a ``scipy.sparse`` matrix. Sparse
+inputs stay sparse through Steps 1–3, so with ``eigen_solver='eigsh'`` memory
+scales with the number of nonzeros rather than with N² (high-resolution /
+vertex-level structural connectomes).
 """
 
 from __future__ import annotations
@@ -40,10 +50,171 @@ from typing import Optional
 
 import numpy as np
 from numpy import linalg as LA
+import scipy.sparse as sp
+from scipy.sparse.linalg import eigsh
+from joblib import Parallel, delayed, effective_n_jobs
 
 from Neuroreduce.base import DimensionalityReducer
 
 
+def symmetric_normalise(L, deg: np.ndarray, inplace: bool = False):
+    """
+    Symmetric normalisation D^{-1/2} L D^{-1/2} by broadcasting.
+
+    D is diagonal, so the two matrix products reduce to scaling row i and
+    column j by d_i = deg_i^{-1/2} — O(N²) instead of two dense O(N³)
+    products. Parcels with zero degree get d_i = 0 (isolated nodes).
+
+    Parameters
+    ----------
+    L : np.ndarray, shape (N, N) or (S, N, N), or scipy.sparse matrix
+        Matrix to normalise. A stack of subject matrices is normalised in
+        one call.
+    deg : np.ndarray, shape (N,) or (S, N)
+        Weighted degrees, matching the leading shape of L.
+    inplace : bool
+        Scale a dense L (or the data array of a CSR L) in place. Only safe
+        when the caller owns L. Default: False.
+
+    Returns
+    -------
+    L_sym : same type and shape as L
+    """
+    deg        = np.asarray(deg, dtype=np.float64)
+    d_inv_sqrt = np.zeros_like(deg)
+    np.divide(1.0, np.sqrt(deg), out=d_inv_sqrt, where=deg > 0)
+
+    if sp.issparse(L):
+        L = L.tocsr(copy=not inplace)
+        # data[p] sits at (row_of[p], indices[p]) in CSR layout
+        row_of = np.repeat(np.arange(L.shape[0]), np.diff(L.indptr))
+        L.data *= d_inv_sqrt[row_of] * d_inv_sqrt[L.indices]
+        return L
+
+    if not inplace:
+        L = np.array(L, dtype=np.float64, copy=True)
+    L *= d_inv_sqrt[..., :, None]
+    L *= d_inv_sqrt[..., None, :]
+    return L
+
+
+def graph_laplacian(
+    M,
+    threshold:               float = 0.00065,
+    laplacian_type:          str   = 'unnormalised',
+    normalise_input:         bool  = True,
+    remove_self_connections: bool  = True,
+):
+    """
+    Steps 1–3 of the harmonic pipeline: preprocess M, threshold and
+    symmetrise it to an adjacency A, and build the graph Laplacian L.
+
+    This is the single Laplacian construction shared by
+    BaseLaplacianReducer and the graph filters in
+    Neuroreduce/utils/graph_filter.py.
+
+    Dense inputs may carry leading batch axes: a stack of subject
+    matrices (S, N, N) is processed in one vectorised pass, each slice
+    exactly as if it had been passed on its own.
+
+    Parameters
+    ----------
+    M : np.ndarray, shape (N, N) or (S, N, N), or scipy.sparse matrix
+    threshold, laplacian_type, normalise_input, remove_self_connections
+        Same meaning as in BaseLaplacianReducer.
+
+    Returns
+    -------
+    L : np.ndarray or scipy.sparse.csr_matrix, same shape as M
+        Same storage kind as the input.
+    """
+    if sp.issparse(M):
+        return _graph_laplacian_sparse(M, threshold, laplacian_type,
+                                       normalise_input,
+                                       remove_self_connections)
+
+    N    = M.shape[-1]
+    diag = np.arange(N)
+    # Private float64 copy: every step below works in place on it
+    M    = np.array(M, dtype=np.float64, copy=True)
+
+    # ── Preprocessing ──────────────────────────────────────────────────
+    # Normalise to [0, 1] (per matrix when stacked)
+    if normalise_input:
+        max_val = np.max(np.abs(M), axis=(-2, -1), keepdims=True)
+        M /= np.where(max_val > 0, max_val, 1.0)
+
+    # Remove self-connections (diagonal = self-loops)
+    if remove_self_connections:
+        M[..., diag, diag] = 0.0
+
+    # ── Step 1: Adjacency matrix ───────────────────────────────────────
+    # Threshold: zero out weak connections
+    # Matching the student's LaplacianCalculator.get_adj():
+    #   A = copy(M); A[M <= th] = 0; A = max(A, A.T)
+    A = M
+    A[A <= threshold] = 0.0
+    A = np.maximum(A, np.swapaxes(A, -1, -2))   # symmetric after threshold
+
+    # ── Step 2: Degree ─────────────────────────────────────────────────
+    # D_ii = sum_j A_ij  (weighted degree)
+    # Matching the student's LaplacianCalculator.get_deg()
+    deg = np.sum(A, axis=-2)                    # (..., N)
+
+    # ── Step 3: Laplacian ──────────────────────────────────────────────
+    # L = D - A, built in place over A (A is not needed afterwards)
+    # Original paper convention; preserves edge weight magnitude.
+    L = np.negative(A, out=A)
+    L[..., diag, diag] += deg
+
+    if laplacian_type == 'symmetric':
+        # L_sym = D^{-1/2} L D^{-1/2}
+        # Makes eigenvalues in [0, 2]; useful for comparing graphs of
+        # different sizes / densities.
+        # Matching the student's SymmetricLaplacian.get_laplacian()
+        L = symmetric_normalise(L, deg, inplace=True)
+
+    return L
+
+
+def _graph_laplacian_sparse(
+    M,
+    threshold:               float,
+    laplacian_type:          str,
+    normalise_input:         bool,
+    remove_self_connections: bool,
+) -> sp.csr_matrix:
+    """
+    Sparse counterpart of graph_laplacian: identical steps, but the
+    matrices never leave CSR storage (memory O(nnz)).
+    """
+    M = sp.csr_matrix(M, dtype=np.float64, copy=True)
+
+    # ── Preprocessing ──────────────────────────────────────────────────
+    if normalise_input and M.nnz > 0:
+        max_val = np.max(np.abs(M.data))
+        if max_val > 0:
+            M.data /= max_val
+
+    if remove_self_connections:
+        M.setdiag(0.0)
+
+    # ── Step 1: Adjacency matrix ───────────────────────────────────────
+    # Implicit zeros are already <= threshold for threshold >= 0
+    M.data[M.data <= threshold] = 0.0
+    M.eliminate_zeros()
+    A = M.maximum(M.T).tocsr()
+
+    # ── Step 2: Degree ─────────────────────────────────────────────────
+    deg = np.asarray(A.sum(axis=0)).ravel()
+
+    # ── Step 3: Laplacian ──────────────────────────────────────────────
+    L = sp.csr_matrix(sp.diags(deg) - A)
+    if laplacian_type == 'symmetric':
+        L = symmetric_normalise(L, deg, inplace=True)
+    return L
+
+
 class BaseLaplacianReducer(DimensionalityReducer):
     """
     Abstract base class for graph-harmonic dimensionality reduction.
@@ -78,6 +249,19 @@ class BaseLaplacianReducer(DimensionalityReducer):
         Default: True.
     whiten : bool
         If True, z-score each row of transform() output. Default: False.
+    eigen_solver : str
+        How to eigendecompose the Laplacian:
+        - 'eigh'  : dense numpy eigh, all N eigenpairs (default). Sparse
+                    inputs are densified right before the decomposition.
+        - 'eigsh' : scipy.sparse.linalg.eigsh in shift-invert mode around
+                    ``eigsh_sigma``, returning only the k lowest modes.
+                    Requires k < N. get_all_eigenvectors() then holds only
+                    those k modes.
+        Default: 'eigh'.
+    eigsh_sigma : float
+        Shift for the 'eigsh' solver. The Laplacian is singular (λ₀ = 0),
+        so the shift sits slightly below zero to keep L - σI factorisable.
+        Default: -1e-6.
 
     Notes on eigenvector sign convention
     -------------------------------------
@@ -96,6 +280,8 @@ class BaseLaplacianReducer(DimensionalityReducer):
         normalise_input:          bool  = True,
         remove_self_connections:  bool  = True,
         whiten:                   bool  = False,
+        eigen_solver:             str   = 'eigh',
+        eigsh_sigma:              float = -1e-6,
     ):
         super().__init__(k=k, whiten=whiten)
 
@@ -105,14 +291,22 @@ class BaseLaplacianReducer(DimensionalityReducer):
                 f"got '{laplacian_type}'."
             )
 
+        if eigen_solver not in ('eigh', 'eigsh'):
+            raise ValueError(
+                f"eigen_solver must be 'eigh' or 'eigsh', "
+                f"got '{eigen_solver}'."
+            )
+
         self.threshold               = threshold
         self.laplacian_type          = laplacian_type
         self.normalise_input         = normalise_input
         self.remove_self_connections = remove_self_connections
+        self.eigen_solver            = eigen_solver
+        self.eigsh_sigma             = eigsh_sigma
 
         # Set during fit()
-        self._eigenvectors: Optional[np.ndarray] = None  # (N, N_all)
-        self._eigenvalues:  Optional[np.ndarray] = None  # (N_all,)
+        self._eigenvectors: Optional[np.ndarray] = None  # (N, N_all) or (N, k)
+        self._eigenvalues:  Optional[np.ndarray] = None  # (N_all,) or (k,)
         self._basis:        Optional[np.ndarray] = None  # (N, k) selected
 
     # ------------------------------------------------------------------
@@ -135,7 +329,7 @@ class BaseLaplacianReducer(DimensionalityReducer):
 
         Returns
         -------
-        M : np.ndarray, shape (N, N)
+        M : np.ndarray or scipy.sparse matrix, shape (N, N)
             The connectivity matrix to use. Must be square and symmetric.
         """
         ...
@@ -157,7 +351,7 @@ class BaseLaplacianReducer(DimensionalityReducer):
         X  : np.ndarray, shape (N, T), optional
             BOLD timeseries. Required by FunctionalHarmonicsReducer (to
             compute FC); ignored by ConnectomeHarmonicsReducer.
-        SC : np.ndarray, shape (N, N), optional
+        SC : np.ndarray or scipy.sparse matrix, shape (N, N), optional
             Structural connectivity. Required by ConnectomeHarmonicsReducer;
             ignored by FunctionalHarmonicsReducer.
 
@@ -166,76 +360,21 @@ class BaseLaplacianReducer(DimensionalityReducer):
         self
         """
         # Get the input matrix from the subclass
-        M = self._get_input_matrix(X, SC)
+        return self._fit_matrix(self._get_input_matrix(X, SC))
 
-        # Validate: must be square
-        if M.ndim != 2 or M.shape[0] != M.shape[1]:
-            raise ValueError(
-                f"Input matrix must be square (N×N), got {M.shape}."
-            )
-        N = M.shape[0]
-        if self.k > N:
-            raise ValueError(f"k={self.k} must be <= N={N}.")
+    def _fit_matrix(self, M) -> "BaseLaplacianReducer":
+        """Run the Laplacian pipeline (steps 1–5) on an (N, N) matrix."""
+        self._check_input_matrix(M)
 
-        M = M.astype(np.float64, copy=True)
-
-        # ── Preprocessing ──────────────────────────────────────────────────
-        # Normalise to [0, 1]
-        if self.normalise_input:
-            max_val = np.max(np.abs(M))
-            if max_val > 0:
-                M /= max_val
-
-        # Remove self-connections (diagonal = self-loops)
-        if self.remove_self_connections:
-            np.fill_diagonal(M, 0.0)
-
-        # ── Step 1: Adjacency matrix ───────────────────────────────────────
-        # Threshold: zero out weak connections
-        # Matching the student's LaplacianCalculator.get_adj():
-        #   A = copy(M); A[M <= th] = 0; A = max(A, A.T)
-        A = np.copy(M)
-        A[A <= self.threshold] = 0.0
-        A = np.maximum(A, A.T)   # ensure symmetry after thresholding
-
-        # ── Step 2: Degree matrix ──────────────────────────────────────────
-        # D_ii = sum_j A_ij  (weighted degree)
-        # Matching the student's LaplacianCalculator.get_deg()
-        deg = np.sum(A, axis=0)
-        D   = np.diag(deg)
-
-        # ── Step 3: Laplacian ──────────────────────────────────────────────
-        if self.laplacian_type == 'unnormalised':
-            # L = D - A
-            # Original paper convention; preserves edge weight magnitude.
-            L = D - A
-
-        else:  # 'symmetric'
-            # L_sym = D^{-1/2} L D^{-1/2}
-            # Makes eigenvalues in [0, 2]; useful for comparing graphs of
-            # different sizes / densities.
-            # Matching the student's SymmetricLaplacian.get_laplacian()
-            L   = D - A
-            D2  = np.copy(D)
-            for i in range(N):
-                if D2[i, i] > 0:
-                    D2[i, i] = 1.0 / np.sqrt(D2[i, i])
-                else:
-                    D2[i, i] = 0.0
-            L = D2 @ L @ D2
+        # ── Steps 1–3: Adjacency, degree, Laplacian ────────────────────────
+        L = self._build_laplacian(M)
 
         # ── Step 4: Eigendecomposition ─────────────────────────────────────
-        # eigh assumes real symmetric matrix → returns sorted eigenvalues
-        # in ascending order (lowest frequency first).
-        # The student sorts again "just to be sure" — we keep that habit.
-        e_val, e_vec = np.linalg.eigh(L)
-        idx          = np.argsort(e_val)
-        e_val        = e_val[idx]
-        e_vec        = e_vec[:, idx]
+        e_val, e_vec = self._eigendecompose(L)
 
         # Store all eigenpairs (useful for selecting top-k later)
-        self._eigenvalues  = e_val              # (N,)
-        self._eigenvectors = np.real(e_vec)     # (N, N)
+        self._eigenvalues  = e_val              # (N,) or (k,)
+        self._eigenvectors = np.real(e_vec)     # (N, N) or (N, k)
 
         # ── Step 5: Select k lowest-frequency harmonics ────────────────────
         # Convention: the first eigenvector (eigenvalue ≈ 0) is the DC
@@ -245,6 +384,165 @@ class BaseLaplacianReducer(DimensionalityReducer):
         self._is_fitted = True
         return self
 
+    def fit_batch(
+        self,
+        X:                 Optional[np.ndarray] = None,
+        SC:                Optional[np.ndarray] = None,
+        n_jobs:            int  = 1,
+        return_eigenvalues: bool = False,
+    ):
+        """
+        Compute subject-specific harmonic bases for a whole cohort at once.
+
+        Equivalent to ``[type(self)(**params).fit(X=X[s], SC=SC[s])
+        .get_basis() for s in range(S)]`` but without the per-subject Python
+        overhead: all S matrices are validated, normalised and turned into
+        Laplacians in one vectorised pass, and decomposed with a single
+        stacked ``numpy.linalg.eigh`` call (LAPACK-batched over the leading
+        axis). The reducer's own fitted state is left untouched.
+
+        Parameters
+        ----------
+        X  : np.ndarray, shape (S, N, T), optional
+            Per-subject BOLD. Required by FunctionalHarmonicsReducer.
+        SC : np.ndarray, shape (S, N, N), or sequence of S (sparse) matrices
+            Per-subject structural connectivity. Required by
+            ConnectomeHarmonicsReducer. Sparse matrices (or
+            eigen_solver='eigsh') are decomposed one subject at a time.
+        n_jobs : int
+            Number of joblib workers; the stack is split into n_jobs
+            contiguous chunks, one per process. -1 uses all cores.
+            Default: 1 (no parallelism, single batched call).
+        return_eigenvalues : bool
+            Also return the k lowest eigenvalues per subject.
+
+        Returns
+        -------
+        bases : np.ndarray, shape (S, N, k)
+            bases[s] is the k lowest-frequency harmonics of subject s.
+        eigenvalues : np.ndarray, shape (S, k)
+            Only if return_eigenvalues=True.
+        """
+        stack = X if X is not None else SC
+        if stack is None:
+            # Let the subclass raise its usual "requires X / SC" error
+            self._get_input_matrix(None, None)
+        S = len(stack)
+
+        M = [
+            self._get_input_matrix(
+                None if X  is None else X[s],
+                None if SC is None else SC[s],
+            )
+            for s in range(S)
+        ]
+        N = self._check_input_matrix(M[0])
+        for m in M[1:]:
+            if self._check_input_matrix(m) != N:
+                raise ValueError(
+                    f"All subject matrices must have N={N} parcels, "
+                    f"got {m.shape}."
+                )
+        if not any(sp.issparse(m) for m in M):
+            M = np.stack(M)                     # (S, N, N)
+
+        n_jobs = min(effective_n_jobs(n_jobs), S)
+        if n_jobs == 1:
+            e_val, bases = self._decompose_batch(M)
+        else:
+            chunks  = np.array_split(np.arange(S), n_jobs)
+            results = Parallel(n_jobs=n_jobs)(
+                delayed(self._decompose_batch)(M[c[0]:c[-1] + 1])
+                for c in chunks
+            )
+            e_val = np.concatenate([r[0] for r in results])
+            bases = np.concatenate([r[1] for r in results])
+
+        if return_eigenvalues:
+            return bases, e_val
+        return bases
+
+    # ------------------------------------------------------------------
+    # Pipeline steps
+    # ------------------------------------------------------------------
+
+    def _check_input_matrix(self, M) -> int:
+        """Validate a single input matrix against k; return N."""
+        # Validate: must be square
+        if M.ndim != 2 or M.shape[0] != M.shape[1]:
+            raise ValueError(
+                f"Input matrix must be square (N×N), got {M.shape}."
+            )
+        N = M.shape[0]
+        if self.k > N:
+            raise ValueError(f"k={self.k} must be <= N={N}.")
+        if self.eigen_solver == 'eigsh' and self.k >= N:
+            raise ValueError(
+                f"eigen_solver='eigsh' requires k={self.k} < N={N}."
+            )
+        return N
+
+    def _decompose_batch(self, M) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Steps 1–5 for a chunk of subjects.
+
+        Parameters
+        ----------
+        M : np.ndarray, shape (s, N, N), or list of s (sparse) matrices
+
+        Returns
+        -------
+        e_val : np.ndarray, shape (s, k)
+        basis : np.ndarray, shape (s, N, k)
+        """
+        if isinstance(M, np.ndarray) and self.eigen_solver == 'eigh':
+            L            = self._build_laplacian(M)        # (s, N, N)
+            e_val, e_vec = np.linalg.eigh(L)               # batched LAPACK
+            idx          = np.argsort(e_val, axis=-1)
+            e_val        = np.take_along_axis(e_val, idx, axis=-1)
+            e_vec        = np.take_along_axis(e_vec, idx[:, None, :], axis=-1)
+        else:
+            pairs = [self._eigendecompose(self._build_laplacian(m)) for m in M]
+            e_val = np.stack([p[0][:self.k] for p in pairs])
+            e_vec = np.stack([p[1][:, :self.k] for p in pairs])
+        return e_val[:, :self.k], np.real(e_vec[:, :, :self.k])
+
+    def _build_laplacian(self, M):
+        """
+        Steps 1–3 with this reducer's settings; see graph_laplacian().
+
+        Dense inputs may carry leading batch axes (S, N, N).
+        """
+        return graph_laplacian(
+            M,
+            threshold               = self.threshold,
+            laplacian_type          = self.laplacian_type,
+            normalise_input         = self.normalise_input,
+            remove_self_connections = self.remove_self_connections,
+        )
+
+    def _eigendecompose(self, L) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Step 4: eigenpairs of L in ascending eigenvalue order.
+
+        Returns all N pairs for 'eigh', the k lowest for 'eigsh'.
+        """
+        if self.eigen_solver == 'eigsh':
+            # Shift-invert: the eigenvalues nearest σ ≈ 0 become the
+            # largest of (L - σI)⁻¹, which Lanczos finds in few iterations.
+            e_val, e_vec = eigsh(L, k=self.k, sigma=self.eigsh_sigma,
+                                 which='LM')
+        else:
+            if sp.issparse(L):
+                L = L.toarray()
+            # eigh assumes real symmetric matrix → returns sorted eigenvalues
+            # in ascending order (lowest frequency first).
+            e_val, e_vec = np.linalg.eigh(L)
+
+        # The student sorts again "just to be sure" — we keep that habit.
+        idx          = np.argsort(e_val)
+        return e_val[idx], e_vec[:, idx]
+
     def transform(
         self,
         X:              np.ndarray,
@@ -323,14 +621,15 @@ class BaseLaplacianReducer(DimensionalityReducer):
         Returns
         -------
         e_vec : np.ndarray, shape (N, N)
-            All eigenvectors, sorted by ascending eigenvalue.
+            All eigenvectors, sorted by ascending eigenvalue. With
+            eigen_solver='eigsh' only the k computed modes, shape (N, k).
         """
         self._check_is_fitted()
         return self._eigenvectors
 
     @property
     def eigenvalues_(self) -> np.ndarray:
-        """All eigenvalues in ascending order, shape (N,)."""
+        """All eigenvalues in ascending order, shape (N,) — (k,) for 'eigsh'."""
         self._check_is_fitted()
         return self._eigenvalues
 
@@ -45,6 +45,12 @@ class ConnectomeHarmonicsReducer(BaseLaplacianReducer):
         Zero out the SC diagonal before computing. Default: True.
     whiten : bool
         Z-score each row of transform() output. Default: False.
+    eigen_solver : str
+        'eigh' (dense, all modes) or 'eigsh' (sparse shift-invert, k modes
+        only). Use 'eigsh' with a scipy.sparse SC for high-resolution
+        connectomes. Default: 'eigh'.
+    eigsh_sigma : float
+        Shift used by 'eigsh'. Default: -1e-6.
 
     Examples
     --------
@@ -52,6 +58,14 @@ class ConnectomeHarmonicsReducer(BaseLaplacianReducer):
     >>> reducer.fit(SC=SC)                    # SC: (N, N)
     >>> Z = reducer.transform(X_bold)         # Z:  (10, T)
     >>> W = reducer.get_basis()               # W:  (N, 10)  harmonic modes
+
+    Sparse, vertex-level SC:
+    >>> reducer = ConnectomeHarmonicsReducer(k=100, eigen_solver='eigsh')
+    >>> reducer.fit(SC=scipy.sparse.csr_matrix(SC_vertex))
+
+    Subject-specific harmonics for a cohort:
+    >>> bases = ConnectomeHarmonicsReducer(k=10).fit_batch(SC=SC_stack)
+    >>> bases.shape                           # (S, N, 10)
     """
 
     def _get_input_matrix(
@@ -65,11 +79,12 @@ class ConnectomeHarmonicsReducer(BaseLaplacianReducer):
         Parameters
         ----------
         X  : ignored
-        SC : np.ndarray, shape (N, N) — structural connectivity matrix
+        SC : np.ndarray or scipy.sparse matrix, shape (N, N)
+             — structural connectivity matrix
 
         Returns
         -------
-        SC : np.ndarray, shape (N, N)
+        SC : np.ndarray or scipy.sparse matrix, shape (N, N)
         """
         if SC is None:
             raise ValueError(
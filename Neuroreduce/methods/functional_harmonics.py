@@ -3,7 +3,7 @@ Neuroreduce/methods/functional_harmonics.py
 ---------------------------------------------
 Functional Harmonics: graph harmonics of the functional connectivity matrix.
 
-Computes FC from BOLD timeseries (via NeuroNumba FC observable), then
+Computes FC from BOLD timeseries (batched Pearson FC, Neuroreduce.fc), then
 computes eigenvectors of the graph Laplacian of that FC matrix.
 
 References
@@ -13,28 +13,130 @@ functions underlying cortical organization. Cell Reports, 36(8).
 
 Vohryzek, J., et al. (2024). Harmonic modes of neural activity in the resting
 state. NeuroImage.
+
+Group-level functional harmonics are fitted on a group-average FC that is
+accumulated one subject at a time (GroupFCAccumulator), so a cohort never
+has to be held in memory or concatenated.
 """
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import Optional, Sequence
 import numpy as np
 
+from Neuroreduce.fc import batch_fc
 from Neuroreduce.methods.base_laplacian import BaseLaplacianReducer
+from Neuroreduce.streaming import CovarianceAccumulator, iter_subject_timeseries
+
+
+class GroupFCAccumulator:
+    """
+    Streaming group FC: one subject in, O(N²) state kept.
+
+    Two group-FC definitions are supported:
 
-try:
-    from neuronumba.observables.fc import FC as _FCObservable
-except ModuleNotFoundError:
-    class _FCObservable:
-        def from_fmri(self, bold_signal):
-            return {'FC': np.corrcoef(bold_signal, rowvar=False)}
+    'mean'   — average of the per-subject FC matrices (the usual group FC).
+               Each subject's FC is computed exactly as in
+               FunctionalHarmonicsReducer.fit(X) and added to a running
+               sum; (S, N, T) stacks are handled by one batched FC call.
+               With ``fisher_z=True`` the matrices are averaged in
+               Fisher-z space (arctanh) and mapped back with tanh.
+    'pooled' — correlation of the temporally concatenated BOLD, obtained
+               from running means and cross-product sums
+               (CovarianceAccumulator). Identical to the FC of
+               np.concatenate(subjects, axis=1), without the concatenation.
+
+    Parameters
+    ----------
+    mode : str
+        'mean' or 'pooled'. Default: 'mean'.
+    fisher_z : bool
+        Average in Fisher-z space ('mean' mode only). Default: False.
+
+    Examples
+    --------
+    >>> acc = GroupFCAccumulator(fisher_z=True)
+    >>> for X in iter_subject_timeseries(DL):
+    ...     acc.update(X)
+    >>> FC_group = acc.fc()                    # (N, N)
+    """
+
+    def __init__(self, mode: str = 'mean', fisher_z: bool = False):
+        if mode not in ('mean', 'pooled'):
+            raise ValueError(f"mode must be 'mean' or 'pooled', got '{mode}'.")
+        if fisher_z and mode == 'pooled':
+            raise ValueError("fisher_z=True is only defined for mode='mean'.")
+        self.mode       = mode
+        self.fisher_z   = fisher_z
+        self.n_subjects = 0
+        self._sum: Optional[np.ndarray] = None          # (N, N), 'mean'
+        self._cov = CovarianceAccumulator()             # 'pooled'
+
+    def update(self, X: np.ndarray) -> "GroupFCAccumulator":
+        """
+        Add one subject, or a stack of subjects.
+
+        Parameters
+        ----------
+        X : np.ndarray, shape (N, T) or (S, N, T)
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim not in (2, 3):
+            raise ValueError(
+                f"X must have shape (N, T) or (S, N, T), got shape {X.shape}"
+            )
+        stack = X if X.ndim == 3 else X[np.newaxis]
+        if self._sum is not None and stack.shape[1] != self._sum.shape[0]:
+            raise ValueError(
+                f"All subjects must have N={self._sum.shape[0]} parcels, "
+                f"got {stack.shape[1]}."
+            )
+        if self.mode == 'pooled':
+            self._cov.update_from(stack)
+        else:
+            FC = batch_fc(stack, fisher_z=self.fisher_z).sum(axis=0)
+            if self._sum is None:
+                self._sum = FC
+            else:
+                self._sum += FC
+        self.n_subjects += len(stack)
+        return self
+
+    def update_from(
+        self,
+        source,
+        subjects: Optional[Sequence] = None,
+    ) -> "GroupFCAccumulator":
+        """
+        Add every subject of an (S, N, T) stack, an iterable of (N, T)
+        arrays or a DataLoader (see iter_subject_timeseries). Stacks are
+        added with one batched update.
+        """
+        if isinstance(source, np.ndarray) and source.ndim == 3:
+            return self.update(source)
+        for X in iter_subject_timeseries(source, subjects):
+            self.update(X)
+        return self
+
+    def fc(self) -> np.ndarray:
+        """Group FC, shape (N, N)."""
+        if self.n_subjects == 0:
+            raise RuntimeError(
+                "GroupFCAccumulator is empty. Call update() first."
+            )
+        if self.mode == 'pooled':
+            return self._cov.correlation()
+        FC = self._sum / self.n_subjects
+        if self.fisher_z:
+            FC = np.tanh(FC)
+        return FC
 
 
 class FunctionalHarmonicsReducer(BaseLaplacianReducer):
     """
     Functional Harmonics dimensionality reduction.
 
-    Computes FC from BOLD (via NeuroNumba FC observable), then computes
+    Computes FC from BOLD (Pearson, via Neuroreduce.fc.batch_fc), then computes
     the k lowest-frequency eigenvectors of the graph Laplacian of that
     FC matrix.
 
@@ -59,6 +161,7 @@ class FunctionalHarmonicsReducer(BaseLaplacianReducer):
     >>> reducer.fit(X=X_bold)              # X: (N, T) — FC computed internally
     >>> Z = reducer.transform(X_bold)      # Z: (10, T)
     >>> W = reducer.get_basis()            # W: (N, 10)
+    >>> reducer.fit_group(DL, fisher_z=True)   # group FC, one subject at a time
     """
 
     def _get_input_matrix(
@@ -69,8 +172,8 @@ class FunctionalHarmonicsReducer(BaseLaplacianReducer):
         """
         Compute FC from BOLD and use it as input to the Laplacian pipeline.
 
-        FC is computed via the NeuroNumba FC observable which expects
-        (T, N) input — we transpose X (N, T) before passing it.
+        FC is the Pearson correlation across time (Neuroreduce.fc.batch_fc,
+        equal to np.corrcoef); constant parcels get zero correlation.
 
         Parameters
         ----------
@@ -86,10 +189,41 @@ class FunctionalHarmonicsReducer(BaseLaplacianReducer):
                 "FunctionalHarmonicsReducer requires BOLD timeseries X. "
                 "Call fit(X=your_bold_signal)."
             )
-        # NeuroNumba FC observable expects (T, N) — transpose from (N, T)
-        obs    = _FCObservable()
-        result = obs.from_fmri(X.T)
-        FC     = result['FC']                    # (N, N) Pearson correlation
-        # Replace any NaN (from constant parcels) with 0
-        FC     = np.nan_to_num(FC, nan=0.0)
-        return FC
+        return batch_fc(X)                       # (N, N) Pearson correlation
+
+    def fit_group(
+        self,
+        data,
+        subjects: Optional[Sequence] = None,
+        mode:     str  = 'mean',
+        fisher_z: bool = False,
+    ) -> "FunctionalHarmonicsReducer":
+        """
+        Fit group functional harmonics, streaming one subject at a time.
+
+        The group FC is accumulated with GroupFCAccumulator and then run
+        through the same Laplacian pipeline as fit(). Peak memory is one
+        subject's BOLD plus O(N²), independent of cohort size.
+
+        Parameters
+        ----------
+        data : np.ndarray (S, N, T), iterable of (N, T), or DataLoader
+            Subjects to pool. Generators are consumed lazily.
+        subjects : sequence or None
+            DataLoader subject IDs. Default: all study subjects.
+        mode : str
+            'mean' (average of subject FCs) or 'pooled' (FC of the
+            concatenated BOLD). Default: 'mean'.
+        fisher_z : bool
+            Average subject FCs in Fisher-z space. Default: False.
+
+        Returns
+        -------
+        self
+        """
+        acc = GroupFCAccumulator(mode=mode, fisher_z=fisher_z)
+        acc.update_from(data, subjects)
+        if acc.n_subjects == 0:
+            raise ValueError("fit_group received no subjects.")
+        self.group_fc_ = acc.fc()
+        return self._fit_matrix(self.group_fc_)
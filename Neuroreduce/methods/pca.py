@@ -11,16 +11,21 @@ Convention recap:
     X : (N, T)  — input BOLD
     W : (N, k)  — principal components (columns), i.e. spatial modes
     Z : (k, T)  — PC scores, i.e. temporal expression of each mode
+
+Group PCA over a cohort can be fitted with PCAReducer.fit_stream(), which
+consumes one subject at a time and never builds the concatenated
+(N, ΣT) matrix.
 """
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import Optional, Sequence
 
 import numpy as np
-from sklearn.decomposition import PCA
+from sklearn.decomposition import PCA, IncrementalPCA
 
 from Neuroreduce.base import DimensionalityReducer
+from Neuroreduce.streaming import CovarianceAccumulator, iter_subject_timeseries
 
 
 class PCAReducer(DimensionalityReducer):
@@ -60,6 +65,7 @@ class PCAReducer(DimensionalityReducer):
     >>> W = reducer.get_basis()               # W : (N, 10)
     >>> evr = reducer.explained_variance_ratio_  # array of length 10
     >>> X_hat = reducer.inverse_transform(Z)  # X_hat : (N, T)
+    >>> reducer.fit_stream(DL)                # group PCA, one subject at a time
     """
 
     def __init__(
@@ -73,6 +79,8 @@ class PCAReducer(DimensionalityReducer):
         self.svd_solver = svd_solver
         self.random_state = random_state
         self._pca: Optional[PCA] = None
+        self._components: Optional[np.ndarray] = None   # (k, N)
+        self._evr:        Optional[np.ndarray] = None   # (k,)
 
     # ------------------------------------------------------------------
     # Core interface
@@ -100,6 +108,70 @@ class PCAReducer(DimensionalityReducer):
         )
         # sklearn PCA expects (samples, features) = (T, N)
         self._pca.fit(X.T)
+        self._components = self._pca.components_
+        self._evr        = self._pca.explained_variance_ratio_
+        self._is_fitted  = True
+        return self
+
+    def fit_stream(
+        self,
+        data,
+        subjects:   Optional[Sequence] = None,
+        method:     str = "covariance",
+        batch_size: Optional[int] = None,
+    ) -> "PCAReducer":
+        """
+        Fit group PCA on temporally concatenated subjects, one at a time.
+
+        Equivalent to ``fit(np.concatenate(subjects, axis=1))`` but the
+        concatenation is never materialised.
+
+        Parameters
+        ----------
+        data : np.ndarray (S, N, T), iterable of (N, T), or DataLoader
+            Subjects to pool (see Neuroreduce.streaming).
+        subjects : sequence or None
+            DataLoader subject IDs. Default: all study subjects.
+        method : str
+            'covariance'  — accumulate the exact (N, N) covariance and
+                            eigendecompose it once. Memory O(N²); exact
+                            (up to component signs). Suited to N up to a
+                            few thousand parcels.
+            'incremental' — sklearn IncrementalPCA, updated per subject.
+                            Memory O(k·N); approximate. For large N.
+            Default: 'covariance'.
+        batch_size : int or None
+            'incremental' only: split each subject into chunks of at most
+            this many timepoints (each chunk must have >= k timepoints).
+            Default: None (one partial_fit per subject).
+
+        Returns
+        -------
+        self
+        """
+        if method not in ("covariance", "incremental"):
+            raise ValueError(
+                f"method must be 'covariance' or 'incremental', got '{method}'."
+            )
+        stream = (self._validate_input(X)
+                  for X in iter_subject_timeseries(data, subjects))
+
+        if method == "covariance":
+            acc = CovarianceAccumulator().update_from(stream)
+            if acc.n == 0:
+                raise ValueError("fit_stream received no subjects.")
+            self._fit_covariance(acc.covariance())
+        else:
+            ipca = IncrementalPCA(n_components=self.k)
+            for X in stream:
+                step = max(1, X.shape[1] if batch_size is None else batch_size)
+                for t0 in range(0, X.shape[1], step):
+                    ipca.partial_fit(X[:, t0:t0 + step].T)
+            if not hasattr(ipca, "components_"):
+                raise ValueError("fit_stream received no subjects.")
+            self._pca        = ipca
+            self._components = ipca.components_
+            self._evr        = ipca.explained_variance_ratio_
         self._is_fitted = True
         return self
 
@@ -132,8 +204,23 @@ class PCAReducer(DimensionalityReducer):
             descending explained variance.
         """
         self._check_is_fitted()
-        # sklearn stores components_ as (k, N); transpose to (N, k)
-        return self._pca.components_.T
+        # Components are stored sklearn-style as (k, N); transpose to (N, k)
+        return self._components.T
+
+    def _fit_covariance(self, C: np.ndarray) -> None:
+        """Store the top-k eigenvectors of a (N, N) covariance matrix."""
+        if self.k > C.shape[0]:
+            raise ValueError(f"k={self.k} exceeds the number of parcels N={C.shape[0]}.")
+        e_val, e_vec = np.linalg.eigh(C)                 # ascending
+        e_val = e_val[::-1][:self.k]
+        W     = e_vec[:, ::-1][:, :self.k]               # (N, k)
+        # Deterministic signs: largest-magnitude loading positive
+        # (the convention sklearn applies to components_)
+        idx   = np.argmax(np.abs(W), axis=0)
+        W    *= np.sign(W[idx, np.arange(self.k)])
+        self._pca        = None
+        self._components = W.T.astype(np.float32)
+        self._evr        = e_val / np.trace(C)
 
     # ------------------------------------------------------------------
     # PCA-specific extras
@@ -149,7 +236,7 @@ class PCAReducer(DimensionalityReducer):
         np.ndarray, shape (k,)
         """
         self._check_is_fitted()
-        return self._pca.explained_variance_ratio_
+        return self._evr
 
     @property
     def cumulative_explained_variance_(self) -> np.ndarray:
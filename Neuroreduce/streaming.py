@@ -0,0 +1,159 @@
+"""
+Neuroreduce/streaming.py
+------------------------
+Helpers for cohort-level fits that never hold more than one subject in
+memory.
+
+Group-level bases (group FC harmonics, group PCA) are usually fitted on
+all subjects at once, which forces either a list of every subject's
+(N, T) array or an ``np.concatenate`` of them — several GB for a full
+HCP cohort, and twice that at the moment of concatenation. The tools
+here consume subjects one at a time instead:
+
+    iter_subject_timeseries : uniform (N, T) iterator over an array stack,
+                              an iterable, or any LibBrain DataLoader
+    CovarianceAccumulator   : running mean and cross-product sums, merged
+                              exactly across subjects (Chan et al. update)
+
+Notation follows the rest of Neuroreduce: X is (N, T).
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+
+
+def iter_subject_timeseries(
+    source,
+    subjects: Optional[Sequence] = None,
+) -> Iterator[np.ndarray]:
+    """
+    Yield one (N, T) BOLD array per subject.
+
+    Parameters
+    ----------
+    source : np.ndarray (S, N, T), iterable of (N, T), or DataLoader
+        Anything providing per-subject timeseries. DataLoaders are
+        recognised by their ``get_subjectData`` method and read lazily,
+        one subject per step.
+    subjects : sequence or None
+        DataLoader subject IDs to read. Default: all study subjects
+        (``source.get_allStudySubjects()``). Ignored for other sources.
+
+    Yields
+    ------
+    X : np.ndarray, shape (N, T)
+    """
+    if hasattr(source, 'get_subjectData'):
+        if subjects is None:
+            subjects = source.get_allStudySubjects()
+        for subj in subjects:
+            yield source.get_subjectData(subj)[subj]['timeseries']
+    else:
+        yield from source
+
+
+class CovarianceAccumulator:
+    """
+    Streaming estimate of the (N, N) covariance of concatenated data.
+
+    Keeps the running sample count n, the mean μ (N,) and the centred
+    cross-product sum C = Σ_t (x_t − μ)(x_t − μ)ᵀ. Each update merges a
+    subject's own statistics with Chan et al.'s pairwise formula, which is
+    exact and numerically stable (no large raw sums of squares):
+
+        δ  = μ_b − μ
+        C ← C + C_b + δ δᵀ · n n_b / (n + n_b)
+        μ ← μ + δ · n_b / (n + n_b)
+
+    The result equals np.cov of the concatenated (N, ΣT) matrix, using
+    O(N²) memory regardless of cohort size.
+
+    Parameters
+    ----------
+    dtype : numpy dtype
+        Accumulation dtype. Default: float64.
+
+    Examples
+    --------
+    >>> acc = CovarianceAccumulator()
+    >>> for X in iter_subject_timeseries(DL):
+    ...     acc.update(X)
+    >>> C = acc.covariance()            # (N, N)
+    """
+
+    def __init__(self, dtype: np.dtype = np.float64):
+        self.dtype = dtype
+        self.n:    int                   = 0
+        self.mean: Optional[np.ndarray] = None   # (N,)
+        self.C:    Optional[np.ndarray] = None   # (N, N)
+
+    def update(self, X: np.ndarray) -> "CovarianceAccumulator":
+        """
+        Add one subject's timeseries.
+
+        Parameters
+        ----------
+        X : np.ndarray, shape (N, T)
+        """
+        X = np.asarray(X, dtype=self.dtype)
+        if X.ndim != 2:
+            raise ValueError(
+                f"X must be 2-D with shape (N, T), got shape {X.shape}"
+            )
+        N, n_b = X.shape
+        if n_b == 0:
+            return self
+        if self.mean is not None and N != self.mean.shape[0]:
+            raise ValueError(
+                f"All subjects must have N={self.mean.shape[0]} parcels, "
+                f"got {N}."
+            )
+
+        mean_b = X.mean(axis=1)
+        Xc     = X - mean_b[:, None]
+        C_b    = Xc @ Xc.T                              # one GEMM
+
+        if self.mean is None:
+            self.n, self.mean, self.C = n_b, mean_b, C_b
+            return self
+
+        n     = self.n + n_b
+        delta = mean_b - self.mean
+        self.C    += C_b + np.outer(delta, delta) * (self.n * n_b / n)
+        self.mean += delta * (n_b / n)
+        self.n     = n
+        return self
+
+    def update_from(self, source: Iterable[np.ndarray]) -> "CovarianceAccumulator":
+        """Add every (N, T) array of an iterable."""
+        for X in source:
+            self.update(X)
+        return self
+
+    def covariance(self, ddof: int = 1) -> np.ndarray:
+        """Covariance of the concatenated data, shape (N, N)."""
+        self._check_not_empty()
+        return self.C / max(self.n - ddof, 1)
+
+    def correlation(self) -> np.ndarray:
+        """
+        Pearson correlation of the concatenated data, shape (N, N).
+
+        Constant parcels get zero correlation (instead of NaN).
+        """
+        self._check_not_empty()
+        sd = np.sqrt(np.diag(self.C))
+        inv_sd = np.zeros_like(sd)
+        np.divide(1.0, sd, out=inv_sd, where=sd > 0)
+        R = self.C * inv_sd[:, None] * inv_sd[None, :]
+        np.fill_diagonal(R, np.where(sd > 0, 1.0, 0.0))
+        return R
+
+    def _check_not_empty(self) -> None:
+        if self.mean is None:
+            raise RuntimeError(
+                "CovarianceAccumulator is empty. Call update() first."
+            )
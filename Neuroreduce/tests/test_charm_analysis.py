@@ -14,8 +14,10 @@ Parameters chosen so that:
 Run with:  python -m pytest tests/test_charm_analysis.py -v
 """
 
+import h5py
 import numpy as np
 import pytest
+from scipy import stats
 
 from Neuroreduce import CHARMReducer
 from Neuroreduce.utils.charm_analysis import (
@@ -23,7 +25,19 @@ from Neuroreduce.utils.charm_analysis import (
     SubjectIndex,
     GroupAnalysisResult,
     ClassificationResult,
+    IdentifiabilityResult,
 )
+from Neuroreduce.utils.ecm import (
+    compute_ecm,
+    compute_ecm_batch,
+    compute_ecm_per_subject,
+    compute_reconstructed_ecm_per_subject,
+    edge_fcd,
+    edge_fcd_variance,
+)
+from Neuroreduce.utils.fcd import StreamingFCD, sliding_window_fc
+from Neuroreduce.utils.lagged_fc import lagged_fc
+from Neuroreduce.utils.permutation import permutation_test_mean_diff
 
 # ── shared test parameters ────────────────────────────────────────────────────
 
@@ -145,6 +159,91 @@ class TestAnalyzeGroupShapes:
             assert p.shape == (1, n_edges), f"Expected (1, {n_edges}), got {p.shape}"
 
 
+class TestGroupPipeline:
+    FIELDS = ('fc_sub', 'metastability', 'hierarchical_levels', 'trophic_coherence')
+
+    def test_chunks_and_jobs_do_not_change_results(self, analysis, rest_result):
+        res = analysis.analyze_group(0, n_jobs=2, subjects_per_chunk=2)
+        for f in self.FIELDS:
+            assert np.allclose(getattr(res, f), getattr(rest_result, f), equal_nan=True)
+        for p, q in zip(res.patterns, rest_result.patterns):
+            assert np.allclose(p, q)
+
+    def test_resume_from_results_file(self, analysis, rest_result, tmp_path):
+        path = str(tmp_path / 'group.h5')
+        analysis.analyze_group(0, subjects_per_chunk=1, results_path=path)
+        with h5py.File(path, 'a') as f:                # simulate a crash
+            f['done'][1:] = False
+            f['metastability'][1:] = 0.0
+        res = analysis.analyze_group(0, subjects_per_chunk=1, results_path=path)
+        assert np.allclose(res.metastability, rest_result.metastability)
+
+    def test_results_file_settings_mismatch_raises(self, reducer, analysis, tmp_path):
+        path = str(tmp_path / 'group.h5')
+        analysis.analyze_group(0, results_path=path)
+        other = CHARMAnalysis(reducer, T_PER_SUB, N_SUB, tau=TAU + 1)
+        with pytest.raises(ValueError, match="different settings"):
+            other.analyze_group(0, results_path=path)
+
+    def test_results_file_data_mismatch_raises(self, analysis, tmp_path):
+        path = str(tmp_path / 'group.h5')
+        analysis.analyze_group(0, results_path=path)
+        X = np.random.default_rng(7).standard_normal((N, TM)).astype(np.float32)
+        refit = CHARMReducer(k=K, epsilon=50.0, t_horizon=2, sort_eigenvectors=True).fit(X)
+        other = CHARMAnalysis(refit, T_PER_SUB, N_SUB, tau=TAU)
+        with pytest.raises(ValueError, match="different settings"):
+            other.analyze_group(0, results_path=path)
+
+
+# ── windowed FC fingerprints (FULLWIN=0) ─────────────────────────────────────
+
+class TestWindowedFingerprint:
+
+    WIN, STEP = 8, 3
+
+    @pytest.fixture
+    def windowed(self, reducer):
+        return CHARMAnalysis(reducer, T_PER_SUB, N_SUB, tau=TAU,
+                             fc_window=self.WIN, fc_step=self.STEP)
+
+    def test_sliding_window_fc_matches_corrcoef(self):
+        X = rng.standard_normal((60, 5)) + 3.0
+        il = np.tril_indices(5, k=-1)
+        ref = np.array([np.corrcoef(X[t:t + self.WIN].T)[il]
+                        for t in range(0, 60 - self.WIN + 1, self.STEP)])
+        assert np.allclose(sliding_window_fc(X, self.WIN, self.STEP, edges=il), ref)
+
+    def test_pattern_shape(self, windowed):
+        patterns = windowed.analyze_group(0).patterns
+        n_win = (T_PER_SUB - self.WIN) // self.STEP + 1
+        assert all(p.shape == (n_win, K * (K - 1) // 2) for p in patterns)
+
+    def test_full_window_equals_fullwin(self, reducer, rest_result):
+        full = CHARMAnalysis(reducer, T_PER_SUB, N_SUB, tau=TAU, fc_window=T_PER_SUB)
+        for p, ref in zip(full.analyze_group(0).patterns, rest_result.patterns):
+            assert np.allclose(p, ref)
+
+    def test_invalid_window_raises(self, reducer):
+        with pytest.raises(ValueError):
+            CHARMAnalysis(reducer, T_PER_SUB, N_SUB, fc_window=T_PER_SUB + 1)
+
+    def test_identifiability(self):
+        base = [rng.standard_normal((4, 6)) for _ in range(5)]
+        a = [p + 0.1 * rng.standard_normal(p.shape) for p in base]
+        b = [p + 0.1 * rng.standard_normal(p.shape) for p in base]
+        res = CHARMAnalysis.identifiability(a, b)
+        assert isinstance(res, IdentifiabilityResult)
+        ref = np.array([[np.corrcoef(x.ravel(), y.ravel())[0, 1] for y in b] for x in a])
+        assert np.allclose(res.matrix, ref)
+        assert np.isclose(res.i_diff, res.i_self - res.i_others)
+        assert res.success_rate == 1.0
+
+    def test_identifiability_shape_mismatch_raises(self):
+        with pytest.raises(ValueError):
+            CHARMAnalysis.identifiability([np.zeros((1, 3))] * 2,
+                                          [np.zeros((2, 3))] * 2)
+
+
 # ── metastability ─────────────────────────────────────────────────────────────
 
 class TestMetastability:
@@ -157,6 +256,110 @@ class TestMetastability:
         assert len(rest_result.metastability) == N_SUB
 
 
+class TestEdgeFCD:
+
+    @pytest.fixture
+    def signal(self):
+        return rng.standard_normal((40, 9))           # (T, D)
+
+    def test_matches_explicit_edges(self, signal):
+        i, j  = np.tril_indices(signal.shape[1], k=-1)
+        edges = signal[:, i] * signal[:, j]              # (T, n_edges)
+        edges /= np.linalg.norm(edges, axis=1, keepdims=True)
+        assert np.allclose(edge_fcd(signal), edges @ edges.T)
+
+    def test_chunked_variance(self, signal):
+        FCD = edge_fcd(signal)
+        ref = np.var(FCD[np.tril_indices(len(FCD), k=-1)])
+        assert np.isclose(edge_fcd_variance(signal), ref)
+        assert np.isclose(edge_fcd_variance(signal, chunk_size=7), ref)
+
+    def test_ecm_chunk_invariant(self, signal):
+        assert np.isclose(compute_ecm(signal), compute_ecm(signal, chunk_size=5))
+
+
+class TestStreamingFCD:
+
+    WIN, STEP = 15, 4
+
+    @pytest.fixture
+    def signal(self):
+        return rng.standard_normal((200, 8))          # (T, N)
+
+    @pytest.fixture
+    def reference(self, signal):
+        """Brute-force sliding-window FCD, shape (n_windows, n_windows)."""
+        iu = np.triu_indices(signal.shape[1], k=1)
+        starts = range(0, len(signal) - self.WIN + 1, self.STEP)
+        F = np.array([np.corrcoef(signal[t:t + self.WIN].T)[iu] for t in starts])
+        return np.corrcoef(F)
+
+    def test_blockwise_moments(self, signal, reference):
+        vals = reference[np.triu_indices(len(reference), k=1)]
+        fcd = StreamingFCD(window=self.WIN, step=self.STEP, block_size=7).fit(signal)
+        assert fcd.n_windows_ == len(reference)
+        assert fcd.n_pairs_ == vals.size
+        assert np.isclose(fcd.mean_, vals.mean())
+        assert np.isclose(fcd.variance_, np.var(vals))
+
+    def test_quantile_sketch(self, signal, reference):
+        vals = reference[np.triu_indices(len(reference), k=1)]
+        fcd = StreamingFCD(window=self.WIN, step=self.STEP, block_size=7).fit(signal)
+        q = [0.1, 0.5, 0.9]
+        assert np.allclose(fcd.quantile(q), np.quantile(vals, q), atol=2e-3)
+        assert fcd.ks_distance(fcd) == 0.0
+
+    def test_spill_to_disk(self, signal, reference, tmp_path):
+        path = str(tmp_path / 'fcd.npy')
+        StreamingFCD(window=self.WIN, step=self.STEP, block_size=5,
+                     spill_path=path).fit(signal)
+        assert np.allclose(np.load(path), reference, atol=1e-6)
+
+    def test_window_fc_blocks_and_buffer(self, signal):
+        iu = np.triu_indices(signal.shape[1], k=1)
+        ref = np.array([np.corrcoef(signal[t:t + self.WIN].T)[iu]
+                        for t in range(0, len(signal) - self.WIN + 1, self.STEP)])
+        assert np.allclose(sliding_window_fc(signal, self.WIN, self.STEP,
+                                             block_size=3), ref)
+        buf = np.empty(ref.shape, dtype=np.float32)
+        out = sliding_window_fc(signal, self.WIN, self.STEP, out=buf)
+        assert out is buf
+        assert np.allclose(buf, ref, atol=1e-6)
+        with pytest.raises(ValueError):
+            sliding_window_fc(signal, self.WIN, self.STEP, out=buf[1:])
+
+    def test_edge_mode_matches_edge_fcd(self, signal):
+        FCD = edge_fcd(signal)
+        vals = FCD[np.tril_indices(len(FCD), k=-1)]
+        fcd = StreamingFCD(block_size=33).fit(signal)
+        assert np.isclose(fcd.variance_, np.var(vals))
+
+
+class TestECMBatch:
+
+    @pytest.fixture
+    def stack(self):
+        return rng.standard_normal((N_SUB, N, T_PER_SUB))   # (S, N, T)
+
+    def test_matches_per_subject(self, stack):
+        concat = np.concatenate(list(stack), axis=1)         # (N, S*T)
+        ref = compute_ecm_per_subject(concat, N_SUB, T_PER_SUB)
+        ecm = compute_ecm_batch(stack, n_jobs=2, subjects_per_chunk=1)
+        assert ecm.shape == (N_SUB,)
+        assert np.allclose(ecm, ref)
+
+    def test_reconstruction_matches_reducer(self, stack):
+        """Shared basis reproduces the per-subject transform/inverse loop."""
+        from Neuroreduce import PCAReducer
+        concat = np.concatenate(list(stack), axis=1)
+        r = PCAReducer(k=K).fit(concat)
+        src, rec = compute_reconstructed_ecm_per_subject(
+            concat, r, N_SUB, T_PER_SUB)
+        b_src, b_rec = compute_ecm_batch(stack, basis=r.get_basis())
+        assert np.allclose(b_src, src)
+        assert np.allclose(b_rec, rec, atol=1e-5)
+
+
 # ── lagged FC ─────────────────────────────────────────────────────────────────
 
 class TestLaggedFC:
@@ -177,6 +380,46 @@ class TestLaggedFC:
             assert not np.allclose(fc, fc.T), \
                 f"Subject {s} lagged FC is symmetric — check tau or data."
 
+    def test_matches_corrcoef(self, analysis, rest_result):
+        """_lagged_fc equals np.corrcoef on the [0:-τ] / [τ:] slices."""
+        idx = analysis.subject_index(0)
+        Phi_sub = stats.zscore(analysis._Phi[idx.slice(0), :])
+        ref = np.corrcoef(Phi_sub[:-TAU].T, Phi_sub[TAU:].T)[:K, K:]
+        assert np.allclose(rest_result.fc_sub[0], ref)
+
+    def test_lag_profile(self, analysis, rest_result):
+        lags = [1, TAU, 5]
+        prof = analysis.lag_profile(lags, subjects_per_chunk=2, block_size=1)
+        assert prof.shape == (N_SUB, len(lags), K, K)
+        assert np.allclose(prof[:, 1], rest_result.fc_sub)
+
+    def test_batched_lags_match_corrcoef(self):
+        X = rng.standard_normal((2, 40, 4)) + 1.0
+        lags = [0, 3, 38]
+        fc = lagged_fc(X, lags)
+        for s in range(2):
+            for l, t in enumerate(lags):
+                ref = np.corrcoef(X[s, :40 - t].T, X[s, t:].T)[:4, 4:]
+                assert np.allclose(fc[s, l], ref)
+
+    def test_single_lag_matches_corrcoef(self):
+        X = rng.standard_normal((3, 50, 5)) + 2.0
+        X[1, :, 2] = 1.0                                  # constant channel → 0
+        for t in (0, 1, 7):
+            fc = lagged_fc(X, [t])
+            assert fc.shape == (3, 1, 5, 5)
+            for s in range(3):
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    ref = np.corrcoef(X[s, :50 - t].T, X[s, t:].T)[:5, 5:]
+                assert np.allclose(fc[s, 0], np.nan_to_num(ref))
+            assert np.allclose(lagged_fc(X[0], [t])[0], fc[0, 0])
+            # same as the FFT path it replaces for one lag
+            assert np.allclose(fc[:, 0], lagged_fc(X, [t, t + 1])[:, 0])
+
+    def test_invalid_lag_raises(self):
+        with pytest.raises(ValueError):
+            lagged_fc(np.zeros((10, 3)), [9])
+
 
 # ── trophic coherence ─────────────────────────────────────────────────────────
 
@@ -199,6 +442,21 @@ class TestTrophicCoherence:
         assert np.all(finite >= -1e-9), \
             "Trophic levels contain negative values after min-shift"
 
+    def test_batched_matches_per_subject(self, rest_result):
+        gamma, q = CHARMAnalysis.trophic_analysis(rest_result.fc_sub)
+        for s in range(N_SUB):
+            g_s, q_s = CHARMAnalysis._trophic_analysis(rest_result.fc_sub[s])
+            assert np.allclose(gamma[s], g_s, equal_nan=True)
+            assert np.isclose(q[s], q_s, equal_nan=True)
+        assert np.allclose(gamma, rest_result.hierarchical_levels, equal_nan=True)
+
+    def test_degenerate_subject_is_nan(self):
+        fc = np.stack([np.full((K, K), 0.5), -np.ones((K, K))])
+        with pytest.warns(RuntimeWarning):
+            gamma, q = CHARMAnalysis.trophic_analysis(fc)
+        assert np.all(np.isfinite(gamma[0])) and np.isfinite(q[0])
+        assert np.all(np.isnan(gamma[1])) and np.isnan(q[1])
+
 
 # ── classification ────────────────────────────────────────────────────────────
 
@@ -245,6 +503,38 @@ class TestClassification:
         assert np.allclose(row_sums, 1.0, atol=1e-6), \
             f"Confusion matrix rows do not sum to 1: {row_sums}"
 
+    def test_n_jobs_gives_identical_result(self, analysis, rest_result, task_result):
+        kw = dict(n_train=N_SUB - 1, k_fold=6, random_state=0)
+        r1 = analysis.classification(rest_result.patterns, task_result.patterns, **kw)
+        r2 = analysis.classification(rest_result.patterns, task_result.patterns,
+                                     n_jobs=2, **kw)
+        assert np.array_equal(r1.per_fold_accuracy, r2.per_fold_accuracy)
+
+    def test_precomputed_matches_rbf_svc(self, analysis):
+        """Precomputed Gram + per-fold gamma reproduces SVC(kernel='rbf')."""
+        from sklearn.svm import SVC
+        p_rest = [rng.standard_normal((2, 6)) for _ in range(N_SUB)]
+        p_task = [rng.standard_normal((2, 6)) + 0.5 for _ in range(N_SUB)]
+        result = analysis.classification(p_rest, p_task, n_train=N_SUB - 1,
+                                         k_fold=4, random_state=1)
+
+        shuffle = np.random.default_rng(1)
+        for fold in range(4):
+            order = shuffle.permutation(N_SUB)
+            train, val = order[:N_SUB - 1], order[N_SUB - 1:]
+            clf = SVC(kernel='rbf').fit(
+                np.vstack([p_rest[s] for s in train] + [p_task[s] for s in train]),
+                np.repeat([0, 1], 2 * len(train)),
+            )
+            hits = sum(int(np.round(clf.predict(p_rest[s]).mean())) == 0 for s in val) \
+                 + sum(int(np.round(clf.predict(p_task[s]).mean())) == 1 for s in val)
+            assert result.per_fold_accuracy[fold] == pytest.approx(hits / (2 * len(val)))
+
+    def test_bad_kernel_raises(self, analysis, rest_result, task_result):
+        with pytest.raises(ValueError, match="kernel"):
+            analysis.classification(rest_result.patterns, task_result.patterns,
+                                    n_train=N_SUB - 1, k_fold=2, kernel='poly')
+
 
 # ── calc_pfctau ───────────────────────────────────────────────────────────────
 
@@ -274,3 +564,58 @@ class TestCalcPfctau:
             n_permutations=99,
         )
         assert nsig.dtype == bool
+
+    def test_matches_scipy_exact(self, analysis, rest_result, task_result):
+        """With N_SUB=3 both enumerate all 2**3 sign flips: identical p."""
+        from scipy import stats
+        _, pfctau = analysis.calc_pfctau(
+            rest_result.fc_sub, task_result.fc_sub, n_permutations=99,
+        )
+        ref = [stats.permutation_test(
+                   (rest_result.fc_sub[:, j, i], task_result.fc_sub[:, j, i]),
+                   lambda x, y: np.mean(x) - np.mean(y),
+                   permutation_type='samples', n_resamples=99,
+               ).pvalue
+               for i in range(K) for j in range(K)]
+        assert np.allclose(pfctau, ref)
+
+
+class TestPermutationEngine:
+
+    @pytest.fixture
+    def samples(self):
+        # Own generator: the data must not depend on which tests ran before
+        gen = np.random.default_rng(3)
+        a = gen.standard_normal((20, 6)) + np.linspace(0, 1, 6)
+        b = gen.standard_normal((20, 6))
+        return a, b
+
+    @pytest.mark.parametrize("ptype", ["samples", "independent"])
+    def test_matches_scipy_within_mc_error(self, samples, ptype):
+        from scipy import stats
+        a, b = samples
+        _, p = permutation_test_mean_diff(a, b, n_resamples=4000,
+                                          permutation_type=ptype)
+        ref = stats.permutation_test(
+            (a, b), lambda x, y, axis: x.mean(axis) - y.mean(axis),
+            permutation_type=ptype, n_resamples=4000, vectorized=True,
+            axis=0, random_state=0,
+        ).pvalue
+        # Both are Monte Carlo estimates of 2 * p1 (p1 = one-sided p), so
+        # the binomial error is that of p1, doubled. Allow 4 standard errors
+        # of their difference; p1 is floored at 1e-2 because for tiny p
+        # the add-one adjustment and the discreteness of the counts dominate
+        p1 = np.clip(ref / 2, 1e-2, 0.5)
+        se = 2 * np.sqrt(2 * p1 * (1 - p1) / 4000)
+        assert np.all(np.abs(p - ref) <= 4 * se)
+
+    def test_independent_of_n_jobs_and_blocks(self, samples):
+        a, b = samples
+        _, p1 = permutation_test_mean_diff(a, b, n_resamples=999)
+        _, p2 = permutation_test_mean_diff(a, b, n_resamples=999,
+                                           block_size=100, n_jobs=2)
+        assert np.array_equal(p1, p2)
+
+    def test_unpaired_samples_raise(self):
+        with pytest.raises(ValueError, match="paired"):
+            permutation_test_mean_diff(np.zeros((3, 2)), np.zeros((4, 2)))
@@ -18,10 +18,21 @@ Synthetic setup
 
 import numpy as np
 import pytest
+import scipy.sparse as sp
 from scipy.linalg import eigh
 
 from Neuroreduce import ConnectomeHarmonicsReducer, FunctionalHarmonicsReducer
-from Neuroreduce.utils.harmonic_analysis import HarmonicAnalysis
+from Neuroreduce.fc import batch_fc
+from Neuroreduce.methods.base_laplacian import symmetric_normalise
+from Neuroreduce.methods.functional_harmonics import GroupFCAccumulator
+from Neuroreduce.utils.harmonic_analysis import (
+    HarmonicAnalysis,
+    reconstruction_error_curve,
+    rsn_indicator_matrix,
+    project_rsn_vectors_batch,
+    select_harmonics_by_rsn_batch,
+)
+from Neuroreduce.utils.graph_filter import ChebyshevGraphFilter
 
 
 # ── shared parameters ─────────────────────────────────────────────────────────
@@ -153,6 +164,137 @@ class TestLaplacian:
         assert np.all(ev >= -1e-8)
         assert np.all(ev <= 2.0 + 1e-8)
 
+    @pytest.mark.parametrize("laplacian_type", ['unnormalised', 'symmetric'])
+    def test_sparse_input_matches_dense(self, SC, laplacian_type):
+        """A scipy.sparse SC must give the same spectrum as the dense SC."""
+        kw = dict(k=k, threshold=0.3, laplacian_type=laplacian_type)
+        r_dense  = ConnectomeHarmonicsReducer(**kw).fit(SC=SC)
+        r_sparse = ConnectomeHarmonicsReducer(**kw).fit(SC=sp.csr_matrix(SC))
+        assert np.allclose(r_dense.eigenvalues_, r_sparse.eigenvalues_)
+
+    @pytest.mark.parametrize("laplacian_type", ['unnormalised', 'symmetric'])
+    def test_eigsh_matches_eigh(self, SC, laplacian_type):
+        """Shift-invert eigsh must recover the k lowest eigh modes."""
+        kw = dict(k=k, threshold=0.0, laplacian_type=laplacian_type)
+        r_eigh  = ConnectomeHarmonicsReducer(**kw).fit(SC=SC)
+        r_eigsh = ConnectomeHarmonicsReducer(eigen_solver='eigsh',
+                                             **kw).fit(SC=sp.csr_matrix(SC))
+        assert r_eigsh.eigenvalues_.shape == (k,)
+        assert np.allclose(r_eigsh.eigenvalues_, r_eigh.eigenvalues_[:k],
+                           atol=1e-8)
+        # Eigenvectors agree up to sign
+        overlap = np.abs(np.sum(r_eigsh.get_basis() * r_eigh.get_basis(), axis=0))
+        assert np.allclose(overlap, 1.0, atol=1e-6)
+
+    def test_eigsh_k_eq_N_raises(self, SC):
+        with pytest.raises(ValueError, match="eigsh"):
+            ConnectomeHarmonicsReducer(k=N, eigen_solver='eigsh').fit(SC=SC)
+
+    def test_invalid_eigen_solver_raises(self):
+        with pytest.raises(ValueError, match="eigen_solver"):
+            ConnectomeHarmonicsReducer(k=k, eigen_solver='invalid')
+
+
+# ── fit_batch ─────────────────────────────────────────────────────────────────
+
+class TestFitBatch:
+
+    @pytest.fixture
+    def SC_stack(self, SC):
+        return np.stack([SC, SC ** 2, np.sqrt(SC), 0.5 * (SC + SC ** 3)])
+
+    @staticmethod
+    def _assert_same_up_to_sign(W1, W2):
+        overlap = np.abs(np.sum(W1 * W2, axis=0))
+        assert np.allclose(overlap, 1.0, atol=1e-6)
+
+    def test_shape(self, SC_stack):
+        bases = ConnectomeHarmonicsReducer(k=k, threshold=0.0).fit_batch(SC=SC_stack)
+        assert bases.shape == (len(SC_stack), N, k)
+
+    @pytest.mark.parametrize("laplacian_type", ['unnormalised', 'symmetric'])
+    def test_matches_per_subject_fit(self, SC_stack, laplacian_type):
+        kw = dict(k=k, threshold=0.2, laplacian_type=laplacian_type)
+        bases, e_val = ConnectomeHarmonicsReducer(**kw).fit_batch(
+            SC=SC_stack, return_eigenvalues=True)
+        for s, SC_s in enumerate(SC_stack):
+            r = ConnectomeHarmonicsReducer(**kw).fit(SC=SC_s)
+            assert np.allclose(e_val[s], r.eigenvalues_[:k])
+            self._assert_same_up_to_sign(bases[s], r.get_basis())
+
+    def test_parallel_matches_serial(self, SC_stack):
+        r = ConnectomeHarmonicsReducer(k=k, threshold=0.0)
+        assert np.allclose(r.fit_batch(SC=SC_stack, n_jobs=2),
+                           r.fit_batch(SC=SC_stack, n_jobs=1))
+
+    def test_sparse_list(self, SC_stack):
+        r = ConnectomeHarmonicsReducer(k=k, threshold=0.2)
+        bases = r.fit_batch(SC=[sp.csr_matrix(m) for m in SC_stack])
+        for s in range(len(SC_stack)):
+            self._assert_same_up_to_sign(bases[s], r.fit_batch(SC=SC_stack)[s])
+
+    def test_functional_harmonics(self, X):
+        X_stack = np.stack([X, X[::-1], 2 * X])
+        r = FunctionalHarmonicsReducer(k=k, threshold=0.0)
+        bases = r.fit_batch(X=X_stack)
+        assert bases.shape == (3, N, k)
+        self._assert_same_up_to_sign(bases[1], r.fit(X=X_stack[1]).get_basis())
+
+    def test_does_not_fit_reducer(self, SC_stack):
+        r = ConnectomeHarmonicsReducer(k=k)
+        r.fit_batch(SC=SC_stack)
+        assert not r._is_fitted
+
+    def test_requires_input(self):
+        with pytest.raises(ValueError, match="SC"):
+            ConnectomeHarmonicsReducer(k=k).fit_batch()
+
+
+# ── symmetric_normalise ───────────────────────────────────────────────────────
+
+class TestSymmetricNormalise:
+
+    @pytest.fixture
+    def L_and_deg(self, SC):
+        deg = SC.sum(axis=0)
+        deg[0] = 0.0                                  # isolated parcel
+        return np.diag(deg) - SC, deg
+
+    def test_matches_matrix_products(self, L_and_deg):
+        L, deg = L_and_deg
+        d  = np.array([1.0 / np.sqrt(x) if x > 0 else 0.0 for x in deg])
+        D2 = np.diag(d)
+        assert np.allclose(symmetric_normalise(L, deg), D2 @ L @ D2)
+
+    def test_not_inplace_leaves_input(self, L_and_deg):
+        L, deg = L_and_deg
+        L_copy = L.copy()
+        symmetric_normalise(L, deg)
+        assert np.array_equal(L, L_copy)
+
+    def test_sparse_matches_dense(self, L_and_deg):
+        L, deg = L_and_deg
+        L_sp = symmetric_normalise(sp.csr_matrix(L), deg)
+        assert sp.issparse(L_sp)
+        assert np.allclose(L_sp.toarray(), symmetric_normalise(L, deg))
+
+    def test_stack_matches_per_matrix(self, L_and_deg):
+        L, deg = L_and_deg
+        L_stack   = np.stack([L, 2 * L, 3 * L])
+        deg_stack = np.stack([deg, 2 * deg, 3 * deg])
+        out = symmetric_normalise(L_stack, deg_stack)
+        for s in range(3):
+            assert np.allclose(out[s], symmetric_normalise(L_stack[s], deg_stack[s]))
+
+    def test_laplacian_stack_matches_single(self, SC):
+        """_build_laplacian on (S, N, N) equals S separate calls."""
+        r = ConnectomeHarmonicsReducer(k=k, threshold=0.3,
+                                       laplacian_type='symmetric')
+        stack = np.stack([SC, SC ** 2, 0.5 * SC])
+        L_stack = r._build_laplacian(stack)
+        for s in range(len(stack)):
+            assert np.allclose(L_stack[s], r._build_laplacian(stack[s]))
+
 
 # ── ConnectomeHarmonicsReducer ────────────────────────────────────────────────
 
@@ -235,6 +377,138 @@ class TestFunctionalHarmonics:
         assert Z.shape == (k, T)
 
 
+# ── Streaming group FC ───────────────────────────────────────────────────────
+
+class _ListLoader:
+    """Minimal stand-in for a LibBrain DataLoader."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def get_allStudySubjects(self):
+        return list(self.data)
+
+    def get_subjectData(self, s):
+        return {s: {'timeseries': self.data[s]}}
+
+
+class TestGroupFC:
+
+    @pytest.fixture
+    def cohort(self):
+        return [rng.standard_normal((N, T)) for _ in range(4)]
+
+    def test_mean_matches_average(self, cohort):
+        FC = GroupFCAccumulator().update_from(iter(cohort)).fc()
+        assert np.allclose(FC, np.mean([np.corrcoef(x) for x in cohort], axis=0))
+
+    def test_fisher_z(self, cohort):
+        FC = GroupFCAccumulator(fisher_z=True).update_from(cohort).fc()
+        z = np.mean([np.arctanh(np.clip(np.corrcoef(x), -1 + 1e-7, 1 - 1e-7))
+                     for x in cohort], axis=0)
+        assert np.allclose(FC, np.tanh(z))
+
+    def test_pooled_matches_concatenation(self, cohort):
+        FC = GroupFCAccumulator(mode='pooled').update_from(cohort).fc()
+        assert np.allclose(FC, np.corrcoef(np.concatenate(cohort, axis=1)))
+
+    def test_pooled_fisher_z_raises(self):
+        with pytest.raises(ValueError):
+            GroupFCAccumulator(mode='pooled', fisher_z=True)
+
+    def test_fit_group_from_loader(self, cohort):
+        DL = _ListLoader({f's{i}': x for i, x in enumerate(cohort)})
+        r = FunctionalHarmonicsReducer(k=k, threshold=0.0).fit_group(DL)
+        ref = FunctionalHarmonicsReducer(k=k, threshold=0.0)
+        ref._fit_matrix(np.mean([np.corrcoef(x) for x in cohort], axis=0))
+        assert np.allclose(r.eigenvalues_, ref.eigenvalues_)
+        assert r.group_fc_.shape == (N, N)
+
+    def test_fit_group_empty_raises(self):
+        with pytest.raises(ValueError):
+            FunctionalHarmonicsReducer(k=k).fit_group([])
+
+    def test_stack_update_matches_streaming(self, cohort):
+        batched = GroupFCAccumulator(fisher_z=True).update_from(np.stack(cohort)).fc()
+        streamed = GroupFCAccumulator(fisher_z=True).update_from(iter(cohort)).fc()
+        assert np.allclose(batched, streamed)
+
+
+class TestBatchFC:
+
+    @pytest.fixture
+    def stack(self):
+        X = rng.standard_normal((5, N, T))
+        X[1, 2] = 3.0                                   # constant parcel
+        return X
+
+    @pytest.fixture
+    def reference(self, stack):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.stack([np.nan_to_num(np.corrcoef(x), nan=0.0) for x in stack])
+
+    @pytest.mark.parametrize("max_memory", [None, 1])
+    def test_matches_corrcoef(self, stack, reference, max_memory):
+        assert np.allclose(batch_fc(stack, max_memory=max_memory), reference)
+
+    def test_upper_and_fisher_z(self, stack, reference):
+        iu = np.triu_indices(N, k=1)
+        out = batch_fc(stack, upper=True, fisher_z=True)
+        assert out.shape == (5, len(iu[0]))
+        assert np.allclose(out, np.arctanh(reference[:, iu[0], iu[1]]))
+
+    def test_single_subject(self, stack, reference):
+        assert np.allclose(batch_fc(stack[0]), reference[0])
+
+
+# ── ChebyshevGraphFilter ──────────────────────────────────────────────────────
+
+class TestChebyshevGraphFilter:
+
+    @staticmethod
+    def _exact(SC, X, g, laplacian_type):
+        """Reference: U g(Λ) Uᵀ X from the reducer's full eigendecomposition."""
+        r = ConnectomeHarmonicsReducer(k=k, threshold=0.2,
+                                       laplacian_type=laplacian_type).fit(SC=SC)
+        U, lam = r.get_all_eigenvectors(), r.eigenvalues_
+        return U @ (g(lam)[:, None] * (U.T @ X))
+
+    @pytest.mark.parametrize("laplacian_type", ['unnormalised', 'symmetric'])
+    def test_smooth_kernel_matches_eigh(self, SC, X, laplacian_type):
+        g = lambda lam: np.exp(-0.1 * lam)
+        filt = ChebyshevGraphFilter(kernel=g, order=30, threshold=0.2,
+                                    laplacian_type=laplacian_type).fit(SC)
+        assert np.allclose(filt.filter(X),
+                           self._exact(SC, X, g, laplacian_type), atol=1e-8)
+
+    def test_sparse_input(self, SC, X):
+        kw = dict(band=(0, 1.0), threshold=0.2)
+        dense  = ChebyshevGraphFilter(**kw).fit(SC).filter(X)
+        sparse = ChebyshevGraphFilter(**kw).fit(sp.csr_matrix(SC)).filter(X)
+        assert np.allclose(dense, sparse)
+
+    def test_chunking_is_exact(self, SC, X):
+        filt = ChebyshevGraphFilter(band=(0, 1.0), threshold=0.2).fit(SC)
+        assert np.allclose(filt.filter(X), filt.filter(X, chunk_size=7))
+
+    def test_lowpass_keeps_dc(self, SC):
+        """The constant vector is the λ=0 mode: a low-pass filter keeps it."""
+        filt = ChebyshevGraphFilter(band=(0, 1.0), order=60,
+                                    threshold=0.2).fit(SC)
+        ones = np.ones((N, 1))
+        assert np.allclose(filt.filter(ones), ones, atol=0.05)
+
+    def test_kernel_xor_band(self):
+        with pytest.raises(ValueError, match="exactly one"):
+            ChebyshevGraphFilter()
+        with pytest.raises(ValueError, match="exactly one"):
+            ChebyshevGraphFilter(kernel=np.exp, band=(0, 1))
+
+    def test_filter_before_fit_raises(self, X):
+        with pytest.raises(RuntimeError, match="not fitted"):
+            ChebyshevGraphFilter(band=(0, 1)).filter(X)
+
+
 # ── HarmonicAnalysis ──────────────────────────────────────────────────────────
 
 class TestHarmonicAnalysis:
@@ -262,6 +536,40 @@ class TestHarmonicAnalysis:
         alpha_abs    = ch_analyser.project_rsn_vectors(RSN_matrix, sign_invariant=True)
         assert np.allclose(alpha_abs, np.abs(alpha_signed), atol=1e-4)
 
+    def test_project_rsn_matches_loop(self, ch_reducer, ch_analyser, RSN_matrix):
+        """Matrix-product projection equals the student's double loop."""
+        W = ch_reducer.get_basis()
+        ref = np.array([[max(np.dot(W[:, d], RSN_matrix[:, r]),
+                             np.dot(-W[:, d], RSN_matrix[:, r]))
+                         for r in range(n_rsn)] for d in range(k)])
+        assert np.allclose(ch_analyser.project_rsn_vectors(RSN_matrix),
+                           np.round(ref, 5))
+
+    def test_project_rsn_batch_stack(self, SC, RSN_matrix):
+        bases = ConnectomeHarmonicsReducer(k=k, threshold=0.0).fit_batch(
+            SC=np.stack([SC, SC ** 2]))
+        alpha = project_rsn_vectors_batch(bases, RSN_matrix)
+        assert alpha.shape == (2, k, n_rsn)
+        r = ConnectomeHarmonicsReducer(k=k, threshold=0.0).fit(SC=SC ** 2)
+        assert np.allclose(alpha[1],
+                           HarmonicAnalysis(r).project_rsn_vectors(RSN_matrix))
+
+    def test_select_harmonics_batch_matches_single(self, ch_analyser, RSN_matrix):
+        alpha = ch_analyser.project_rsn_vectors(RSN_matrix)
+        stack = np.stack([alpha, alpha[::-1]])
+        sel   = select_harmonics_by_rsn_batch(stack, n_select=3)
+        assert sel.shape == (2, 3)
+        for s in range(2):
+            assert np.array_equal(
+                sel[s], ch_analyser.select_harmonics_by_rsn(stack[s], n_select=3))
+
+    def test_rsn_indicator_matrix(self):
+        labels = np.array([2, 0, 2, 1, 0])
+        R = rsn_indicator_matrix(labels)
+        assert R.shape == (5, 3)
+        assert np.array_equal(R.sum(axis=1), np.ones(5))
+        assert R[0, 2] == 1 and R[3, 1] == 1
+
     # ── project_timeseries ────────────────────────────────────────────────────
 
     def test_project_timeseries_shape(self, ch_analyser, X):
@@ -288,6 +596,35 @@ class TestHarmonicAnalysis:
         beta = ch_analyser.project_timeseries(X, harmonic_idx=selected)
         assert beta.shape == (len(selected), T)
 
+    def test_project_timeseries_matches_loop(self, ch_reducer, ch_analyser, X):
+        """GEMM projection equals the student's per-timepoint loop."""
+        W = ch_reducer.get_basis()
+        ref = np.array([[max(np.dot(W[:, d], X[:, t]), np.dot(-W[:, d], X[:, t]))
+                         for t in range(T)] for d in range(k)])
+        assert np.allclose(ch_analyser.project_timeseries(X), ref, atol=1e-5)
+
+    def test_project_timeseries_chunked(self, ch_analyser, X):
+        assert np.array_equal(ch_analyser.project_timeseries(X),
+                              ch_analyser.project_timeseries(X, chunk_size=7))
+
+    def test_project_timeseries_stack(self, ch_analyser, X):
+        stack = np.stack([X, 2 * X, -X])
+        beta  = ch_analyser.project_timeseries(stack, sign_invariant=False)
+        assert beta.shape == (3, k, T)
+        for s in range(3):
+            assert np.allclose(beta[s], ch_analyser.project_timeseries(
+                stack[s], sign_invariant=False))
+
+    def test_project_timeseries_out_buffer(self, ch_analyser, X):
+        out  = np.empty((k, T), dtype=np.float32)
+        beta = ch_analyser.project_timeseries(X, out=out)
+        assert beta is out
+        assert np.allclose(out, ch_analyser.project_timeseries(X), atol=1e-4)
+
+    def test_project_timeseries_out_wrong_shape_raises(self, ch_analyser, X):
+        with pytest.raises(ValueError, match="out"):
+            ch_analyser.project_timeseries(X, out=np.empty((k, T + 1)))
+
     # ── select_harmonics_by_rsn ───────────────────────────────────────────────
 
     def test_select_harmonics_shape(self, ch_analyser, RSN_matrix):
@@ -329,6 +666,41 @@ class TestHarmonicAnalysis:
         assert all(errors[i] >= errors[i+1] for i in range(len(errors)-1)), \
             f"MSE did not decrease with more harmonics: {errors}"
 
+    # ── reconstruction_error_curve ────────────────────────────────────────────
+
+    def test_error_curve_matches_per_k(self, SC, X):
+        """One-pass curve equals reconstruction_error() refitted for each k."""
+        curve = HarmonicAnalysis(
+            ConnectomeHarmonicsReducer(k=15, threshold=0.0).fit(SC=SC)
+        ).reconstruction_error_curve(X)
+        assert curve['mse'].shape == (15,)
+        for ki in [1, 5, 15]:
+            r = ConnectomeHarmonicsReducer(k=ki, threshold=0.0).fit(SC=SC)
+            ref = HarmonicAnalysis(r).reconstruction_error(X)
+            assert np.isclose(curve['mse'][ki - 1], ref['mse'], atol=1e-6)
+            assert np.isclose(curve['pearson_r'][ki - 1], ref['pearson_r'], atol=1e-6)
+
+    def test_error_curve_non_orthogonal_is_least_squares(self, X):
+        W = rng.standard_normal((N, 6))
+        W /= np.linalg.norm(W, axis=0)            # unit-norm, not orthogonal
+        curve = reconstruction_error_curve(X, W)
+        for ki in [1, 3, 6]:
+            Wk    = W[:, :ki]
+            X_hat = Wk @ np.linalg.lstsq(Wk, X, rcond=None)[0]
+            assert np.isclose(curve['mse'][ki - 1], np.mean((X - X_hat) ** 2))
+
+    def test_error_curve_streaming(self, ch_reducer, X):
+        W = ch_reducer.get_basis()
+        stack  = np.stack([X, 2 * X])
+        curves = reconstruction_error_curve((x for x in stack), W)
+        assert curves['mse'].shape == (2, k)
+        assert np.allclose(curves['mse'][1],
+                           reconstruction_error_curve(stack[1], W)['mse'])
+
+    def test_error_curve_k_max_too_large_raises(self, ch_reducer, X):
+        with pytest.raises(ValueError, match="k_max"):
+            reconstruction_error_curve(X, ch_reducer.get_basis(), k_max=k + 1)
+
     # ── mutual_information ────────────────────────────────────────────────────
 
     def test_mutual_information_shape(self, ch_analyser, RSN_matrix):
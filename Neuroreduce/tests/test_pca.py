@@ -9,6 +9,7 @@ import numpy as np
 import pytest
 
 from Neuroreduce import DimensionalityReducer, PCAReducer
+from Neuroreduce.utils.pca_spectrum import PCASpectrumAnalyzer, subject_spectra
 
 
 # ── fixtures ──────────────────────────────────────────────────────────────────
@@ -148,3 +149,66 @@ def test_whitening_zero_mean(X):
     Z = PCAReducer(k=k, whiten=True).fit_transform(X)
     row_means = Z.mean(axis=1)
     assert np.allclose(row_means, 0.0, atol=1e-5)
+
+
+# ── streaming group PCA ───────────────────────────────────────────────────────
+
+@pytest.fixture
+def cohort():
+    """Four subjects sharing a low-rank spatial structure, each (N, T)."""
+    modes = rng.standard_normal((N, k)) * np.linspace(3.0, 1.0, k)
+    return [(modes @ rng.standard_normal((k, T))
+             + 0.1 * rng.standard_normal((N, T)) + 0.1 * s).astype(np.float32)
+            for s in range(4)]
+
+
+def test_fit_stream_covariance_matches_concatenation(cohort):
+    ref = PCAReducer(k=k).fit(np.concatenate(cohort, axis=1))
+    r = PCAReducer(k=k).fit_stream(iter(cohort))
+    assert np.allclose(r.explained_variance_ratio_,
+                       ref.explained_variance_ratio_, atol=1e-5)
+    assert np.allclose(np.abs(r.get_basis().T @ ref.get_basis()),
+                       np.eye(k), atol=1e-3)
+
+
+def test_fit_stream_incremental_spans_same_subspace(cohort):
+    ref = PCAReducer(k=k).fit(np.concatenate(cohort, axis=1))
+    r = PCAReducer(k=k).fit_stream(cohort, method="incremental", batch_size=50)
+    s = np.linalg.svd(r.get_basis().T @ ref.get_basis(), compute_uv=False)
+    assert np.all(s > 0.99)
+
+
+def test_fit_stream_transform_shape(cohort):
+    r = PCAReducer(k=k).fit_stream(np.stack(cohort))
+    assert r.transform(cohort[0]).shape == (k, T)
+
+
+def test_fit_stream_bad_method_raises(cohort):
+    with pytest.raises(ValueError, match="method"):
+        PCAReducer(k=k).fit_stream(cohort, method="svd")
+
+
+# ── eigenvalue-only spectrum ──────────────────────────────────────────────────
+
+def test_subject_spectra_matches_full_pca(cohort):
+    ref = np.stack([PCAReducer(k=N).fit(x).explained_variance_ratio_
+                    for x in cohort])
+    assert np.allclose(subject_spectra(np.stack(cohort)), ref, atol=1e-5)
+    assert np.allclose(subject_spectra(cohort, n_jobs=2), ref, atol=1e-5)
+
+
+def test_subject_spectra_ragged(cohort):
+    ragged = [cohort[0], cohort[1][:, :T // 2]]
+    evr = subject_spectra(ragged)
+    assert evr.shape == (2, N)
+    assert np.allclose(evr.sum(axis=1), 1.0)
+
+
+def test_analyzer_from_timeseries_matches_reducer(X):
+    ref = PCASpectrumAnalyzer(PCAReducer(k=k).fit(X))
+    a = PCASpectrumAnalyzer.from_timeseries(X, k=k)
+    assert a.k == k
+    assert np.allclose(a.explained_variance_ratio_,
+                       ref.explained_variance_ratio_, atol=1e-5)
+    assert np.allclose(a.cumulative_variance_, ref.cumulative_variance_,
+                       atol=1e-5)
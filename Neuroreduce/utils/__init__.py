@@ -1,15 +1,19 @@
 from Neuroreduce.utils.pca_spectrum import PCASpectrumAnalyzer
+from Neuroreduce.utils.graph_filter import ChebyshevGraphFilter
 from Neuroreduce.utils.charm_analysis import (
     CHARMAnalysis,
     GroupAnalysisResult,
     ClassificationResult,
+    IdentifiabilityResult,
     SubjectIndex,
 )
 
 __all__ = [
     "PCASpectrumAnalyzer",
+    "ChebyshevGraphFilter",
     "CHARMAnalysis",
     "GroupAnalysisResult",
     "ClassificationResult",
+    "IdentifiabilityResult",
     "SubjectIndex",
 ]
@@ -25,27 +25,36 @@ Design notes
 
 Dependencies
 ------------
-    numpy, scipy, sklearn, statsmodels
-    statsmodels is used for Benjamini-Hochberg FDR correction.
+    numpy, scipy, sklearn, statsmodels, h5py
+    statsmodels is used for Benjamini-Hochberg FDR correction; h5py for
+    the resumable results file of analyze_group().
     Install with:  pip install statsmodels
 """
 
 from __future__ import annotations
 
+import hashlib
+import os
 import warnings
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Optional, Sequence
 
+import h5py
 import numpy as np
 from numpy import linalg as LA
+from joblib import Parallel, delayed, effective_n_jobs
 from scipy import stats
 from sklearn.svm import SVC
 from sklearn.multiclass import OneVsOneClassifier
 from statsmodels.stats.multitest import multipletests
 
+from Neuroreduce.fc import batch_fc
 from Neuroreduce.methods.charm import CHARMReducer
 # ECM computation delegates to the NeuroNumba ECM observable via these wrappers
 from Neuroreduce.utils.ecm import compute_ecm, compute_ecm_per_subject
+from Neuroreduce.utils.fcd import sliding_window_fc
+from Neuroreduce.utils.lagged_fc import lagged_fc
+from Neuroreduce.utils.permutation import permutation_test_mean_diff
 
 
 # =============================================================================
@@ -161,6 +170,37 @@ class ClassificationResult:
     per_fold_accuracy:  np.ndarray   # (k_fold,)
 
 
+@dataclass
+class IdentifiabilityResult:
+    """
+    Output of CHARMAnalysis.identifiability() (Amico & Goñi, 2018).
+
+    Attributes
+    ----------
+    matrix : np.ndarray, shape (n_subjects, n_subjects)
+        matrix[i, j] = Pearson correlation between the fingerprint of
+        subject i in session A and subject j in session B.
+
+    i_self : float
+        Mean of the diagonal (same subject across sessions).
+
+    i_others : float
+        Mean of the off-diagonal entries (different subjects).
+
+    i_diff : float
+        i_self − i_others. Higher → more identifiable subjects.
+
+    success_rate : float
+        Fraction of subjects whose session-B fingerprint is the best
+        match of their session-A fingerprint (row-wise argmax).
+    """
+    matrix:       np.ndarray   # (n_subjects, n_subjects)
+    i_self:       float
+    i_others:     float
+    i_diff:       float
+    success_rate: float
+
+
 # =============================================================================
 # Main analysis class
 # =============================================================================
@@ -186,6 +226,19 @@ class CHARMAnalysis:
     tau : int
         Time lag (in timepoints) used for the lagged FC computation.
         Default: 3, matching the original paper.
+    fcd_block_size : int or None
+        If set, the FCD behind every metastability / ECM value is streamed
+        in blocks of this many timepoints (see utils/fcd.py), keeping
+        memory constant for very long recordings (e.g. MEG).
+        Default: None (whole FCD at once).
+    fc_window : int or None
+        Length (in timepoints) of the sliding windows used for the FC
+        fingerprints. None → one full-session pattern per subject
+        (FULLWIN=1 in the original code); an integer → one pattern per
+        window (FULLWIN=0). Default: None.
+    fc_step : int or None
+        Shift between consecutive fingerprint windows. None → fc_window
+        (non-overlapping windows). Default: None.
 
     Notes
     -----
@@ -201,6 +254,9 @@ class CHARMAnalysis:
         t_per_subject: int,
         n_subjects:    int,
         tau:           int = 3,
+        fcd_block_size: Optional[int] = None,
+        fc_window:     Optional[int] = None,
+        fc_step:       Optional[int] = None,
     ):
         # -- validate inputs --------------------------------------------------
         if not isinstance(reducer, CHARMReducer):
@@ -215,6 +271,15 @@ class CHARMAnalysis:
         self.t_per_subject  = t_per_subject
         self.n_subjects     = n_subjects
         self.tau            = tau
+        self.fcd_block_size = fcd_block_size
+        self.fc_window      = fc_window
+        self.fc_step        = fc_window if fc_step is None else fc_step
+
+        if fc_window is not None and not 2 <= fc_window <= t_per_subject:
+            raise ValueError(
+                f"fc_window must be in [2, t_per_subject={t_per_subject}], "
+                f"got {fc_window}."
+            )
 
         # Validate that Phi is large enough for the declared layout
         Tm_expected = t_per_subject * n_subjects
@@ -265,7 +330,10 @@ class CHARMAnalysis:
 
     def analyze_group(
         self,
-        group_offset: int = 0,
+        group_offset:       int = 0,
+        n_jobs:             int = 1,
+        subjects_per_chunk: int = 16,
+        results_path:       Optional[str] = None,
     ) -> GroupAnalysisResult:
         """
         Run all per-subject analyses for one condition group.
@@ -274,52 +342,135 @@ class CHARMAnalysis:
         code, but split into clearly named sub-methods and returned as a
         structured result object rather than a bare tuple.
 
+        Subjects are processed in chunks. Within a chunk the shared
+        intermediate (the z-scored embedding) is computed once for all
+        subjects, and the lagged FC and full-session fingerprints are
+        evaluated for the whole chunk at once. Chunks run in a joblib
+        process pool.
+
         Parameters
         ----------
         group_offset : int
             Row in Φ where this condition group starts.
+        n_jobs : int
+            Number of worker processes over chunks. -1 uses all cores.
+            Default: 1.
+        subjects_per_chunk : int
+            Subjects per work unit (and per checkpoint). Default: 16.
+        results_path : str or None
+            HDF5 file the results are written to, one dataset per
+            observable, as each chunk finishes. If the file already holds
+            a run with the same settings and the same embedding (checked
+            via a hash of Φ and the reducer basis), finished subjects are
+            loaded instead of recomputed, so an interrupted run resumes
+            where it stopped. Default: None (in memory only).
 
         Returns
         -------
         GroupAnalysisResult
         """
-        idx = self.subject_index(group_offset)
-
-        # Pre-allocate outputs
-        fc_sub              = np.zeros((self.n_subjects, self._k, self._k))
-        metastability       = np.zeros(self.n_subjects)
-        hierarchical_levels = np.zeros((self.n_subjects, self._k))
-        trophic_coherence   = np.zeros(self.n_subjects)
-        patterns            = []
-
-        for sub in range(self.n_subjects):
-            # Extract this subject's rows from Φ, then z-score across time.
-            # Assumption: z-scoring is per-latent-dimension (axis=0), matching
-            # scipy.stats.zscore default and the original code's usage.
-            Phi_sub = stats.zscore(self._Phi[idx.slice(sub), :])  # (t_per_subject, k)
-
-            # -- metastability ------------------------------------------------
-            metastability[sub] = self._metastability(Phi_sub)
-
-            # -- lagged FC ----------------------------------------------------
-            fc_sub[sub] = self._lagged_fc(Phi_sub)
-
-            # -- trophic coherence + hierarchical levels -----------------------
-            hier, troph = self._trophic_analysis(fc_sub[sub])
-            hierarchical_levels[sub] = hier
-            trophic_coherence[sub]   = troph
-
-            # -- FC fingerprint (for classification) --------------------------
-            patterns.append(self._fc_fingerprint(Phi_sub))
+        idx   = self.subject_index(group_offset)
+        n_sub = self.n_subjects
+        chunk = max(1, int(subjects_per_chunk))
+        spans = [(s0, min(s0 + chunk, n_sub)) for s0 in range(0, n_sub, chunk)]
+
+        # Pre-allocate outputs (one column per observable)
+        n_patterns = (1 if self.fc_window is None
+                      else (self.t_per_subject - self.fc_window) // self.fc_step + 1)
+        columns = {
+            'fc_sub':              np.zeros((n_sub, self._k, self._k)),
+            'metastability':       np.zeros(n_sub),
+            'hierarchical_levels': np.zeros((n_sub, self._k)),
+            'trophic_coherence':   np.zeros(n_sub),
+            'patterns':            np.zeros((n_sub, n_patterns,
+                                             self._k * (self._k - 1) // 2)),
+        }
+        done = np.zeros(n_sub, dtype=bool)
+
+        store = None
+        if results_path is not None:
+            store = self._open_results(results_path, group_offset, columns)
+            done  = store['done'][:]
+            for name, col in columns.items():
+                col[done] = store[name][:][done]
+        todo = [(s0, s1) for s0, s1 in spans if not done[s0:s1].all()]
+
+        try:
+            n_jobs = min(effective_n_jobs(n_jobs), max(len(todo), 1))
+            runs   = Parallel(n_jobs=n_jobs, return_as='generator')(
+                delayed(_analyze_chunk)(
+                    self._Phi[idx.start(s0):idx.end(s1 - 1)].reshape(
+                        s1 - s0, self.t_per_subject, self._k),
+                    self.tau, self.fcd_block_size, self.fc_window, self.fc_step,
+                )
+                for s0, s1 in todo
+            )
+            for (s0, s1), res in zip(todo, runs):
+                for name, col in columns.items():
+                    col[s0:s1] = res[name]
+                if store is not None:
+                    for name in columns:
+                        store[name][s0:s1] = res[name]
+                    store['done'][s0:s1] = True       # only after the data
+                    store.flush()
+        finally:
+            if store is not None:
+                store.close()
 
         return GroupAnalysisResult(
-            fc_sub              = fc_sub,
-            metastability       = metastability,
-            hierarchical_levels = hierarchical_levels,
-            trophic_coherence   = trophic_coherence,
-            patterns            = patterns,
+            fc_sub              = columns['fc_sub'],
+            metastability       = columns['metastability'],
+            hierarchical_levels = columns['hierarchical_levels'],
+            trophic_coherence   = columns['trophic_coherence'],
+            patterns            = list(columns['patterns']),
         )
 
+    def _open_results(
+        self,
+        path:         str,
+        group_offset: int,
+        columns:      dict[str, np.ndarray],
+    ) -> h5py.File:
+        """
+        Open (or create) the HDF5 results file of analyze_group().
+
+        An existing file is reused only if it was written with the same
+        layout, settings and input data (sha1 of Φ and of the reducer
+        basis); otherwise a ValueError is raised rather than silently
+        mixing results.
+        """
+        digest = hashlib.sha1()
+        for arr in (self._Phi, self._reducer.get_basis()):
+            digest.update(np.ascontiguousarray(arr).tobytes())
+        settings = {
+            'group_offset':   group_offset,
+            'n_subjects':     self.n_subjects,
+            't_per_subject':  self.t_per_subject,
+            'k':              self._k,
+            'tau':            self.tau,
+            'fc_window':      -1 if self.fc_window is None else self.fc_window,
+            'fc_step':        -1 if self.fc_window is None else self.fc_step,
+            'data_sha1':      digest.hexdigest(),
+        }
+        exists = os.path.exists(path)
+        f = h5py.File(path, 'a')
+        if exists and 'done' in f:
+            stored = {key: f.attrs.get(key) for key in settings}
+            stored = {key: (v.item() if isinstance(v, np.generic) else v)
+                      for key, v in stored.items()}
+            if stored != settings:
+                f.close()
+                raise ValueError(
+                    f"Results file '{path}' was written with different settings "
+                    f"({stored}); expected {settings}. Use another results_path."
+                )
+            return f
+        for name, col in columns.items():
+            f.create_dataset(name, shape=col.shape, dtype=col.dtype)
+        f.create_dataset('done', shape=(self.n_subjects,), dtype=bool)
+        f.attrs.update(settings)
+        return f
+
     # -------------------------------------------------------------------------
     # Public: condition comparison with FDR correction
     # -------------------------------------------------------------------------
@@ -330,6 +481,8 @@ class CHARMAnalysis:
         fc_task: np.ndarray,
         n_permutations: int = 10_000,
         alpha: float = 0.05,
+        random_state: Optional[int] = 42,
+        n_jobs: int = 1,
     ) -> tuple[np.ndarray, np.ndarray]:
         """
         Compare lagged FC matrices between two conditions using permutation
@@ -337,8 +490,11 @@ class CHARMAnalysis:
 
         Corresponds to ``calc_pfctau()`` in the original code, completed with:
         - explicit fc_task parameter (was an undeclared global)
-        - scipy permutation test replacing the original MATLAB call to
-          ``permutation_htest2_np``
+        - a vectorised permutation engine (permutation_test_mean_diff)
+          replacing the original MATLAB call to ``permutation_htest2_np``.
+          It reproduces ``scipy.stats.permutation_test`` with
+          permutation_type='samples', but draws the permutations once and
+          evaluates all k*k cells together.
         - statsmodels Benjamini-Hochberg replacing ``FDR_benjHoch``
 
         Parameters
@@ -352,6 +508,10 @@ class CHARMAnalysis:
             Number of permutations for the permutation t-test. Default: 10000.
         alpha : float
             FDR threshold for Benjamini-Hochberg correction. Default: 0.05.
+        random_state : int or None
+            Seed for the permutations. Default: 42 (reproducible).
+        n_jobs : int
+            Number of joblib workers over permutation blocks. Default: 1.
 
         Returns
         -------
@@ -364,34 +524,27 @@ class CHARMAnalysis:
 
         Notes
         -----
-        Assumption: two-sample permutation test with t-statistic, matching
-        the original MATLAB ``permutation_htest2_np(..., 'ttest')``.
-        The test is two-tailed.
+        Assumption: permutation test on the mean difference, standing in
+        for the original MATLAB ``permutation_htest2_np(..., 'ttest')``.
+        As with scipy's permutation_type='samples', resamples swap REST and
+        TASK within each subject (paired design). The test is two-tailed.
         """
         k = self._k
-        pfctau = np.ones(k * k)   # initialise to 1 (no evidence against H0)
-
-        idx = 0
-        for i in range(k):
-            for j in range(k):
-                # Extract the (i,j) FC entry across all subjects
-                # Assumption: same indexing as original — fc_sub[:, j, i]
-                # (column-major order inherited from MATLAB)
-                a = fc_rest[:, j, i]   # (n_subjects,)  REST
-                b = fc_task[:, j, i]   # (n_subjects,)  TASK
-
-                # Two-sample permutation t-test
-                # scipy.stats.permutation_test pools [a, b] and permutes labels
-                result = stats.permutation_test(
-                    (a, b),
-                    statistic   = lambda x, y: np.mean(x) - np.mean(y),
-                    permutation_type = 'samples',
-                    n_resamples = n_permutations,
-                    alternative = 'two-sided',
-                    random_state = 42,    # reproducibility
-                )
-                pfctau[idx] = result.pvalue
-                idx += 1
+
+        # All k*k entries share one set of permutations and are tested in a
+        # single batched pass (see utils/permutation.py).
+        # Assumption: same indexing as original — cell i*k + j holds
+        # fc_sub[:, j, i] (column-major order inherited from MATLAB)
+        a = np.swapaxes(fc_rest, 1, 2).reshape(len(fc_rest), k * k)  # REST
+        b = np.swapaxes(fc_task, 1, 2).reshape(len(fc_task), k * k)  # TASK
+        _, pfctau = permutation_test_mean_diff(
+            a, b,
+            n_resamples      = n_permutations,
+            permutation_type = 'samples',
+            alternative      = 'two-sided',
+            random_state     = random_state,
+            n_jobs           = n_jobs,
+        )
 
         # Benjamini-Hochberg FDR correction across all k*k comparisons.
         # multipletests returns: (reject, p_corrected, alpha_sidak, alpha_bf)
@@ -412,6 +565,8 @@ class CHARMAnalysis:
         n_train:       int  = 90,
         k_fold:        int  = 1000,
         random_state:  Optional[int] = None,
+        kernel:        str  = 'rbf',
+        n_jobs:        int  = 1,
     ) -> ClassificationResult:
         """
         k-fold SVM classification distinguishing two conditions (e.g. REST vs
@@ -438,6 +593,11 @@ class CHARMAnalysis:
             Number of random train/validation splits. Default: 1000.
         random_state : int or None
             Seed for the random shuffling. None → non-reproducible.
+        kernel : str
+            'rbf' (default, as in the original) or 'linear'.
+        n_jobs : int
+            Number of joblib workers; folds are split into n_jobs
+            contiguous chunks. -1 uses all cores. Default: 1.
 
         Returns
         -------
@@ -453,63 +613,52 @@ class CHARMAnalysis:
         subjects stacked vertically (multiple patterns per subject if
         n_patterns > 1), but the confusion matrix is accumulated per
         validation SUBJECT, not per pattern. This matches the MATLAB code.
+
+        The kernel matrix between all patterns is computed once and sliced
+        per fold (SVC(kernel='precomputed')); for 'rbf' the squared
+        distances are cached and gamma='scale' is evaluated on each fold's
+        training set, so predictions equal those of SVC(kernel='rbf').
+        All train/validation splits are drawn before the folds run, so the
+        result is identical for any n_jobs.
         """
+        if kernel not in ('rbf', 'linear'):
+            raise ValueError(
+                f"kernel must be 'rbf' or 'linear', got '{kernel}'."
+            )
         n_sub  = self.n_subjects
-        n_val  = n_sub - n_train
         rng    = np.random.default_rng(random_state)
 
-        # Accumulate confusion matrix and per-fold accuracy
-        confusion   = np.zeros((2, 2))
-        fold_acc    = np.zeros(k_fold)
-
-        for fold in range(k_fold):
-            shuffling = rng.permutation(n_sub)   # random subject order
-            train_idx = shuffling[:n_train]
-            val_idx   = shuffling[n_train:]
-
-            # ── build training set ────────────────────────────────────────
-            # Stack patterns from all training subjects for each condition.
-            # Label 0 = REST, label 1 = TASK.
-            # Assumption: np.vstack matches MATLAB's vertcat.
-            TrainData1 = np.vstack([patterns_rest[s] for s in train_idx])
-            TrainData2 = np.vstack([patterns_task[s] for s in train_idx])
-            TrainData  = np.vstack([TrainData1, TrainData2])
-            Labels     = np.concatenate([
-                np.zeros(len(TrainData1)),   # REST = class 0
-                np.ones(len(TrainData2)),    # TASK = class 1
-            ])
-
-            # ── train SVM ────────────────────────────────────────────────
-            # SVC(kernel='rbf') ≡ MATLAB fitcecoc + templateSVM('rbf')
-            # for 2-class problems. C=1.0 is sklearn default.
-            # Assumption: no explicit C or gamma tuning, matching the
-            # original code which uses MATLAB defaults.
-            clf = SVC(kernel='rbf')
-            clf.fit(TrainData, Labels)
-
-            # ── validate (per-subject, not per-pattern) ───────────────────
-            # Assumption: each validation subject contributes ONE vote,
-            # regardless of n_patterns. We take the majority prediction
-            # across all their patterns (mode vote).
-            con = np.zeros((2, 2))
-            for s in val_idx:
-                # REST subject
-                preds_rest = clf.predict(patterns_rest[s])
-                pred_rest  = int(np.round(np.mean(preds_rest)))  # majority vote
-                con[0, pred_rest] += 1
-
-                # TASK subject
-                preds_task = clf.predict(patterns_task[s])
-                pred_task  = int(np.round(np.mean(preds_task)))
-                con[1, pred_task] += 1
-
-            # Normalise each row by the number of validation subjects
-            # (one per class → each row sums to 1 when n_val is equal per class)
-            con[0] /= n_val
-            con[1] /= n_val
+        # ── Gram matrix, computed once for all folds ──────────────────────
+        # Rows: all REST patterns (subject order), then all TASK patterns.
+        # rows[s] / rows[n_sub + s] index subject s's REST / TASK patterns.
+        X_all  = np.vstack([*patterns_rest, *patterns_task]).astype(np.float64)
+        bounds = np.cumsum([0] + [len(p) for p in (*patterns_rest, *patterns_task)])
+        rows   = [np.arange(bounds[i], bounds[i + 1]) for i in range(2 * n_sub)]
+
+        gram = X_all @ X_all.T                           # linear kernel
+        if kernel == 'rbf':
+            # Squared distances; gamma is applied per fold because sklearn's
+            # default gamma='scale' depends on the training set
+            sq   = np.diag(gram).copy()
+            gram = np.maximum(sq[:, None] + sq[None, :] - 2.0 * gram, 0.0)
+
+        # ── Random subject orders, drawn up front ─────────────────────────
+        # Same sequence as drawing one permutation per fold serially, so the
+        # folds (and results) do not depend on n_jobs.
+        splits = [rng.permutation(n_sub) for _ in range(k_fold)]
+
+        n_jobs = min(effective_n_jobs(n_jobs), max(k_fold, 1))
+        chunks = np.array_split(np.arange(k_fold), n_jobs)
+        cons   = Parallel(n_jobs=n_jobs)(
+            delayed(_classification_folds)(
+                gram, X_all, rows, [splits[f] for f in c], n_train, kernel,
+            )
+            for c in chunks
+        )
+        cons = np.concatenate(cons)                      # (k_fold, 2, 2)
 
-            confusion        += con
-            fold_acc[fold]    = np.sum(np.diag(con)) / 2   # balanced accuracy
+        confusion = cons.sum(axis=0)
+        fold_acc  = np.trace(cons, axis1=1, axis2=2) / 2   # balanced accuracy
 
         # Average confusion matrix across all folds
         confusion /= k_fold
@@ -521,6 +670,115 @@ class CHARMAnalysis:
             per_fold_accuracy = fold_acc,
         )
 
+    # -------------------------------------------------------------------------
+    # Public: lagged FC over many lags
+    # -------------------------------------------------------------------------
+
+    def lag_profile(
+        self,
+        lags:               Sequence[int],
+        group_offset:       int = 0,
+        subjects_per_chunk: int = 64,
+        block_size:         Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Lagged FC of every subject in a group, for several lags.
+
+        Generalises _lagged_fc (one lag, self.tau) to a whole lag profile.
+        Subjects are z-scored as in analyze_group and processed in chunks
+        with one batched FFT each (see utils.lagged_fc).
+
+        Parameters
+        ----------
+        lags : sequence of int
+            Lags τ in timepoints, each in [0, t_per_subject − 2].
+        group_offset : int
+            Row in Φ where this condition group starts.
+        subjects_per_chunk : int
+            Subjects per batched FFT; bounds memory. Default: 64.
+        block_size : int or None
+            Rows of the FC per inverse FFT (see lagged_fc). Default: None.
+
+        Returns
+        -------
+        fc : np.ndarray, shape (n_subjects, n_lags, k, k)
+            fc[s, l] equals _lagged_fc of subject s with tau = lags[l].
+        """
+        idx   = self.subject_index(group_offset)
+        fc    = np.empty((self.n_subjects, len(lags), self._k, self._k))
+        chunk = max(1, int(subjects_per_chunk))
+        for s0 in range(0, self.n_subjects, chunk):
+            s1  = min(s0 + chunk, self.n_subjects)
+            Phi = np.stack([stats.zscore(self._Phi[idx.slice(sub), :])
+                            for sub in range(s0, s1)])         # (b, T, k)
+            fc[s0:s1] = lagged_fc(Phi, lags, block_size=block_size)
+        return fc
+
+    # -------------------------------------------------------------------------
+    # Public: fingerprint identifiability across two sessions
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def identifiability(
+        patterns_a: list[np.ndarray],
+        patterns_b: list[np.ndarray],
+    ) -> IdentifiabilityResult:
+        """
+        Subject identifiability of FC fingerprints between two sessions.
+
+        Each subject's fingerprint is the concatenation of all its patterns
+        (one per window), giving a (n_subjects, n_windows·n_edges) feature
+        matrix per session. Rows are z-scored once, so the whole identifiability
+        matrix is a single product  I = Z_a Z_bᵀ / n_features  instead of
+        n_subjects² separate correlations.
+
+        Parameters
+        ----------
+        patterns_a : list of np.ndarray, length n_subjects
+            Fingerprints from session A (GroupAnalysisResult.patterns).
+            All elements must share the same shape (n_patterns, n_edges).
+        patterns_b : list of np.ndarray, length n_subjects
+            Fingerprints of the same subjects, in the same order, from
+            session B.
+
+        Returns
+        -------
+        IdentifiabilityResult
+        """
+        if len(patterns_a) != len(patterns_b) or len(patterns_a) < 2:
+            raise ValueError(
+                f"Need the same number (>= 2) of subjects in both sessions, "
+                f"got {len(patterns_a)} and {len(patterns_b)}."
+            )
+        shapes = {np.shape(p) for p in (*patterns_a, *patterns_b)}
+        if len(shapes) != 1:
+            raise ValueError(
+                f"All fingerprints must have the same shape, got {sorted(shapes)}."
+            )
+
+        def _zscored_rows(patterns: list[np.ndarray]) -> np.ndarray:
+            F  = np.stack([np.ravel(p) for p in patterns]).astype(np.float64)
+            F -= F.mean(axis=1, keepdims=True)
+            sd = F.std(axis=1, keepdims=True)
+            return np.divide(F, sd, out=np.zeros_like(F), where=sd > 0)
+
+        Za = _zscored_rows(patterns_a)
+        Zb = _zscored_rows(patterns_b)
+        I  = Za @ Zb.T / Za.shape[1]                     # (S, S) Pearson
+
+        n_sub    = len(I)
+        i_self   = float(np.trace(I) / n_sub)
+        i_others = float((I.sum() - np.trace(I)) / (n_sub * (n_sub - 1)))
+        success  = float(np.mean(I.argmax(axis=1) == np.arange(n_sub)))
+
+        return IdentifiabilityResult(
+            matrix       = I,
+            i_self       = i_self,
+            i_others     = i_others,
+            i_diff       = i_self - i_others,
+            success_rate = success,
+        )
+
     # =========================================================================
     # Private sub-analyses (one per conceptual quantity)
     # =========================================================================
@@ -543,7 +801,7 @@ class CHARMAnalysis:
             ECM value H.
         """
         # Signal is already z-scored by analyze_group() before this call
-        return compute_ecm(Phi_sub)
+        return compute_ecm(Phi_sub, chunk_size=self.fcd_block_size)
 
     def compute_source_ecm(
         self,
@@ -578,6 +836,7 @@ class CHARMAnalysis:
             n_subjects    = self.n_subjects,
             t_per_subject = self.t_per_subject,
             group_offset  = group_offset,
+            chunk_size    = self.fcd_block_size,
         )
 
     def _lagged_fc(self, Phi_sub: np.ndarray) -> np.ndarray:
@@ -592,8 +851,10 @@ class CHARMAnalysis:
         exploited by the trophic coherence analysis to define a directed
         functional hierarchy.
 
-        Assumption: uses np.corrcoef on the full valid window [0:-τ] vs [τ:],
-        matching tricks.corr() in the original code (Pearson, ddof=1).
+        Assumption: Pearson correlation on the full valid window [0:-τ] vs
+        [τ:], matching tricks.corr() in the original code. Evaluated by
+        utils.lagged_fc (equal to np.corrcoef on the two slices); use
+        lag_profile() for many lags at once.
 
         Parameters
         ----------
@@ -605,21 +866,13 @@ class CHARMAnalysis:
         fc : np.ndarray, shape (k, k)
             Asymmetric lagged FC matrix.
         """
-        # Assumption: tau < t_per_subject (checked implicitly by array slicing)
-        A = Phi_sub[:-self.tau, :]   # timepoints 0 .. T-τ-1  (k columns)
-        B = Phi_sub[self.tau:,  :]   # timepoints τ .. T-1    (k columns)
-
-        # np.corrcoef stacks rows → shape (2k, 2k); we want the (k×k) cross-block
-        # corrcoef([A.T, B.T])[0:k, k:2k] = corr(A_cols, B_cols)
-        combined = np.corrcoef(A.T, B.T)   # (2k, 2k)
-        fc = combined[:self._k, self._k:]  # (k, k)  upper-right block
-        return fc
+        return lagged_fc(Phi_sub, [self.tau])[0]   # (k, k)
 
-    def _trophic_analysis(
-        self, fc: np.ndarray
-    ) -> tuple[np.ndarray, float]:
+    @staticmethod
+    def trophic_analysis(fc: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
         """
-        Compute trophic levels and trophic coherence of the directed FC graph.
+        Trophic levels and trophic coherence of directed FC graphs, for a
+        whole cohort in one call.
 
         Theory (Johnson et al., 2014; used in Deco et al. 2025):
         Given a directed weighted graph with adjacency A (non-negative,
@@ -639,16 +892,20 @@ class CHARMAnalysis:
         Q = 1: perfectly coherent (all edges span exactly one trophic level)
         Q = 0: incoherent (random mixing)
 
+        All subjects' Laplacians are stacked into one (S, k, k) array and
+        solved together with a single batched LAPACK call.
+
         Parameters
         ----------
-        fc : np.ndarray, shape (k, k)
-            Lagged FC matrix for one subject (possibly asymmetric).
+        fc : np.ndarray, shape (S, k, k) or (k, k)
+            Lagged FC matrices (possibly asymmetric), e.g.
+            GroupAnalysisResult.fc_sub.
 
         Returns
         -------
-        gamma : np.ndarray, shape (k,)
-            Trophic levels, shifted so min(gamma) = 0.
-        trophic_coherence : float
+        gamma : np.ndarray, shape (S, k) or (k,)
+            Trophic levels, shifted so min(gamma) = 0 per subject.
+        trophic_coherence : np.ndarray, shape (S,) or float
             Q = 1 - F0.
 
         Notes
@@ -657,82 +914,94 @@ class CHARMAnalysis:
         the graph, and self-loops are removed. This matches the original code:
             A[A < 0] = 0
             A = A - diag(diag(A))
-        If the Laplacian Λ is singular (degenerate graph), gamma is set to NaN
-        and trophic coherence to NaN. This is rare but can occur for small k.
+        If a subject's Laplacian Λ is singular (degenerate graph), its gamma
+        and trophic coherence are set to NaN. This is rare but can occur for
+        small k.
         """
-        k = self._k
+        fc     = np.asarray(fc, dtype=np.float64)
+        single = fc.ndim == 2
+        if single:
+            fc = fc[np.newaxis]
+        n_sub, k, _ = fc.shape
+        diag = np.arange(k)
 
         # Threshold: keep only positive FC edges, remove self-loops
         # Assumption: negative lagged FC is not interpreted as inhibition here;
         # it is simply discarded for the graph-theoretic analysis.
-        A = np.copy(fc)
-        A[A < 0] = 0.0
-        A -= np.diag(np.diag(A))   # zero out diagonal
+        A = np.where(fc > 0, fc, 0.0)
+        A[:, diag, diag] = 0.0
 
         # Degree vectors
-        d     = np.sum(A, axis=0)   # in-degree  (column sums)
-        delta = np.sum(A, axis=1)   # out-degree (row sums)
+        d     = A.sum(axis=1)       # in-degree  (column sums)   (S, k)
+        delta = A.sum(axis=2)       # out-degree (row sums)      (S, k)
         u     = d + delta           # total degree
         v     = d - delta           # degree imbalance
 
-        # Graph Laplacian for trophic level system
-        # Λ = diag(u) - A - A.T
-        Lambda_ = np.diag(u) - A - A.T
+        # Graph Laplacian for trophic level system: Λ = diag(u) - A - Aᵀ
+        Lambda_ = -(A + A.swapaxes(1, 2))
+        Lambda_[:, diag, diag] += u
 
         # Fix gauge: pin first node's level by zeroing its equation.
         # This makes Λ invertible when the graph is connected.
         # Assumption: node 0 is used as the reference, matching original code.
-        Lambda_[0, 0] = 0.0
-
-        # Solve Λ γ = v for trophic levels
-        if self._is_invertible(Lambda_):
-            gamma = LA.solve(Lambda_, v)
-        else:
+        Lambda_[:, 0, 0] = 0.0
+
+        # Solve Λ γ = v for every invertible subject in one batched call
+        ok    = CHARMAnalysis._is_invertible(Lambda_)
+        gamma = np.full((n_sub, k), np.nan)
+        if ok.any():
+            gamma[ok] = LA.solve(Lambda_[ok], v[ok][..., np.newaxis])[..., 0]
+        if not ok.all():
             warnings.warn(
-                "Trophic level Laplacian is singular — graph may be disconnected "
-                "or have isolated nodes. Setting gamma and trophic coherence to NaN.",
+                f"Trophic level Laplacian is singular for {np.sum(~ok)} of "
+                f"{n_sub} subject(s) — graph may be disconnected or have "
+                "isolated nodes. Setting their gamma and trophic coherence to NaN.",
                 RuntimeWarning,
-                stacklevel=3,
+                stacklevel=2,
             )
-            return np.full(k, np.nan), np.nan
 
         # Shift so minimum level = 0
-        gamma = gamma - np.min(gamma)
+        gamma -= gamma.min(axis=1, keepdims=True)
 
         # Trophic coherence: F0 = sum_ij A_ij (γ_j - γ_i - 1)² / sum_ij A_ij
-        # Build (γ_j - γ_i) matrix using broadcasting
-        # meshgrid_gamma[i,j] = gamma[j]  (matches MATLAB meshgrid 'xy' indexing)
-        gamma_j = gamma[np.newaxis, :]   # (1, k) — broadcast as columns
-        gamma_i = gamma[:, np.newaxis]   # (k, 1) — broadcast as rows
-        H  = (gamma_j - gamma_i - 1) ** 2   # (k, k)
-
-        sum_A = np.sum(A)
-        if sum_A == 0:
+        # H[s, i, j] uses γ_j along columns (MATLAB meshgrid 'xy' indexing)
+        H     = (gamma[:, np.newaxis, :] - gamma[:, :, np.newaxis] - 1) ** 2
+        sum_A = A.sum(axis=(1, 2))
+        empty = ok & (sum_A == 0)
+        if empty.any():
             # Fully disconnected graph — coherence undefined
             warnings.warn(
-                "All FC edges are zero after thresholding. "
-                "Trophic coherence set to NaN.",
+                f"All FC edges are zero after thresholding for {np.sum(empty)} "
+                "subject(s). Trophic coherence set to NaN.",
                 RuntimeWarning,
-                stacklevel=3,
+                stacklevel=2,
             )
-            return gamma, np.nan
-
-        F0                = np.sum(A * H) / sum_A
-        trophic_coherence = float(1.0 - F0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            F0 = (A * H).sum(axis=(1, 2)) / sum_A
+        trophic_coherence = np.where(ok & (sum_A > 0), 1.0 - F0, np.nan)
 
+        if single:
+            return gamma[0], float(trophic_coherence[0])
         return gamma, trophic_coherence
 
+    @staticmethod
+    def _trophic_analysis(fc: np.ndarray) -> tuple[np.ndarray, float]:
+        """
+        Trophic levels (k,) and trophic coherence of one subject's directed
+        FC graph, fc of shape (k, k). See trophic_analysis().
+        """
+        return CHARMAnalysis.trophic_analysis(fc)
+
     def _fc_fingerprint(self, Phi_sub: np.ndarray) -> np.ndarray:
         """
         Compute the FC fingerprint of one subject for use in classification.
 
         The fingerprint is the lower triangle of the Pearson FC matrix
-        computed over the full session (no lag, no windowing in FULLWIN mode).
-        This matches the MATLAB code's ``corrcoef(Phi(..., :))`` with FULLWIN=1.
-
-        Assumption: FULLWIN=1 (one pattern per subject, full session window).
-        Windowed mode (FULLWIN=0) is not implemented here; the result shape
-        would differ and is left for a future extension.
+        (no lag). With fc_window=None it is computed over the full session,
+        matching the MATLAB code's ``corrcoef(Phi(..., :))`` with FULLWIN=1.
+        Otherwise (FULLWIN=0) there is one pattern per sliding window of
+        fc_window timepoints, shifted by fc_step; all windows are computed
+        at once from cumulative sums (see utils.fcd.sliding_window_fc).
 
         Parameters
         ----------
@@ -741,25 +1010,18 @@ class CHARMAnalysis:
 
         Returns
         -------
-        patterns : np.ndarray, shape (1, n_edges)
-            Lower-triangle FC values as a feature vector.
+        patterns : np.ndarray, shape (n_patterns, n_edges)
+            Lower-triangle FC values, one row per pattern.
+            n_patterns = 1 with fc_window=None, else the number of windows;
             n_edges = k*(k-1)//2.
         """
-        # Full-session FC matrix: (k, k) Pearson correlation across timepoints
-        FC = np.corrcoef(Phi_sub.T)   # (k, k)
-
-        # Extract lower triangle (excluding diagonal)
-        i_lower, j_lower = np.tril_indices(self._k, k=-1)
-        fingerprint = FC[i_lower, j_lower]   # (n_edges,)
-
-        # Return as (1, n_edges) to match the MATLAB patterns(np, :) layout,
-        # where np indexes the pattern within a subject (=1 in FULLWIN mode)
-        return fingerprint[np.newaxis, :]    # (1, n_edges)
+        return _fc_fingerprints(Phi_sub[np.newaxis], self.fc_window, self.fc_step)[0]
 
     @staticmethod
-    def _is_invertible(A: np.ndarray, tol: float = 1e-10) -> bool:
+    def _is_invertible(A: np.ndarray, tol: float = 1e-10) -> bool | np.ndarray:
         """
-        Check if a square matrix is invertible via its condition number.
+        Check if a square matrix (or each of a stack) is invertible via its
+        condition number.
 
         Uses the ratio of largest to smallest singular value as a proxy
         for numerical invertibility. A matrix is considered singular if
@@ -767,13 +1029,139 @@ class CHARMAnalysis:
 
         Parameters
         ----------
-        A : np.ndarray, shape (n, n)
+        A : np.ndarray, shape (n, n) or (S, n, n)
         tol : float
             Numerical tolerance. Default: 1e-10.
 
         Returns
         -------
-        bool
+        bool, or np.ndarray of bool with shape (S,) for a stack
         """
         # np.linalg.cond uses SVD; cheaper than computing det for large matrices
         return np.linalg.cond(A) < (1.0 / tol)
+
+
+# =============================================================================
+# Group analysis workers (module level so joblib can pickle them)
+# =============================================================================
+
+def _fc_fingerprints(
+    Phi:       np.ndarray,
+    fc_window: Optional[int],
+    fc_step:   Optional[int],
+) -> np.ndarray:
+    """
+    FC fingerprints of a batch of z-scored embeddings.
+
+    Phi : (b, T, k). Returns (b, n_patterns, k*(k-1)//2), lower triangle.
+    With fc_window=None the full-session FC of all subjects is one batched
+    call (Neuroreduce.fc.batch_fc, equal to np.corrcoef).
+    """
+    k = Phi.shape[2]
+    i_lower, j_lower = np.tril_indices(k, k=-1)
+    if fc_window is None:
+        FC = batch_fc(np.swapaxes(Phi, 1, 2))                      # (b, k, k)
+        return FC[:, np.newaxis, i_lower, j_lower]                 # (b, 1, n_edges)
+    return np.stack([
+        sliding_window_fc(P, fc_window, fc_step, edges=(i_lower, j_lower))
+        for P in Phi
+    ])                                                             # (b, n_windows, n_edges)
+
+
+def _analyze_chunk(
+    Phi:            np.ndarray,
+    tau:            int,
+    fcd_block_size: Optional[int],
+    fc_window:      Optional[int],
+    fc_step:        Optional[int],
+) -> dict[str, np.ndarray]:
+    """All per-subject observables for a chunk of raw embeddings (b, T, k)."""
+    # Shared intermediate: z-score each subject across time, once.
+    # Assumption: per-latent-dimension z-scoring (axis=1 here = time),
+    # matching scipy.stats.zscore default and the original code's usage.
+    Z  = stats.zscore(Phi, axis=1)
+    fc = lagged_fc(Z, [tau])[:, 0]                                 # (b, k, k)
+
+    gamma, coherence = CHARMAnalysis.trophic_analysis(fc)
+    return {
+        'fc_sub':              fc,
+        'metastability':       np.array([compute_ecm(z, chunk_size=fcd_block_size)
+                                         for z in Z]),
+        'hierarchical_levels': gamma,
+        'trophic_coherence':   coherence,
+        'patterns':            _fc_fingerprints(Z, fc_window, fc_step),
+    }
+
+
+# =============================================================================
+# Classification fold worker (module level so joblib can pickle it)
+# =============================================================================
+
+def _classification_folds(
+    gram:     np.ndarray,
+    X_all:    np.ndarray,
+    rows:     list[np.ndarray],
+    splits:   list[np.ndarray],
+    n_train:  int,
+    kernel:   str,
+) -> np.ndarray:
+    """
+    Run a chunk of CHARMAnalysis.classification() folds.
+
+    Parameters
+    ----------
+    gram : np.ndarray, shape (P, P)
+        Linear kernel, or squared distances for kernel='rbf', between all
+        P patterns (REST patterns first, then TASK).
+    X_all : np.ndarray, shape (P, n_edges)
+        The stacked patterns (only used for gamma='scale').
+    rows : list of np.ndarray
+        rows[s] / rows[n_sub + s]: pattern rows of subject s, REST / TASK.
+    splits : list of np.ndarray
+        One random subject order per fold.
+    n_train, kernel
+        As in CHARMAnalysis.classification().
+
+    Returns
+    -------
+    cons : np.ndarray, shape (len(splits), 2, 2)
+        Per-fold confusion matrices, rows normalised by n_val.
+    """
+    n_sub = len(rows) // 2
+    n_val = n_sub - n_train
+    cons  = np.zeros((len(splits), 2, 2))
+
+    for f, shuffling in enumerate(splits):
+        train_idx = shuffling[:n_train]
+        val_idx   = shuffling[n_train:]
+
+        # ── training set: REST subjects then TASK subjects (as in vstack) ─
+        tr_rest = np.concatenate([rows[s] for s in train_idx])
+        tr_task = np.concatenate([rows[n_sub + s] for s in train_idx])
+        train   = np.concatenate([tr_rest, tr_task])
+        Labels  = np.concatenate([
+            np.zeros(len(tr_rest)),                  # REST = class 0
+            np.ones(len(tr_task)),                   # TASK = class 1
+        ])
+
+        K_train = gram[np.ix_(train, train)]
+        if kernel == 'rbf':
+            # sklearn's gamma='scale' on this fold's training data
+            X_var = X_all[train].var()
+            gamma = 1.0 / (X_all.shape[1] * X_var) if X_var != 0 else 1.0
+            K_train = np.exp(-gamma * K_train)
+
+        clf = SVC(kernel='precomputed')
+        clf.fit(K_train, Labels)
+
+        # ── validate: one majority vote per subject and condition ─────────
+        for label, offset in ((0, 0), (1, n_sub)):
+            for s in val_idx:
+                K_val = gram[np.ix_(rows[offset + s], train)]
+                if kernel == 'rbf':
+                    K_val = np.exp(-gamma * K_val)
+                pred = int(np.round(np.mean(clf.predict(K_val))))
+                cons[f, label, pred] += 1
+
+    cons /= n_val
+    return cons
@@ -3,16 +3,35 @@ Neuroreduce/utils/ecm.py
 --------------------------
 Edge-centric metastability utilities for Neuroreduce.
 
-The core ECM computation now lives in NeuroNumba as a proper Observable:
+ECM is the Gaussian entropy of the edge-centric FCD distribution:
 
-    neuronumba/observables/ecm.py  →  ECM._compute_from_fmri()
+    e_t[ij]   = x_ti x_tj                  (i > j, the N(N−1)/2 edges at t)
+    FCD[t, s] = <e_t, e_s> / (‖e_t‖ ‖e_s‖)
+    ECM       = 0.5 log(2π var(FCD[t > s])) + 0.5
 
-This module provides three thin wrappers that bridge the NeuroNumba
-observable into the Neuroreduce per-subject pipeline:
+The edge vectors are never built. Their inner products have a closed
+form in the node vectors,
+
+    <e_t, e_s> = ((x_tᵀ x_s)² − Σ_i x_ti² x_si²) / 2
+
+so FCD costs two (T × T) GEMMs — O(T²·N) time and O(T²) memory instead
+of an (N(N−1)/2 × T) edge matrix (80k × T floats per subject at N=400).
+With chunk_size the T×T matrix is streamed block by block and only
+running moments are kept (StreamingFCD, utils/fcd.py), i.e. memory is
+O(chunk_size²) regardless of T.
+The result is identical to NeuroNumba's ECM observable
+(neuronumba/observables/ecm.py).
+
+This module provides:
+
+    edge_fcd(signal, ...)
+        Full (T, T) edge-centric FCD matrix.
+
+    edge_fcd_variance(signal, chunk_size=None)
+        var(FCD) over t > s, optionally streamed over T.
 
     compute_ecm(signal)
         One-shot scalar ECM for a single (T, D) signal.
-        Delegates directly to the ECM observable.
 
     compute_ecm_per_subject(signal, ...)
         Slice a concatenated (D, Tm) signal into per-subject windows
@@ -23,75 +42,85 @@ observable into the Neuroreduce per-subject pipeline:
         invert, compute ECM on both original and reconstructed BOLD,
         and return both arrays for downstream correlation / plotting.
 
+    compute_ecm_batch(X, basis=None, ...)
+        Batched ECM for an (S, N, T) stack and, optionally, its linear
+        reconstruction from a shared basis — one batched GEMM per chunk
+        of subjects, chunks spread over joblib workers.
+
 Convention note
 ---------------
-NeuroNumba observables expect (T, N) — rows = timepoints, columns = ROIs.
-Neuroreduce uses (N, T) — rows = ROIs/dims, columns = timepoints.
-All transpositions are handled inside these functions; callers always
-pass arrays in the Neuroreduce (D, T) or (N, T) convention.
+Like NeuroNumba observables, the ECM functions take (T, N) — rows =
+timepoints, columns = ROIs. Neuroreduce uses (N, T) — rows = ROIs/dims,
+columns = timepoints. All transpositions are handled inside the
+per-subject wrappers; callers pass arrays in the Neuroreduce (D, T) or
+(N, T) convention.
 """
 
 from __future__ import annotations
 
 import warnings
+from typing import Optional
+
 import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
 from scipy import stats
 
-# NeuroNumba ECM observable — the single source of truth for the core maths.
-# We try several known import paths because the module location varies across
-# neuronumba versions. If neuronumba is not installed we fall back to a pure-
-# numpy implementation that is mathematically identical.
-_ECMObservable = None
-for _ecm_path in [
-    'neuronumba.observables.ecm',
-    'neuronumba.observables.edge_centric_metastability',
-]:
-    try:
-        import importlib as _il
-        _mod = _il.import_module(_ecm_path)
-        _ECMObservable = getattr(_mod, 'ECM', None)
-        if _ECMObservable is not None:
-            break
-    except (ModuleNotFoundError, AttributeError):
-        continue
-
-if _ECMObservable is None:
-    # Fallback: pure-numpy ECM — mathematically identical to the observable.
-    # Used when neuronumba is absent (testing, CI, restricted environments).
-    import numpy as _np
-    from numpy import linalg as _LA
-
-    class _ECMObservable:
-        """Minimal ECM fallback — no neuronumba dependency."""
-        ignore_nans = False
-
-        def from_fmri(self, bold_signal):
-            T, N      = bold_signal.shape
-            i_n, j_n  = _np.tril_indices(N, k=-1)
-            n_edges   = len(i_n)
-            EdgesL    = _np.zeros((n_edges, T))
-            for t in range(T):
-                outer_t      = _np.outer(bold_signal[t], bold_signal[t])
-                EdgesL[:, t] = outer_t[i_n, j_n]
-            norms = _LA.norm(EdgesL, axis=0, keepdims=True)
-            norms = _np.where(norms == 0, 1.0, norms)
-            FCDQ  = (EdgesL.T @ EdgesL) / (norms.T @ norms)
-            i_lt, j_lt = _np.tril_indices(T, k=-1)
-            var_fcd    = _np.var(FCDQ[i_lt, j_lt])
-            ecm        = float(0.5 * _np.log(2 * _np.pi * var_fcd) + 0.5)
-            return {'ECM': ecm}
+from Neuroreduce.utils.fcd import StreamingFCD, edge_fcd
+
+
+# =============================================================================
+# Closed-form edge-centric FCD (engine in utils/fcd.py)
+# =============================================================================
+
+def edge_fcd_variance(
+    signal:     np.ndarray,
+    chunk_size: Optional[int] = None,
+) -> float:
+    """
+    Variance of the edge-centric FCD over its strict lower triangle.
+
+    Parameters
+    ----------
+    signal : np.ndarray, shape (T, D)
+        Rows = timepoints. Usually z-scored across time.
+    chunk_size : int or None
+        Stream the FCD in (chunk_size × chunk_size) blocks with
+        StreamingFCD; moments are merged exactly, so memory is
+        O(chunk_size²) whatever T. Default: None (whole T×T at once).
+
+    Returns
+    -------
+    float
+        np.var(FCD[np.tril_indices(T, k=-1)]).
+    """
+    fcd = StreamingFCD(window=1, block_size=chunk_size, bins=None)
+    return fcd.fit(signal).variance_
+
+
+class _ECMObservable:
+    """
+    Drop-in for NeuroNumba's ECM observable (``from_fmri`` interface),
+    computed with the closed form above.
+    """
+    ignore_nans = False
+
+    def __init__(self, chunk_size: Optional[int] = None):
+        self.chunk_size = chunk_size
+
+    def from_fmri(self, bold_signal):
+        var_fcd = edge_fcd_variance(bold_signal, self.chunk_size)
+        return {'ECM': float(0.5 * np.log(2 * np.pi * var_fcd) + 0.5)}
 
 
 # =============================================================================
 # Public API
 # =============================================================================
 
-def compute_ecm(signal: np.ndarray) -> float:
+def compute_ecm(signal: np.ndarray, chunk_size: Optional[int] = None) -> float:
     """
     Compute edge-centric metastability (ECM) for a single signal matrix.
 
-    Thin wrapper around the NeuroNumba ECM observable. Handles the
-    Neuroreduce → NeuroNumba convention transpose internally.
+    Uses the closed-form edge-centric FCD (no edge matrix is built).
 
     Parameters
     ----------
@@ -99,6 +128,9 @@ def compute_ecm(signal: np.ndarray) -> float:
         Signal in NeuroNumba convention — rows = timepoints, cols = dims.
         D can be N parcels (source space) or k latents (manifold space).
         Should be z-scored across time (axis=0) before calling.
+    chunk_size : int or None
+        Stream the FCD in blocks of this many rows (see
+        edge_fcd_variance). Default: None.
 
     Returns
     -------
@@ -107,7 +139,7 @@ def compute_ecm(signal: np.ndarray) -> float:
         Higher = more metastable / dynamic.
     """
     # signal is already (T, D) — matches NeuroNumba convention directly
-    obs    = _ECMObservable()
+    obs    = _ECMObservable(chunk_size)
     result = obs.from_fmri(signal)
     return float(result['ECM'])
 
@@ -117,6 +149,8 @@ def compute_ecm_per_subject(
     n_subjects:    int,
     t_per_subject: int,
     group_offset:  int = 0,
+    chunk_size:    Optional[int] = None,
+    n_jobs:        int = 1,
 ) -> np.ndarray:
     """
     Compute ECM for each subject in a concatenated signal matrix.
@@ -135,6 +169,10 @@ def compute_ecm_per_subject(
     group_offset : int
         Starting timepoint index for this group in the concatenated array.
         Default: 0.
+    chunk_size : int or None
+        FCD row-block size (see edge_fcd_variance). Default: None.
+    n_jobs : int
+        Number of joblib workers (see compute_ecm_batch). Default: 1.
 
     Returns
     -------
@@ -149,20 +187,13 @@ def compute_ecm_per_subject(
     if signal.shape[0] <= signal.shape[1]:
         signal = signal.T   # now (Tm, D)
 
-    # Instantiate once and reuse — avoids repeated object construction
-    obs        = _ECMObservable()
-    ecm_values = np.zeros(n_subjects)
-
-    for sub in range(n_subjects):
-        start   = group_offset + sub * t_per_subject
-        end     = group_offset + (sub + 1) * t_per_subject
-        sig_sub = signal[start:end, :]                    # (t_per_subject, D)
-        sig_sub = stats.zscore(sig_sub, axis=0, ddof=1)  # z-score across time
-
-        result          = obs.from_fmri(sig_sub)
-        ecm_values[sub] = result['ECM']
-
-    return ecm_values
+    # Per-subject windows as an (S, D, t_per_subject) stack, then one
+    # batched call (z-scoring across time happens inside)
+    start = group_offset
+    end   = group_offset + n_subjects * t_per_subject
+    stack = signal[start:end, :].reshape(n_subjects, t_per_subject, -1)
+    return compute_ecm_batch(stack.transpose(0, 2, 1), n_jobs=n_jobs,
+                             chunk_size=chunk_size)
 
 
 def compute_reconstructed_ecm_per_subject(
@@ -171,6 +202,7 @@ def compute_reconstructed_ecm_per_subject(
     n_subjects:    int,
     t_per_subject: int,
     group_offset:  int = 0,
+    chunk_size:    Optional[int] = None,
 ) -> tuple[np.ndarray, np.ndarray]:
     """
     Compute ECM in SOURCE and RECONSTRUCTED space per subject.
@@ -202,6 +234,8 @@ def compute_reconstructed_ecm_per_subject(
         Timepoints per subject (= Tmsub).
     group_offset : int
         Starting column in X for this group. Default: 0.
+    chunk_size : int or None
+        FCD row-block size (see edge_fcd_variance). Default: None.
 
     Returns
     -------
@@ -219,7 +253,7 @@ def compute_reconstructed_ecm_per_subject(
     ECM comparison meaningless.
     """
     # Instantiate observable once and reuse across subjects
-    obs               = _ECMObservable()
+    obs               = _ECMObservable(chunk_size)
     ecm_source        = np.zeros(n_subjects)
     ecm_reconstructed = np.zeros(n_subjects)
 
@@ -262,3 +296,100 @@ def compute_reconstructed_ecm_per_subject(
           f"min={ecm_reconstructed.min():.3f}  max={ecm_reconstructed.max():.3f}")
 
     return ecm_source, ecm_reconstructed
+
+
+def compute_ecm_batch(
+    X:                  np.ndarray,
+    basis:              Optional[np.ndarray] = None,
+    encoder:            Optional[np.ndarray] = None,
+    zscore:             bool = True,
+    n_jobs:             int  = 1,
+    subjects_per_chunk: Optional[int] = None,
+    chunk_size:         Optional[int] = None,
+):
+    """
+    ECM for a stack of subjects, optionally with their reconstructions.
+
+    Batched counterpart of compute_ecm_per_subject() and, for linear
+    reducers, of compute_reconstructed_ecm_per_subject(). Each subject
+    chunk is z-scored, reconstructed with a single batched GEMM
+
+        X_hat[s] = basis @ encoder @ X[s]        (P = basis @ encoder, N×N)
+
+    and its ECM computed in closed form. Chunks run on joblib workers;
+    only one chunk of reconstructions is alive per worker.
+
+    Parameters
+    ----------
+    X : np.ndarray, shape (S, N, T)
+        Per-subject signals in Neuroreduce convention.
+    basis : np.ndarray, shape (N, k), optional
+        Shared decoder, e.g. reducer.get_basis(). If given, the ECM of the
+        reconstructed signals is returned as well.
+    encoder : np.ndarray, shape (k, N), optional
+        Projection onto the reduced space. Default: basis.T (orthogonal
+        projection for an orthonormal basis, as in PCA or harmonics with
+        sign_invariant=False).
+    zscore : bool
+        Z-score each subject across time first (ddof=1). Reconstructions
+        are not re-z-scored (see compute_reconstructed_ecm_per_subject).
+        Default: True.
+    n_jobs : int
+        Number of joblib workers. -1 uses all cores. Default: 1.
+    subjects_per_chunk : int or None
+        Subjects per batched GEMM. Default: S / n_jobs.
+    chunk_size : int or None
+        FCD row-block size (see edge_fcd_variance). Default: None.
+
+    Returns
+    -------
+    ecm_source : np.ndarray, shape (S,)
+    ecm_reconstructed : np.ndarray, shape (S,)
+        Only if basis is given.
+    """
+    X = np.asarray(X)
+    if X.ndim != 3:
+        raise ValueError(f"X must have shape (S, N, T), got {X.shape}")
+    S, N, _ = X.shape
+
+    P = None
+    if basis is not None:
+        basis = np.asarray(basis, dtype=np.float64)
+        if basis.shape[0] != N:
+            raise ValueError(
+                f"basis must have shape ({N}, k), got {basis.shape}"
+            )
+        enc = basis.T if encoder is None else np.asarray(encoder, dtype=np.float64)
+        P   = basis @ enc                                   # (N, N)
+
+    n_jobs = min(effective_n_jobs(n_jobs), max(S, 1))
+    step   = subjects_per_chunk or -(-S // n_jobs)
+    starts = range(0, S, max(1, step))
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(_ecm_chunk)(X[s0:s0 + step], P, zscore, chunk_size)
+        for s0 in starts
+    )
+    ecm = np.concatenate(results, axis=-1) if results else np.zeros((2, 0))
+
+    if P is None:
+        return ecm[0]
+    return ecm[0], ecm[1]
+
+
+def _ecm_chunk(
+    Xc:         np.ndarray,
+    P:          Optional[np.ndarray],
+    zscore:     bool,
+    chunk_size: Optional[int],
+) -> np.ndarray:
+    """Source (and reconstructed) ECM of a chunk of subjects, shape (2, s)."""
+    Xc = np.asarray(Xc, dtype=np.float64)
+    if zscore:
+        Xc = stats.zscore(Xc, axis=2, ddof=1)
+    obs = _ECMObservable(chunk_size)
+    out = np.full((2, len(Xc)), np.nan)
+    out[0] = [obs.from_fmri(x.T)['ECM'] for x in Xc]
+    if P is not None:
+        X_hat  = P @ Xc                                     # batched GEMM
+        out[1] = [obs.from_fmri(x.T)['ECM'] for x in X_hat]
+    return out
@@ -0,0 +1,424 @@
+"""
+Neuroreduce/utils/fcd.py
+--------------------------
+Streaming, blockwise functional connectivity dynamics (FCD).
+
+FCD is the (n_windows × n_windows) matrix of similarities between the
+connectivity patterns of every pair of time windows. For fMRI it fits in
+memory; for MEG (10⁵+ samples per subject, e.g. MEG_Vidaurre2018 at
+250 Hz) it does not. StreamingFCD never holds it:
+
+    for each row block of windows A:
+        F_A = FC vectors of A                     (computed on the fly)
+        for each column block B >= A:
+            F_B = FC vectors of B                 (recomputed on the fly)
+            S   = similarity(F_A, F_B)            (block_size × block_size)
+            accumulate strict-upper-triangle entries of S
+
+Memory is O(block_size · n_edges), independent of the number of windows.
+Accumulated statistics (all exact, mergeable across blocks):
+
+    mean_, variance_   Chan et al. pairwise moment update
+    histogram          fixed bins over [-1, 1]; doubles as a quantile /
+                       CDF sketch (quantile(), cdf(), ks_distance()) whose
+                       error is bounded by one bin width
+
+The full matrix can optionally be spilled to a .npy memmap on disk
+(spill_path), e.g. only when it is going to be plotted.
+
+sliding_window_fc() is the shared windowed-FC engine: it returns the FC
+vectors of every window (e.g. for FC fingerprinting, or the FCD windows
+here), updated from running sums rather than recomputed per window.
+
+Connectivity patterns
+---------------------
+window == 1  edge-centric FCD (as in ECM): the pattern at t is the lower
+             triangle of x_t x_tᵀ and similarity is cosine. Edge inner
+             products are evaluated in closed form from node vectors,
+
+                 <e_t, e_s> = ((x_tᵀ x_s)² − Σ_i x_ti² x_si²) / 2,
+
+             so edge vectors are never built (O(block² · N) per block).
+window > 1   sliding-window FCD: Pearson FC of each window (upper
+             triangle), compared with Pearson correlation (default) or
+             cosine similarity.
+
+Convention: signals are (T, N) — rows = timepoints, as for the ECM
+helpers in utils/ecm.py.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+
+# =============================================================================
+# Closed-form edge-centric FCD
+# =============================================================================
+
+def _edge_gram_block(
+    X:   np.ndarray,
+    X2:  np.ndarray,
+    t0:  int,
+    t1:  int,
+) -> np.ndarray:
+    """<e_t, e_s> for t in [t0, t1) and all s, shape (t1 − t0, T)."""
+    return _edge_gram(X[t0:t1], X2[t0:t1], X, X2)
+
+
+def _edge_gram(
+    Xa:  np.ndarray,
+    X2a: np.ndarray,
+    Xb:  np.ndarray,
+    X2b: np.ndarray,
+) -> np.ndarray:
+    """<e_t, e_s> for rows t of Xa and rows s of Xb."""
+    G = Xa @ Xb.T                            # x_tᵀ x_s
+    G *= G
+    G -= X2a @ X2b.T                         # Σ_i x_ti² x_si²
+    G *= 0.5
+    return G
+
+
+def _edge_norms(X: np.ndarray, X2: np.ndarray) -> np.ndarray:
+    """‖e_t‖ for every t, shape (T,). Zero norms are replaced by 1."""
+    sq    = X2.sum(axis=1)
+    norms = np.sqrt(np.maximum(0.5 * (sq * sq - (X2 * X2).sum(axis=1)), 0.0))
+    return np.where(norms == 0, 1.0, norms)
+
+
+def edge_fcd(signal: np.ndarray) -> np.ndarray:
+    """
+    Edge-centric FCD (cosine similarity of edge vectors), shape (T, T).
+
+    Parameters
+    ----------
+    signal : np.ndarray, shape (T, D)
+        Rows = timepoints. Usually z-scored across time.
+
+    Returns
+    -------
+    FCD : np.ndarray, shape (T, T)
+    """
+    X     = np.asarray(signal, dtype=np.float64)
+    X2    = X * X
+    inv_n = 1.0 / _edge_norms(X, X2)
+    FCD   = _edge_gram_block(X, X2, 0, len(X))
+    FCD  *= inv_n[:, None]
+    FCD  *= inv_n[None, :]
+    return FCD
+
+
+# =============================================================================
+# Sliding-window FC
+# =============================================================================
+
+def sliding_window_fc(
+    X:          np.ndarray,
+    window:     int,
+    step:       int = 1,
+    edges:      Optional[tuple[np.ndarray, np.ndarray]] = None,
+    out:        Optional[np.ndarray] = None,
+    dtype:      np.dtype = np.float64,
+    block_size: Optional[int] = 256,
+) -> np.ndarray:
+    """
+    Pearson FC of every sliding window, from running sums.
+
+    The engine keeps running sums of x_i, x_i² and x_i x_j: moving to the
+    next window adds the `step` entering samples and drops the leaving
+    ones, so each window costs O(step · n_edges) instead of the
+    O(window · N²) of re-running np.corrcoef. Updates are evaluated for a
+    block of windows at a time as differences of a cumulative sum, and
+    only the requested edges are ever formed:
+
+        r_ij = (S_ij − S_i S_j / W) / sqrt((S_ii − S_i² / W)(S_jj − S_j² / W))
+
+    Parameters
+    ----------
+    X : np.ndarray, shape (T, N)
+        Rows = timepoints.
+    window : int
+        Window length W (2 <= W <= T).
+    step : int
+        Shift between consecutive windows. Default: 1.
+    edges : (rows, cols) index arrays or None
+        Which FC entries to return. Default: np.triu_indices(N, k=1).
+    out : np.ndarray or None
+        Preallocated (n_windows, n_edges) buffer to fill, e.g. a float32
+        array or memmap. Default: None (allocate a new one).
+    dtype : numpy dtype
+        dtype of the allocated output when out is None. The sums are
+        always accumulated in float64. Default: float64.
+    block_size : int or None
+        Windows per block. Working memory is O((block_size · step + W) ·
+        n_edges); None → all windows in one block. Default: 256.
+
+    Returns
+    -------
+    fc : np.ndarray, shape (n_windows, n_edges)
+        n_windows = (T − W) // step + 1. Pairs involving a constant
+        channel within a window get 0. ``out`` itself if it was given.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    if X.ndim != 2:
+        raise ValueError(f"X must be 2-D (T, N), got shape {X.shape}")
+    T, N = X.shape
+    if not 2 <= window <= T:
+        raise ValueError(f"window must be in [2, T={T}], got {window}.")
+    if step < 1:
+        raise ValueError(f"step must be >= 1, got {step}.")
+    i, j = np.triu_indices(N, k=1) if edges is None else edges
+
+    n_w = (T - window) // step + 1
+    if out is None:
+        out = np.empty((n_w, len(i)), dtype=dtype)
+    elif out.shape != (n_w, len(i)):
+        raise ValueError(
+            f"out must have shape {(n_w, len(i))}, got {out.shape}."
+        )
+
+    # Pearson r is shift-invariant; centring keeps the running sums small
+    Xc = X - X.mean(axis=0)
+    B  = n_w if block_size is None else max(1, int(block_size))
+
+    for w0 in range(0, n_w, B):
+        w1     = min(w0 + B, n_w)
+        seg    = Xc[w0 * step:(w1 - 1) * step + window]     # samples of the block
+        starts = np.arange(w1 - w0) * step
+        ends   = starts + window
+
+        def window_sums(A: np.ndarray) -> np.ndarray:
+            C = np.zeros((len(A) + 1, A.shape[1]))
+            np.cumsum(A, axis=0, out=C[1:])
+            return C[ends] - C[starts]
+
+        s1  = window_sums(seg)                                   # (B, N)
+        var = window_sums(seg * seg) - s1 * s1 / window          # (B, N)
+        cov = window_sums(seg[:, i] * seg[:, j]) - s1[:, i] * s1[:, j] / window
+        den = np.sqrt(np.maximum(var[:, i] * var[:, j], 0.0))
+        out[w0:w1] = np.divide(cov, den, out=np.zeros_like(cov), where=den > 0)
+    return out
+
+
+# =============================================================================
+# Streaming engine
+# =============================================================================
+
+class StreamingFCD:
+    """
+    FCD statistics accumulated block by block in constant memory.
+
+    Parameters
+    ----------
+    window : int
+        Window length in samples. 1 → edge-centric FCD. Default: 1.
+    step : int
+        Window shift in samples (window > 1 only). Default: 1.
+    similarity : str or None
+        'cosine' or 'pearson'. Default: 'cosine' for window == 1 (the only
+        option there), 'pearson' otherwise.
+    block_size : int or None
+        Windows per block. None → all windows in one block (fastest, but
+        memory grows with n_windows²). Default: 512.
+    bins : int or None
+        Histogram bins over [-1, 1], used for the quantile / KS sketch.
+        None disables the histogram. Default: 2000.
+    spill_path : str or None
+        If given, the full FCD is also written to this .npy file (float32
+        memmap, available as ``fcd_``). Default: None.
+
+    Attributes (after fit)
+    ----------------------
+    n_windows_ : int
+    n_pairs_   : int      number of strict-upper-triangle entries
+    mean_      : float
+    variance_  : float    np.var of the strict upper triangle
+    hist_      : np.ndarray (bins,) or None
+    bin_edges_ : np.ndarray (bins + 1,) or None
+    fcd_       : np.memmap (n_windows, n_windows) or None
+
+    Examples
+    --------
+    >>> ts = DL.get_subjectData(s)[s]['timeseries'].T        # (T, N) MEG
+    >>> fcd = StreamingFCD(window=250, step=25).fit(ts)
+    >>> fcd.variance_, fcd.quantile([0.05, 0.5, 0.95])
+    >>> fcd.ks_distance(StreamingFCD(window=250, step=25).fit(ts_sim))
+    """
+
+    def __init__(
+        self,
+        window:     int = 1,
+        step:       int = 1,
+        similarity: Optional[str] = None,
+        block_size: Optional[int] = 512,
+        bins:       Optional[int] = 2000,
+        spill_path: Optional[str] = None,
+    ):
+        if window < 1 or step < 1:
+            raise ValueError(
+                f"window and step must be >= 1, got window={window}, step={step}."
+            )
+        if similarity is None:
+            similarity = 'cosine' if window == 1 else 'pearson'
+        if similarity not in ('cosine', 'pearson'):
+            raise ValueError(
+                f"similarity must be 'cosine' or 'pearson', got '{similarity}'."
+            )
+        if window == 1 and similarity != 'cosine':
+            raise ValueError("Edge-centric FCD (window=1) uses similarity='cosine'.")
+
+        self.window     = window
+        self.step       = step
+        self.similarity = similarity
+        self.block_size = block_size
+        self.bins       = bins
+        self.spill_path = spill_path
+
+        # Set during fit()
+        self.n_windows_: Optional[int]        = None
+        self.n_pairs_:   int                  = 0
+        self.mean_:      float                = float('nan')
+        self.variance_:  float                = float('nan')
+        self.hist_:      Optional[np.ndarray] = None
+        self.bin_edges_: Optional[np.ndarray] = None
+        self.fcd_:       Optional[np.ndarray] = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def fit(self, signal: np.ndarray) -> "StreamingFCD":
+        """
+        Stream the FCD of one recording.
+
+        Parameters
+        ----------
+        signal : np.ndarray, shape (T, N)
+            Rows = timepoints. For window == 1 it should be z-scored
+            across time (as for ECM).
+
+        Returns
+        -------
+        self
+        """
+        X = np.asarray(signal, dtype=np.float64)
+        if X.ndim != 2:
+            raise ValueError(f"signal must be 2-D (T, N), got shape {X.shape}")
+        T = X.shape[0]
+        n_w = T if self.window == 1 else max(0, (T - self.window) // self.step + 1)
+        self.n_windows_ = n_w
+
+        self._reset()
+        if self.spill_path is not None:
+            self.fcd_ = np.lib.format.open_memmap(
+                self.spill_path, mode='w+', dtype=np.float32, shape=(n_w, n_w))
+
+        if self.window == 1:
+            X2    = X * X
+            inv_n = 1.0 / _edge_norms(X, X2)
+            block = lambda w0, w1: (X[w0:w1], X2[w0:w1], inv_n[w0:w1])
+            simil = lambda a, b: _edge_gram(a[0], a[1], b[0], b[1]) \
+                * a[2][:, None] * b[2][None, :]
+        else:
+            iu    = np.triu_indices(X.shape[1], k=1)
+            block = lambda w0, w1: self._fc_vectors(X, w0, w1, iu)
+            simil = lambda a, b: a @ b.T
+
+        B = n_w if self.block_size is None else max(1, int(self.block_size))
+        for a0 in range(0, n_w, B):
+            a1 = min(a0 + B, n_w)
+            Fa = block(a0, a1)
+            for b0 in range(a0, n_w, B):
+                b1 = min(b0 + B, n_w)
+                Fb = Fa if b0 == a0 else block(b0, b1)
+                S  = simil(Fa, Fb)
+                if self.fcd_ is not None:
+                    self.fcd_[a0:a1, b0:b1] = S
+                    self.fcd_[b0:b1, a0:a1] = S.T
+                self._accumulate(S[np.triu_indices(a1 - a0, k=1)] if b0 == a0
+                                 else S.ravel())
+
+        if self.fcd_ is not None:
+            self.fcd_.flush()
+        self.variance_ = self._m2 / self.n_pairs_ if self.n_pairs_ else float('nan')
+        return self
+
+    def quantile(self, q) -> np.ndarray:
+        """
+        Approximate quantiles of the FCD values from the histogram sketch
+        (linear interpolation within bins; error <= one bin width).
+        """
+        self._check_hist()
+        cdf = np.concatenate([[0.0], np.cumsum(self.hist_)]) / self.hist_.sum()
+        return np.interp(q, cdf, self.bin_edges_)
+
+    def cdf(self, x) -> np.ndarray:
+        """Approximate empirical CDF of the FCD values at x."""
+        self._check_hist()
+        cdf = np.concatenate([[0.0], np.cumsum(self.hist_)]) / self.hist_.sum()
+        return np.interp(x, self.bin_edges_, cdf)
+
+    def ks_distance(self, other: "StreamingFCD") -> float:
+        """
+        Kolmogorov–Smirnov distance to another FCD distribution, evaluated
+        on the shared bin edges (both sketches must use the same bins).
+        """
+        self._check_hist()
+        other._check_hist()
+        if len(self.hist_) != len(other.hist_):
+            raise ValueError("Both StreamingFCD objects must use the same bins.")
+        c1 = np.cumsum(self.hist_)  / self.hist_.sum()
+        c2 = np.cumsum(other.hist_) / other.hist_.sum()
+        return float(np.max(np.abs(c1 - c2)))
+
+    # ------------------------------------------------------------------
+    # Private helpers
+    # ------------------------------------------------------------------
+
+    def _reset(self) -> None:
+        self.n_pairs_, self.mean_, self._m2 = 0, 0.0, 0.0
+        if self.bins is not None:
+            self.bin_edges_ = np.linspace(-1.0, 1.0, self.bins + 1)
+            self.hist_      = np.zeros(self.bins, dtype=np.int64)
+
+    def _accumulate(self, vals: np.ndarray) -> None:
+        """Merge one block of FCD values into the running statistics."""
+        if vals.size == 0:
+            return
+        n_b, mean_b = vals.size, float(vals.mean())
+        m2_b  = float(np.sum((vals - mean_b) ** 2))
+        delta = mean_b - self.mean_
+        tot   = self.n_pairs_ + n_b
+        self._m2     += m2_b + delta * delta * self.n_pairs_ * n_b / tot
+        self.mean_   += delta * n_b / tot
+        self.n_pairs_ = tot
+        if self.hist_ is not None:
+            # Similarities live in [-1, 1]; clip round-off at the edges
+            self.hist_ += np.histogram(np.clip(vals, -1.0, 1.0),
+                                       bins=self.bins, range=(-1.0, 1.0))[0]
+
+    def _fc_vectors(
+        self,
+        X:  np.ndarray,
+        w0: int,
+        w1: int,
+        iu: tuple[np.ndarray, np.ndarray],
+    ) -> np.ndarray:
+        """Unit-norm FC vectors of windows [w0, w1), shape (w1 − w0, n_edges)."""
+        seg = X[w0 * self.step:(w1 - 1) * self.step + self.window]
+        F   = sliding_window_fc(seg, self.window, self.step, edges=iu,
+                                block_size=None)
+        if self.similarity == 'pearson':
+            F -= F.mean(axis=1, keepdims=True)
+        norms = np.linalg.norm(F, axis=1, keepdims=True)
+        np.divide(F, norms, out=F, where=norms > 0)
+        return F
+
+    def _check_hist(self) -> None:
+        if self.hist_ is None or self.n_windows_ is None:
+            raise RuntimeError(
+                "StreamingFCD has no histogram: call fit() with bins set."
+            )
@@ -12,6 +12,7 @@ Corresponds to (and refactors):
     Projecter.projectVectorTime()    →  project_timeseries()  (= transform())
     mutualInfo module                →  mutual_information()
     reconstructionError module       →  reconstruction_error()
+                                         reconstruction_error_curve() (all k)
 
 Convention note
 ---------------
@@ -22,7 +23,7 @@ internally — callers always use the Neuroreduce convention.
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import Iterable, Optional, Union
 import warnings
 
 import numpy as np
@@ -33,6 +34,209 @@ from sklearn.feature_selection import mutual_info_classif
 from Neuroreduce.methods.base_laplacian import BaseLaplacianReducer
 
 
+def rsn_indicator_matrix(rsn_labels: np.ndarray) -> np.ndarray:
+    """
+    Binary RSN indicator matrix from per-parcel RSN labels.
+
+    Parameters
+    ----------
+    rsn_labels : np.ndarray, shape (N,)
+        Integer (or any hashable) RSN label per parcel.
+
+    Returns
+    -------
+    rsn_matrix : np.ndarray, shape (N, n_rsn)
+        rsn_matrix[i, r] = 1 if parcel i belongs to the r-th RSN, with
+        RSNs ordered as np.unique(rsn_labels).
+    """
+    _, inverse = np.unique(np.asarray(rsn_labels), return_inverse=True)
+    inverse = inverse.ravel()
+    rsn_matrix = np.zeros((inverse.size, inverse.max() + 1))
+    rsn_matrix[np.arange(inverse.size), inverse] = 1.0
+    return rsn_matrix
+
+
+def project_rsn_vectors_batch(
+    bases:          np.ndarray,
+    rsn_matrix:     np.ndarray,
+    sign_invariant: bool = True,
+) -> np.ndarray:
+    """
+    Project RSN vectors onto one basis or a stack of subject bases.
+
+    All RSN × harmonic coefficients are one matrix product,
+    alpha = Wᵀ R, batched over the leading subject axis — the same values
+    as HarmonicAnalysis.project_rsn_vectors() for each basis.
+
+    Parameters
+    ----------
+    bases : np.ndarray, shape (N, K) or (S, N, K)
+        Harmonic basis, or a stack of per-subject bases (e.g. from
+        BaseLaplacianReducer.fit_batch()).
+    rsn_matrix : np.ndarray, shape (N, n_rsn)
+        RSN vectors, one per column (see rsn_indicator_matrix()).
+    sign_invariant : bool
+        Take |alpha| to handle eigenvector sign ambiguity. Default: True.
+
+    Returns
+    -------
+    alpha : np.ndarray, shape (K, n_rsn) or (S, K, n_rsn)
+    """
+    bases      = np.asarray(bases)
+    rsn_matrix = np.asarray(rsn_matrix, dtype=np.float64)
+    if bases.shape[-2] != rsn_matrix.shape[0]:
+        raise ValueError(
+            f"bases have N={bases.shape[-2]} parcels but rsn_matrix has "
+            f"{rsn_matrix.shape[0]} rows."
+        )
+    alpha = np.swapaxes(bases, -1, -2) @ rsn_matrix
+    if sign_invariant:
+        # Matches Projecter.projectVectorRegion(invert=True):
+        # max(dot(phi, rsn), dot(-phi, rsn)) = |dot(phi, rsn)|
+        np.abs(alpha, out=alpha)
+    return np.round(alpha, 5)
+
+
+def select_harmonics_by_rsn_batch(
+    alpha:    np.ndarray,
+    n_select: int,
+    method:   str = 'max_projection',
+) -> np.ndarray:
+    """
+    Select the n_select most RSN-relevant harmonics, per subject.
+
+    Parameters
+    ----------
+    alpha : np.ndarray, shape (K, n_rsn) or (S, K, n_rsn)
+        RSN projections from project_rsn_vectors_batch().
+    n_select : int
+    method : str
+        'max_projection' or 'sum_projection' (see
+        HarmonicAnalysis.select_harmonics_by_rsn()).
+
+    Returns
+    -------
+    selected_indices : np.ndarray, shape (n_select,) or (S, n_select)
+        Sorted by descending importance.
+    """
+    if method == 'max_projection':
+        importance = alpha.max(axis=-1)
+    elif method == 'sum_projection':
+        importance = alpha.sum(axis=-1)
+    else:
+        raise ValueError(f"Unknown method '{method}'.")
+
+    order = np.flip(np.argsort(importance, axis=-1), axis=-1)
+    return order[..., :n_select]
+
+
+def reconstruction_error_curve(
+    X:           Union[np.ndarray, Iterable[np.ndarray]],
+    basis:       np.ndarray,
+    k_max:       Optional[int] = None,
+    orthonormal: Optional[bool] = None,
+) -> dict:
+    """
+    Reconstruction error for every truncation level k = 1..k_max at once.
+
+    For an orthonormal basis W the reconstruction from the first k columns
+    is X_hat_k = W_k W_kᵀ X, and
+
+        ||X - X_hat_k||² = ||X||² - Σ_{d<=k} ||beta_d||²,   beta = Wᵀ X
+
+    so the whole curve follows from ONE projection and a cumulative sum of
+    squared coefficients, instead of re-projecting and re-reconstructing
+    the signal for each k. The Pearson r between X and X_hat_k (flattened,
+    as in HarmonicAnalysis.reconstruction_error) is obtained the same way.
+
+    Non-orthonormal bases (e.g. the CHARM ``conet``) are orthonormalised
+    with a QR factorisation W = QR. QR is nested — Q[:, :k] spans
+    W[:, :k] for every k — so one factorisation serves all truncation
+    levels. The curve then reports the least-squares reconstruction
+    error onto span(W_k). Columns that are linearly dependent on earlier
+    ones (|R_jj| ≈ 0) add nothing to the reconstruction.
+
+    Parameters
+    ----------
+    X : np.ndarray, shape (N, T) or (S, N, T), or iterable of (N, T)
+        BOLD timeseries. A stack or an iterable (e.g. a generator reading
+        subjects from disk) is processed one subject at a time, so only a
+        single subject is ever held in memory.
+    basis : np.ndarray, shape (N, K)
+        Basis columns, in truncation order.
+    k_max : int or None
+        Largest truncation level. Default: all K columns.
+    orthonormal : bool or None
+        Whether the basis is orthonormal. None detects it from WᵀW ≈ I.
+
+    Returns
+    -------
+    dict with keys:
+        'k'         : np.ndarray (k_max,) — truncation levels 1..k_max
+        'mse'       : np.ndarray (k_max,) or (S, k_max)
+        'rmse'      : np.ndarray (k_max,) or (S, k_max)
+        'pearson_r' : np.ndarray (k_max,) or (S, k_max)
+    """
+    W = np.asarray(basis, dtype=np.float64)
+    if W.ndim != 2:
+        raise ValueError(f"basis must have shape (N, K), got {W.shape}.")
+    k_max = W.shape[1] if k_max is None else int(k_max)
+    if not 1 <= k_max <= W.shape[1]:
+        raise ValueError(
+            f"k_max={k_max} must be between 1 and the number of basis "
+            f"columns K={W.shape[1]}."
+        )
+    W = W[:, :k_max]
+
+    if orthonormal is None:
+        orthonormal = np.allclose(W.T @ W, np.eye(k_max), atol=1e-6)
+    if orthonormal:
+        Q = W
+    else:
+        Q, R = np.linalg.qr(W)                   # (N, k_max), nested spans
+        r_diag = np.abs(np.diag(R))
+        Q = Q * (r_diag > 1e-10 * max(r_diag.max(), 1e-300))
+
+    q_sum = Q.sum(axis=0)                        # (k_max,) = 1ᵀ q_d
+
+    def _curve(X_s):
+        X_s = np.asarray(X_s, dtype=np.float64)
+        if X_s.ndim != 2 or X_s.shape[0] != W.shape[0]:
+            raise ValueError(
+                f"X must have shape ({W.shape[0]}, T), got {X_s.shape}."
+            )
+        n    = X_s.size
+        beta = Q.T @ X_s                         # (k_max, T) — one GEMM
+        # Flattened sums for X and X_hat_k (X_hat_k is an orthogonal
+        # projection, so <X, X_hat_k> = ||X_hat_k||²)
+        s_x   = X_s.sum()
+        s_xx  = np.sum(X_s ** 2)
+        s_hh  = np.cumsum(np.sum(beta ** 2, axis=1))
+        s_h   = np.cumsum(q_sum * beta.sum(axis=1))
+
+        mse   = np.maximum(s_xx - s_hh, 0.0) / n
+        cov   = s_hh - s_x * s_h / n
+        var_x = s_xx - s_x ** 2 / n
+        var_h = s_hh - s_h ** 2 / n
+        with np.errstate(invalid='ignore', divide='ignore'):
+            r = cov / np.sqrt(var_x * var_h)
+        return mse, r
+
+    if isinstance(X, np.ndarray) and X.ndim == 2:
+        mse, r = _curve(X)
+    else:
+        curves = [_curve(X_s) for X_s in X]      # streams over subjects
+        mse = np.array([c[0] for c in curves])
+        r   = np.array([c[1] for c in curves])
+
+    return {
+        'k':         np.arange(1, k_max + 1),
+        'mse':       mse,
+        'rmse':      np.sqrt(mse),
+        'pearson_r': r,
+    }
+
+
 class HarmonicAnalysis:
     """
     Post-hoc analyses on a fitted harmonic reducer.
@@ -96,7 +300,7 @@ class HarmonicAnalysis:
         if rsn_matrix.shape[0] == 1:
             rsn_matrix = rsn_matrix.T   # ensure (N, n_rsn)
 
-        N_rsn, n_rsn = rsn_matrix.shape
+        N_rsn = rsn_matrix.shape[0]
 
         # Choose basis: top-k or all eigenvectors
         if n_harmonics is None or n_harmonics <= self._reducer.k:
@@ -104,28 +308,14 @@ class HarmonicAnalysis:
         else:
             W = self._reducer.get_all_eigenvectors() # (N, N)
         W = W[:, :n_harmonics] if n_harmonics else W
-        n_h = W.shape[1]
 
         # Align dimensions — trim to the smaller of N_rsn and N_basis
         N = min(N_rsn, W.shape[0])
         W         = W[:N, :]
         rsn_matrix = rsn_matrix[:N, :]
 
-        alpha = np.zeros((n_h, n_rsn))
-        for d in range(n_h):
-            phi = W[:, d]                           # (N,)
-            for r in range(n_rsn):
-                rsn = rsn_matrix[:, r]              # (N,)
-                if sign_invariant:
-                    # Matches Projecter.projectVectorRegion(invert=True)
-                    alpha[d, r] = max(
-                        np.dot(phi, rsn),
-                        np.dot(-phi, rsn),
-                    )
-                else:
-                    alpha[d, r] = np.dot(phi, rsn)
-
-        return np.round(alpha, 5)
+        return project_rsn_vectors_batch(W, rsn_matrix,
+                                         sign_invariant=sign_invariant)
 
     # ------------------------------------------------------------------
     # Static analysis: select harmonics by RSN importance
@@ -161,14 +351,7 @@ class HarmonicAnalysis:
             Indices into the harmonic basis of the selected harmonics,
             sorted by descending importance.
         """
-        if method == 'max_projection':
-            importance = alpha.max(axis=1)
-        elif method == 'sum_projection':
-            importance = alpha.sum(axis=1)
-        else:
-            raise ValueError(f"Unknown method '{method}'.")
-
-        return np.argsort(importance)[::-1][:n_select]
+        return select_harmonics_by_rsn_batch(alpha, n_select, method=method)
 
     # ------------------------------------------------------------------
     # Dynamic analysis: project timeseries
@@ -179,6 +362,9 @@ class HarmonicAnalysis:
         X:              np.ndarray,
         sign_invariant: bool = True,
         harmonic_idx:   Optional[np.ndarray] = None,
+        chunk_size:     Optional[int] = None,
+        out:            Optional[np.ndarray] = None,
+        dtype:          np.dtype = np.float64,
     ) -> np.ndarray:
         """
         Project BOLD timeseries onto selected harmonics.
@@ -189,22 +375,42 @@ class HarmonicAnalysis:
             beta[d, t] = max(dot(phi_d, X[:,t]), dot(-phi_d, X[:,t]))
         This preserves projection magnitude regardless of eigenvector sign.
 
+        The student's double loop over harmonics and timepoints is a single
+        matrix product, beta = Wᵀ X, computed here as one GEMM per chunk of
+        timepoints (and per subject for stacked input, via batched matmul).
+
         Parameters
         ----------
-        X : np.ndarray, shape (N, T)
-            BOLD timeseries.
+        X : np.ndarray, shape (N, T) or (S, N, T)
+            BOLD timeseries, optionally a stack of S subjects.
         sign_invariant : bool
             Use per-timepoint sign-invariant projection. Default: True.
         harmonic_idx : np.ndarray of int, or None
             If provided, project only onto these harmonics (e.g. from
             select_harmonics_by_rsn()). If None, use all k basis harmonics.
+        chunk_size : int or None
+            Project at most this many timepoints per GEMM, bounding the
+            temporary memory for very long recordings. Default: None (all
+            T in one product).
+        out : np.ndarray or None
+            Preallocated output of shape (n_selected, T) or
+            (S, n_selected, T). Its dtype takes precedence over ``dtype``.
+        dtype : numpy dtype
+            Computation and output dtype. float32 halves memory and uses
+            single-precision BLAS. Default: float64.
 
         Returns
         -------
-        beta : np.ndarray, shape (n_selected, T)
-            Harmonic coefficients over time.
+        beta : np.ndarray, shape (n_selected, T) or (S, n_selected, T)
+            Harmonic coefficients over time (``out`` if given).
         """
-        X = self._reducer._validate_input(X)   # (N, T)
+        X = np.asarray(X)
+        if X.ndim == 3:
+            # Validate one subject for shape/k; the stack itself is cast
+            # chunk by chunk below instead of being copied up front.
+            self._reducer._validate_input(X[0])
+        else:
+            X = self._reducer._validate_input(X)   # (N, T)
 
         if harmonic_idx is not None:
             # Use selected harmonics from all eigenvectors
@@ -212,25 +418,30 @@ class HarmonicAnalysis:
         else:
             W = self._reducer.get_basis()       # (N, k)
 
-        N, T  = X.shape
-        n_h   = W.shape[1]
-        beta  = np.zeros((n_h, T))
-
-        for t in range(T):
-            x_t = X[:, t]                       # (N,)
-            for d in range(n_h):
-                phi = W[:, d]                   # (N,)
-                if sign_invariant:
-                    # Faithful to Projecter.projectVectorRegion(invert=True):
-                    # max(dot(phi, x), dot(-phi, x)) = |dot(phi, x)|
-                    beta[d, t] = max(
-                        np.dot(phi, x_t),
-                        np.dot(-phi, x_t),
-                    )
-                else:
-                    beta[d, t] = np.dot(phi, x_t)
-
-        return np.round(beta, 5)
+        T   = X.shape[-1]
+        n_h = W.shape[1]
+        shape = X.shape[:-2] + (n_h, T)
+        if out is None:
+            out = np.empty(shape, dtype=dtype)
+        elif out.shape != shape:
+            raise ValueError(
+                f"out must have shape {shape}, got {out.shape}."
+            )
+        dtype = out.dtype
+        Wt    = np.ascontiguousarray(W.T, dtype=dtype)   # (n_h, N)
+
+        step = max(1, T if chunk_size is None else int(chunk_size))
+        for t0 in range(0, T, step):
+            block = out[..., t0:t0 + step]
+            np.matmul(Wt, X[..., t0:t0 + step].astype(dtype, copy=False),
+                      out=block)
+            if sign_invariant:
+                # Faithful to Projecter.projectVectorRegion(invert=True):
+                # max(dot(phi, x), dot(-phi, x)) = |dot(phi, x)|
+                np.abs(block, out=block)
+            np.round(block, 5, out=block)
+
+        return out
 
     # ------------------------------------------------------------------
     # Reconstruction error
@@ -282,6 +493,33 @@ class HarmonicAnalysis:
             'X_hat':     X_hat,
         }
 
+    def reconstruction_error_curve(
+        self,
+        X:     Union[np.ndarray, Iterable[np.ndarray]],
+        k_max: Optional[int] = None,
+    ) -> dict:
+        """
+        Reconstruction error for all k = 1..k_max in a single projection.
+
+        Replaces calling reconstruction_error() in a loop over k with
+        reducers of growing size. Uses the reducer's eigenvectors in
+        ascending-frequency order; see the module-level
+        reconstruction_error_curve() for details.
+
+        Parameters
+        ----------
+        X : np.ndarray, shape (N, T) or (S, N, T), or iterable of (N, T)
+        k_max : int or None
+            Largest truncation level. Default: reducer.k.
+
+        Returns
+        -------
+        dict with keys 'k', 'mse', 'rmse', 'pearson_r'
+        """
+        k_max = self._reducer.k if k_max is None else k_max
+        W = self._reducer.get_all_eigenvectors()
+        return reconstruction_error_curve(X, W, k_max=k_max, orthonormal=True)
+
     # ------------------------------------------------------------------
     # Mutual information between RSN and harmonic projections
     # ------------------------------------------------------------------
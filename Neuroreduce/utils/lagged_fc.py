@@ -0,0 +1,134 @@
+"""
+Neuroreduce/utils/lagged_fc.py
+--------------------------------
+Time-lagged functional connectivity over many lags at once.
+
+The lagged FC at lag τ is the Pearson correlation between channel i at
+time t and channel j at time t + τ, over the T − τ valid timepoints:
+
+    FC_τ[i, j] = corr(x_i[0 : T−τ], x_j[τ : T])
+
+Evaluating it with np.corrcoef costs O(N²·T) per lag. All lags share the
+raw cross-products
+
+    c_ij(τ) = Σ_t x_i(t) x_j(t + τ) = irfft(conj(X̂_i) · X̂_j)[τ],
+
+which one FFT per channel and one inverse FFT per pair give for every lag
+in O(N²·T log T). The segment means and variances that turn c_ij(τ) into
+an exact Pearson r (each lag uses its own truncated windows) come from
+cumulative sums in O(N·T). The result equals the np.corrcoef loop to
+round-off.
+
+Memory is bounded by evaluating the inverse FFTs for blocks of rows i
+(block_size) and keeping only the requested lags, so the full
+(n_fft, N, N) cross-correlation is never held.
+
+The FFT only pays off when several lags share it. A single lag (the
+default τ of CHARMAnalysis) is evaluated directly instead: centre and
+scale the two slices and take one GEMM per subject, O(N²·T) time and
+O(S·T·N) memory.
+
+Convention: signals are (T, N) — rows = timepoints — or (S, T, N) for a
+batch of subjects, as for the ECM helpers in utils/ecm.py.
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+import numpy as np
+from scipy import fft as sp_fft
+
+
+def lagged_fc(
+    X:          np.ndarray,
+    lags:       Sequence[int],
+    block_size: Optional[int] = None,
+    workers:    Optional[int] = None,
+) -> np.ndarray:
+    """
+    Lagged Pearson FC for several lags, optionally for a batch of subjects.
+
+    Parameters
+    ----------
+    X : np.ndarray, shape (T, N) or (S, T, N)
+        Rows = timepoints.
+    lags : sequence of int
+        Lags τ to return, each in [0, T − 2].
+    block_size : int or None
+        Rows i of the FC processed per inverse FFT. Working memory is
+        O(S · n_fft · block_size · N). None → all rows at once. Unused
+        for a single lag (direct GEMM path). Default: None.
+    workers : int or None
+        Threads used by scipy.fft. Default: None (scipy's default).
+
+    Returns
+    -------
+    fc : np.ndarray, shape (n_lags, N, N) or (S, n_lags, N, N)
+        fc[..., l, i, j] = corr(x_i(t), x_j(t + lags[l])). Asymmetric for
+        τ > 0. Pairs involving a constant segment get 0.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    single = X.ndim == 2
+    if single:
+        X = X[np.newaxis]
+    if X.ndim != 3:
+        raise ValueError(f"X must be (T, N) or (S, T, N), got shape {X.shape}")
+    S, T, N = X.shape
+
+    lags = np.atleast_1d(np.asarray(lags, dtype=np.int64))
+    if lags.ndim != 1 or lags.size == 0:
+        raise ValueError("lags must be a non-empty 1-D sequence of integers.")
+    if lags.min() < 0 or lags.max() > T - 2:
+        raise ValueError(f"lags must lie in [0, T-2={T - 2}], got {lags.tolist()}.")
+
+    if lags.size == 1:
+        fc = _single_lag_fc(X, int(lags[0]))[:, np.newaxis]
+        return fc[0] if single else fc
+
+    # Pearson r is shift-invariant; centring keeps the sums small
+    X = X - X.mean(axis=1, keepdims=True)
+
+    # ── Step 1: segment sums and sums of squares for every lag (cumsums) ──
+    C1 = np.zeros((S, T + 1, N))
+    C2 = np.zeros((S, T + 1, N))
+    np.cumsum(X,     axis=1, out=C1[:, 1:])
+    np.cumsum(X * X, axis=1, out=C2[:, 1:])
+    n   = (T - lags).astype(np.float64)                  # (L,) valid samples
+    sA  = C1[:, T - lags]                                # x_i over [0, T−τ)
+    sB  = C1[:, T][:, None] - C1[:, lags]                # x_j over [τ, T)
+    vA  = C2[:, T - lags] - sA * sA / n[:, None]
+    vB  = C2[:, T][:, None] - C2[:, lags] - sB * sB / n[:, None]   # (S, L, N)
+
+    # ── Step 2: raw cross-products c_ij(τ) for the requested lags (FFT) ──
+    # Zero-padding to >= T + max lag avoids circular wrap-around
+    n_fft = sp_fft.next_fast_len(T + int(lags.max()), real=True)
+    F     = sp_fft.rfft(X, n=n_fft, axis=1, workers=workers)      # (S, nf, N)
+    B     = N if block_size is None else max(1, int(block_size))
+    raw   = np.empty((S, len(lags), N, N))
+    for i0 in range(0, N, B):
+        i1   = min(i0 + B, N)
+        spec = np.conj(F[:, :, i0:i1, None]) * F[:, :, None, :]   # (S, nf, b, N)
+        raw[:, :, i0:i1] = sp_fft.irfft(spec, n=n_fft, axis=1,
+                                        workers=workers)[:, lags]
+
+    # ── Step 3: Pearson r per lag ─────────────────────────────────────────
+    cov = raw - sA[..., :, None] * sB[..., None, :] / n[:, None, None]
+    den = np.sqrt(np.maximum(vA[..., :, None] * vB[..., None, :], 0.0))
+    fc  = np.divide(cov, den, out=np.zeros_like(cov), where=den > 0)
+    return fc[0] if single else fc
+
+
+def _single_lag_fc(X: np.ndarray, tau: int) -> np.ndarray:
+    """
+    Lagged FC at one lag, directly from the two slices.
+
+    X is (S, T, N). Returns (S, N, N): corr(x_i[0 : T−τ], x_j[τ : T]).
+    """
+    T = X.shape[1]
+    A = X[:, :T - tau] - X[:, :T - tau].mean(axis=1, keepdims=True)
+    B = X[:, tau:]     - X[:, tau:].mean(axis=1, keepdims=True)
+    cov = np.matmul(A.swapaxes(1, 2), B)                          # (S, N, N)
+    den = np.sqrt(np.einsum('stn,stn->sn', A, A)[:, :, None]
+                  * np.einsum('stn,stn->sn', B, B)[:, None, :])
+    return np.divide(cov, den, out=np.zeros_like(cov), where=den > 0)
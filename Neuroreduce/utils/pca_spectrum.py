@@ -16,16 +16,104 @@ Example
 >>> analyzer = PCASpectrumAnalyzer(reducer)
 >>> analyzer.report()
 >>> analyzer.plot()
+
+The spectrum alone only needs the eigenvalues of the (N, N) covariance,
+so it can also be obtained without fitting PCA at all:
+
+>>> analyzer = PCASpectrumAnalyzer.from_timeseries(DL)   # pooled cohort
+>>> evr = subject_spectra(X_stack, n_jobs=-1)             # (S, N), per subject
+
+subject_spectra() forms all subject covariances as one batched GEMM and
+calls a single stacked ``numpy.linalg.eigvalsh`` per chunk of subjects —
+no eigenvectors, no per-subject sklearn fit.
 """
 
 from __future__ import annotations
 
-from typing import Sequence
+from typing import Optional, Sequence
 
 import numpy as np
 import matplotlib.pyplot as plt
+from joblib import Parallel, delayed, effective_n_jobs
 
 from Neuroreduce.methods.pca import PCAReducer
+from Neuroreduce.streaming import CovarianceAccumulator, iter_subject_timeseries
+
+
+def covariance_spectrum(C: np.ndarray) -> np.ndarray:
+    """
+    Explained-variance ratio spectrum of one or more covariance matrices.
+
+    Parameters
+    ----------
+    C : np.ndarray, shape (N, N) or (S, N, N)
+        Symmetric covariance matrices.
+
+    Returns
+    -------
+    evr : np.ndarray, shape (N,) or (S, N)
+        Eigenvalues in descending order divided by the total variance —
+        the same quantity as PCA's explained_variance_ratio_ with k = N.
+    """
+    C = np.asarray(C, dtype=np.float64)
+    if C.ndim not in (2, 3) or C.shape[-1] != C.shape[-2]:
+        raise ValueError(
+            f"C must have shape (N, N) or (S, N, N), got {C.shape}."
+        )
+    e_val = np.linalg.eigvalsh(C)[..., ::-1]          # stacked, descending
+    np.maximum(e_val, 0.0, out=e_val)                 # round-off below 0
+    total = e_val.sum(axis=-1, keepdims=True)
+    return np.divide(e_val, total, out=np.zeros_like(e_val), where=total > 0)
+
+
+def _chunk_spectra(chunk) -> np.ndarray:
+    """Spectra of a chunk of subjects: batched covariances + eigvalsh."""
+    if isinstance(chunk, np.ndarray):
+        Xc = chunk - chunk.mean(axis=-1, keepdims=True)      # (s, N, T)
+        C  = Xc @ Xc.swapaxes(-1, -2)                        # (s, N, N)
+    else:
+        # Ragged T: one GEMM per subject, still a single eigvalsh call
+        C = np.stack([CovarianceAccumulator().update(X).C for X in chunk])
+    return covariance_spectrum(C)
+
+
+def subject_spectra(X, n_jobs: int = 1) -> np.ndarray:
+    """
+    Per-subject PCA explained-variance spectra from eigenvalues only.
+
+    Equivalent to ``[PCAReducer(k=N).fit(X[s]).explained_variance_ratio_
+    for s in range(S)]`` at a fraction of the cost.
+
+    Parameters
+    ----------
+    X : np.ndarray, shape (S, N, T), or sequence of (N, T) arrays
+        Subject timeseries. A sequence may have different T per subject.
+    n_jobs : int
+        Number of joblib workers; subjects are split into n_jobs
+        contiguous chunks. -1 uses all cores. Default: 1.
+
+    Returns
+    -------
+    evr : np.ndarray, shape (S, N)
+    """
+    if isinstance(X, np.ndarray):
+        if X.ndim != 3:
+            raise ValueError(f"X must have shape (S, N, T), got {X.shape}.")
+        X = X.astype(np.float64, copy=False)
+    else:
+        X = [np.asarray(x, dtype=np.float64) for x in X]
+    S = len(X)
+    if S == 0:
+        raise ValueError("X must contain at least one subject.")
+
+    n_jobs = min(effective_n_jobs(n_jobs), S)
+    if n_jobs == 1:
+        return _chunk_spectra(X)
+    chunks = np.array_split(np.arange(S), n_jobs)
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(_chunk_spectra)(X[c[0]:c[-1] + 1]) for c in chunks
+    )
+    return np.concatenate(results)
 
 
 class PCASpectrumAnalyzer:
@@ -33,7 +121,9 @@ class PCASpectrumAnalyzer:
     Compute and visualize the PCA explained variance spectrum.
 
     Operates on a *fitted* PCAReducer, so no redundant PCA computation
-    is performed.
+    is performed. When only the spectrum is needed, build the analyzer
+    with from_timeseries() or from_covariance() instead: these skip PCA
+    entirely and use the covariance eigenvalues.
 
     Parameters
     ----------
@@ -56,6 +146,59 @@ class PCASpectrumAnalyzer:
             )
         reducer._check_is_fitted()
         self._reducer = reducer
+        self._evr: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_covariance(
+        cls,
+        C: np.ndarray,
+        k: Optional[int] = None,
+    ) -> "PCASpectrumAnalyzer":
+        """
+        Analyzer for the spectrum of an (N, N) covariance matrix.
+
+        Parameters
+        ----------
+        C : np.ndarray, shape (N, N)
+        k : int or None
+            Number of leading components to keep. Default: N.
+        """
+        C = np.asarray(C)
+        if C.ndim != 2:
+            raise ValueError(f"C must have shape (N, N), got {C.shape}.")
+        evr = covariance_spectrum(C)
+        analyzer = cls.__new__(cls)
+        analyzer._reducer = None
+        analyzer._evr     = evr[:k]
+        return analyzer
+
+    @classmethod
+    def from_timeseries(
+        cls,
+        data,
+        subjects: Optional[Sequence] = None,
+        k:        Optional[int] = None,
+    ) -> "PCASpectrumAnalyzer":
+        """
+        Analyzer for the PCA spectrum of (pooled) BOLD, without fitting PCA.
+
+        Parameters
+        ----------
+        data : np.ndarray (N, T) or (S, N, T), iterable of (N, T), or DataLoader
+            A single subject, or subjects pooled as if temporally
+            concatenated (the covariance is accumulated one subject at a
+            time, see Neuroreduce.streaming).
+        subjects : sequence or None
+            DataLoader subject IDs. Default: all study subjects.
+        k : int or None
+            Number of leading components to keep. Default: N.
+        """
+        if isinstance(data, np.ndarray) and data.ndim == 2:
+            data = [data]
+        acc = CovarianceAccumulator().update_from(
+            iter_subject_timeseries(data, subjects)
+        )
+        return cls.from_covariance(acc.covariance(), k=k)
 
     # ------------------------------------------------------------------
     # Properties — thin wrappers around the reducer
@@ -64,16 +207,22 @@ class PCASpectrumAnalyzer:
     @property
     def explained_variance_ratio_(self) -> np.ndarray:
         """Fraction of variance explained by each component. Shape: (k,)."""
+        if self._reducer is None:
+            return self._evr
         return self._reducer.explained_variance_ratio_
 
     @property
     def cumulative_variance_(self) -> np.ndarray:
         """Cumulative explained variance ratio. Shape: (k,)."""
+        if self._reducer is None:
+            return np.cumsum(self._evr)
         return self._reducer.cumulative_explained_variance_
 
     @property
     def k(self) -> int:
-        """Number of components in the fitted reducer."""
+        """Number of components in the fitted reducer (or the spectrum)."""
+        if self._reducer is None:
+            return len(self._evr)
         return self._reducer.k
 
     # ------------------------------------------------------------------
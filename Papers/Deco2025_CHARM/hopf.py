@@ -30,6 +30,7 @@
 #
 # ==========================================================================
 # ==========================================================================
+import numba as nb
 import numpy as np
 
 from Utils import numTricks as nT
@@ -183,4 +184,135 @@ def simulate(
 
     xs = np.array(xs)
 
-    return xs, debug
\ No newline at end of file
+    return xs, debug
+
+
+# ==========================================================================
+# Ensemble integrator
+#
+# simulate() integrates one (G, SC, noise) configuration at a time in
+# Python. simulate_ensemble() advances a batch of independent members with
+# the same Euler-Maruyama scheme and TR subsampling in compiled code: the
+# sampling schedule is computed once, members run in parallel (prange),
+# each member draws from its own seeded MT19937 stream in the same order as
+# randn(N, 2) in simulate(), and only the subsampled x is written.
+# A member seeded with s reproduces np.random.seed(s); simulate(...) up to
+# floating-point summation order.
+# ==========================================================================
+@nb.njit
+def _sampling_schedule(dt, TR, Tmax, burn_in):
+    """Burn-in step count and per-step sampling mask, as in simulate()."""
+    t = 0.0
+    n_burn = 0
+    while t < burn_in:
+        t += dt
+        n_burn += 1
+    n_steps = 0
+    t = 0.0
+    while t < (Tmax - 1) * TR:
+        t += dt
+        n_steps += 1
+    mask = np.zeros(n_steps, dtype=np.bool_)
+    t = 0.0
+    for step in range(n_steps):
+        mask[step] = nT.isInt(t / TR)
+        t += dt
+    return n_burn, mask
+
+
+@nb.njit(parallel=True)
+def _ensemble_kernel(SC, a, omega, G, I_re, I_im, seeds, dt, sigma, n_burn, mask, out):
+    M = G.shape[0]
+    N = a.shape[0]
+    sq = np.sqrt(dt) * sigma
+    for m in nb.prange(M):
+        np.random.seed(seeds[m])            # per-member stream (thread-local state)
+        sc = SC[m % SC.shape[0]]
+        sumSC = np.zeros(N)
+        for i in range(N):
+            for j in range(N):
+                sumSC[i] += sc[i, j]
+        x = 0.1 * np.ones(N)
+        y = 0.1 * np.ones(N)
+        xn = np.empty(N)
+        yn = np.empty(N)
+        k = 0
+        for step in range(n_burn + mask.shape[0]):
+            for i in range(N):
+                xc = 0.0
+                yc = 0.0
+                for j in range(N):
+                    xc += sc[i, j] * x[j]
+                    yc += sc[i, j] * y[j]
+                xc -= sumSC[i] * x[i]
+                yc -= sumSC[i] * y[i]
+                r2 = x[i] * x[i] + y[i] * y[i]
+                dx = (a[i] - r2) * x[i] - omega[i, 0] * y[i] + G[m] * xc + I_re[i]
+                dy = (a[i] - r2) * y[i] + omega[i, 1] * x[i] + G[m] * yc + I_im[i]
+                # same draw order as randn(N, 2): x_i, then y_i
+                xn[i] = x[i] + dt * dx + sq * np.random.standard_normal()
+                yn[i] = y[i] + dt * dy + sq * np.random.standard_normal()
+            x, xn = xn, x
+            y, yn = yn, y
+            if step >= n_burn and mask[step - n_burn]:
+                out[m, k, :] = x
+                k += 1
+
+
+def simulate_ensemble(
+    SC,
+    a,
+    omega,
+    G,
+    dt,
+    sigma,
+    Tmax,
+    TR,
+    I_ext=0.,
+    burn_in=2000,
+    seeds=None,
+):
+    """
+    Hopf simulation of a batch of independent members in compiled code.
+
+    Parameters
+    ----------
+    SC : array (N, N) or (M, N, N)
+        Structural connectivity, shared or one per member.
+    a, omega, dt, sigma, Tmax, TR, I_ext, burn_in :
+        As in simulate(); shared by all members.
+    G : float or array (M,)
+        Global coupling of each member.
+    seeds : sequence of int (M,) or None
+        Seed of each member's noise stream. None -> drawn from the global
+        NumPy generator (so np.random.seed() makes the run reproducible).
+
+    Returns
+    -------
+    xs : array (M, n_samples, N)
+        Subsampled x component of every member (same sampling as simulate()).
+    """
+    SC = np.asarray(SC, dtype=np.float64)
+    if SC.ndim == 2:
+        SC = SC[np.newaxis]
+    N = SC.shape[-1]
+    G = np.atleast_1d(np.asarray(G, dtype=np.float64))
+    M = max(len(G), SC.shape[0]) if seeds is None else len(seeds)
+    if len(G) == 1:
+        G = np.repeat(G, M)
+    if len(G) != M or SC.shape[0] not in (1, M):
+        raise ValueError(f'Inconsistent ensemble size: G has {len(G)} members, '
+                         f'SC {SC.shape[0]}, seeds {M}.')
+    if seeds is None:
+        seeds = np.random.randint(0, 2**31 - 1, size=M)
+    seeds = np.asarray(seeds, dtype=np.int64)
+
+    a = np.broadcast_to(np.asarray(a, dtype=np.float64), (N,)).copy()
+    omega = np.broadcast_to(np.asarray(omega, dtype=np.float64), (N, 2)).copy()
+    I_ext = np.broadcast_to(np.asarray(I_ext) + 0j, (N,))  # to Complex, as in dfun()
+
+    n_burn, mask = _sampling_schedule(dt, TR, Tmax, burn_in)
+    xs = np.empty((M, int(mask.sum()), N))
+    _ensemble_kernel(SC, a, omega, G, I_ext.real.copy(), I_ext.imag.copy(),
+                     seeds, dt, sigma, n_burn, mask, xs)
+    return xs
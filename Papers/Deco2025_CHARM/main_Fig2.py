@@ -56,6 +56,7 @@ from neuronumba.tools.filters import BandPassFilter
 # from neuronumba.tools.matlab_tricks import corr2
 
 from Neuroreduce.methods.charm import CHARMReducer
+from Neuroreduce.utils.fcd import StreamingFCD
 from DataLoaders import HCP_dbs80
 
 
@@ -69,6 +70,7 @@ T_TRAIN = 800    # training timepoints (Ttrain in MATLAB)
 LATDIM  = 7      # number of latent dimensions (k)
 TR      = 0.72   # repetition time (seconds)
 TRIM    = 50     # timepoints to drop from each edge after filtering
+FCD_BLOCK = 2048  # FCD block size (timepoints) for streamed metastability
 
 # MATLAB: indexregion = [1:31, 50:80]  (1-indexed)
 # Python (0-indexed):  [0:31, 49:80]
@@ -116,22 +118,23 @@ def _fcd_variance(zPhi: np.ndarray, edge_rows: np.ndarray, edge_cols: np.ndarray
     FCD[s,t] = cos_sim(edges_s, edges_t)
     where Edges[:,t] = lower-tri of (zPhi[t,:] ⊗ zPhi[t,:]).
 
+    Streamed with Neuroreduce's StreamingFCD: edge inner products come
+    from the node vectors in closed form and the T×T FCD is visited in
+    FCD_BLOCK×FCD_BLOCK blocks, so neither the edge matrix nor the FCD is
+    ever held in memory (the concatenated-group trajectory has T = Tm).
+
     Parameters
     ----------
     zPhi      : (T, D)  z-scored trajectory (rows = timepoints)
     edge_rows : lower-tri row    indices for the D×D outer product
     edge_cols : lower-tri column indices for the D×D outer product
+                (must cover the full strict lower triangle)
     """
-    # Outer product at every timepoint: (T, D, D)
-    outer  = zPhi[:, :, None] * zPhi[:, None, :]
-    # Extract lower-tri edges: (n_edges, T)
-    Edges  = outer[:, edge_rows, edge_cols].T
-    # Cosine-similarity: normalise columns, Gram matrix
-    norms  = np.linalg.norm(Edges, axis=0, keepdims=True)
-    Edges_n = Edges / (norms + 1e-12)
-    FCD    = Edges_n.T @ Edges_n                    # (T, T)
-    r_t, c_t = np.tril_indices(FCD.shape[0], k=-1)
-    return float(np.var(FCD[r_t, c_t]))
+    D = zPhi.shape[1]
+    if len(edge_rows) != D * (D - 1) // 2:
+        raise ValueError("edge_rows/edge_cols must index the full lower triangle.")
+    fcd = StreamingFCD(window=1, block_size=FCD_BLOCK, bins=None)
+    return float(fcd.fit(zPhi).variance_)
 
 
 def compute_metastability(
@@ -2,6 +2,7 @@ import numpy as np
 import scipy.io as sio
 
 from DataLoaders.HCP_dbs80 import HCP
+from Utils.sweep import SweepScheduler, load_results, make_tasks
 from hopf import *
 from signal_processing import *
 import observables as obs
@@ -11,11 +12,48 @@ import observables as obs
 diff_path = './_Data_Produced/results_f_diff_REST_dk62.mat'
 SC_path = './_Data_Produced/SC_dbs80HARDIFULL.mat'
 output_path = './_Data_Produced/results_hopf_fitt_KoP_fineG0203.npz'
+store_path = './_Data_Produced/results_hopf_fitt_KoP_fineG0203.h5'  # resumable sweep store
+n_jobs = -1  # sweep worker processes
+
+
+def simulate_batch(tasks, SC, fc_emp, a, omega, dt, sigma, Tmax, TR, burn_in):
+    # One ensemble simulation for a batch of (G, subject, seed) sweep tasks,
+    # then the per-member analysis. Returns one result dict per task.
+    # ----------------------------------------------------
+    # --- HAND-OFF TO THE SIMULATION  --------------------
+    # ----------------------------------------------------
+    ts_all = simulate_ensemble(
+        SC=SC,
+        a=a,
+        omega=omega,
+        G=[t.param for t in tasks],
+        dt=dt,
+        sigma=sigma,
+        Tmax=Tmax,
+        TR=TR,
+        burn_in=burn_in,
+        seeds=[t.seed for t in tasks],
+    )                                                    # (n_tasks, T, N)
+
+    # ----------------------------------------------------
+    # --- analysis ---------------------------------------
+    # ----------------------------------------------------
+    fc_all = obs.compute_fc(ts_all[:, 50:1150, :])       # (n_tasks, N, N), batched
+    results = []
+    for ts, fc_sim in zip(ts_all, fc_all):
+        signal_filt = filer_fMRI(ts, TR)
+        comp = obs.compare_fc(fc_sim, fc_emp)
+        fitt = comp['corr']
+        err = comp['mse']
+
+        metastability = obs.compute_metastability(ts)
+        phases = compute_phases(signal_filt)
+        kop, KoPMeta = obs.compute_kuramoto(phases)
+        results.append({'corr': fitt, 'mse': err, 'KoP': kop, 'KoPMeta': KoPMeta, 'metastability': metastability})
+    return results
 
 
 def run(seed=None):
-    if seed is not None:
-        np.random.seed(seed)
 
     # ============================================================
     # --- Load data -------------------- -------------------------
@@ -69,43 +107,21 @@ def run(seed=None):
     subj_range = range(num_subjects)
     G_range = np.arange(0.0, 0.7, 0.01)
 
-    # --- Loop over coupling strength ---
+    # --- (G, subject) sweep: resumable, one ensemble per subject's G range ---
+    # The store refuses to resume if SC, fc_emp or any model setting changed
+    tasks = make_tasks(params=G_range, subjects=subj_range, base_seed=0 if seed is None else seed)
+    SweepScheduler(store_path, n_jobs=n_jobs).run(
+        simulate_batch, tasks, batch_size=len(G_range),
+        SC=SC, fc_emp=fc_emp, a=a_vec, omega=omega_vec,
+        dt=dt, sigma=sigma, Tmax=Tmax, TR=TR, burn_in=burn_in,
+    )
+
+    # --- Same layout as before for plot_Fig3B: res['S_<subject>'][G] ---
     res = {}
-    for subject_id in subj_range:  #
-        # --- Loop over simulated subjects ---
-        subj_res = {}
-        for G in G_range:
-            print(f'Simulating subject {subject_id} at G={G}')
-            # ----------------------------------------------------
-            # --- HAND-OFF TO THE SIMULATION  --------------------
-            # ----------------------------------------------------
-            ts, debug = simulate(
-                SC=SC,
-                a=a_vec,
-                omega=omega_vec,
-                G=G,
-                dt=dt,
-                sigma=sigma,
-                Tmax=Tmax,
-                TR=TR,
-                burn_in=burn_in,
-            )
-            print(f'   simulation (G={G}) done!')
-
-            # ----------------------------------------------------
-            # --- analysis ---------------------------------------
-            # ----------------------------------------------------
-            signal_filt = filer_fMRI(ts, TR)
-            fc_sim = obs.compute_fc(ts[50:1150,:])
-            comp = obs.compare_fc(fc_sim, fc_emp)
-            fitt = comp['corr']
-            err = comp['mse']
-
-            metastability = obs.compute_metastability(ts)
-            phases = compute_phases(signal_filt)
-            kop, KoPMeta = obs.compute_kuramoto(phases)
-            subj_res[G] = {'corr': fitt, 'mse': err, 'KoP': kop, 'KoPMeta': KoPMeta, 'metastability': metastability}
-        res['S_' + str(subject_id)] = subj_res
+    for task, values in load_results(store_path, tasks).items():
+        res.setdefault('S_' + str(task.subject), {})[task.param] = \
+            {k: float(v) for k, v in values.items()}
+    res = {s: dict(sorted(res[s].items())) for s in sorted(res, key=lambda s: int(s[2:]))}
     print('Simulation done!')
     np.savez(output_path, **res)
     print(f'Saved {output_path}')
@@ -1,12 +1,15 @@
 import numpy as np
-from scipy.spatial.distance import pdist
 from scipy import stats
 
 import neuronumba.tools.matlab_tricks as mt
 
+from Neuroreduce.fc import batch_fc
+
 
 def compute_fc(ts):
-    cc = np.corrcoef(ts, rowvar=False)  # Pearson correlation coefficients
+    # Pearson FC of a (T, N) signal, or of every signal in an (S, T, N) stack
+    # at once (batched; Neuroreduce works in (N, T), hence the swap)
+    cc = batch_fc(np.swapaxes(ts, -1, -2))
     return cc
 
 
@@ -18,17 +21,45 @@ def compare_fc(fc_sim, fc_emp):
     return {'corr': fitt2, 'mse': err2}
 
 
-def compute_metastability(ts):
-    # Edges
+def compute_metastability(ts, chunk_size=256):
+    """
+    Entropy-based metastability of a (T, N) signal: 0.5·log(2πe·var(d)),
+    with d the pairwise Euclidean distances between the E = N(N-1)/2 edge
+    time courses z_i(t)·z_j(t) (MATLAB: pdist over the rows of edges).
+
+    Cost: O(E²·T) time for the E×E Gram matrix of the edges, computed in
+    chunk_size-row GEMM blocks, plus O(E·T) memory for the edge matrix.
+    The distance vector (E(E-1)/2 values) is never allocated. The node
+    identity of utils/ecm.py, <e_t, e_s> = ((x_t·x_s)² - Σ x_t²x_s²)/2, gives
+    inner products between time points (vectors over edges), not between
+    edges (vectors over time), so it does not apply here. Since every
+    distance enters var(d) through a square root, all E² of them are
+    needed and the cost cannot drop below O(E²) for an exact result.
+    """
+    # Edges: one time course per lower-triangle pair (i, j), shape (n_edges, T)
     N = ts.shape[1]
     Isubdiag = np.tril_indices(N, k=-1)
     zPhi = stats.zscore(ts, axis=0)
-    edges = np.zeros((len(Isubdiag[0]), zPhi.shape[0]))
-    for t in range(zPhi.shape[0]):
-        fcd = np.outer(zPhi[t], zPhi[t])
-        edges[:, t] = fcd[Isubdiag].T
-    FCD = pdist(edges)
-    Metastability2 = 0.5 * np.log(2 * np.pi * np.var(FCD)) + 0.5
+    edges = (zPhi[:, Isubdiag[0]] * zPhi[:, Isubdiag[1]]).T
+    # var(pdist(edges)) without materialising the n_edges*(n_edges-1)/2
+    # distances: Euclidean distances from Gram blocks (||a||^2 + ||b||^2
+    # - 2 a.b), and running moments merged block by block
+    sq = np.einsum('ij,ij->i', edges, edges)
+    n_e = edges.shape[0]
+    n, mean, m2 = 0, 0.0, 0.0
+    for a0 in range(0, n_e, chunk_size):
+        a1 = min(a0 + chunk_size, n_e)
+        d2 = sq[a0:a1, None] + sq[None, a0:] - 2.0 * (edges[a0:a1] @ edges[a0:].T)
+        d = np.sqrt(np.maximum(d2[np.triu_indices(a1 - a0, k=1, m=n_e - a0)], 0.0))
+        if d.size == 0:
+            continue
+        mean_b = d.mean()
+        delta = mean_b - mean
+        tot = n + d.size
+        m2 += np.sum((d - mean_b) ** 2) + delta * delta * n * d.size / tot
+        mean += delta * d.size / tot
+        n = tot
+    Metastability2 = 0.5 * np.log(2 * np.pi * m2 / n) + 0.5
     return Metastability2
 
 
@@ -0,0 +1,11 @@
+# LibBrain/Papers/Deco2025_CHARM/tests/conftest.py
+# --------------------------------------------------
+# Pytest path configuration for the Deco2025_CHARM tests: adds LibBrain/
+# (the repo root) to sys.path, so `from Papers.Deco2025_CHARM import hopf`
+# works however pytest is invoked. Same approach as Neuroreduce/tests.
+import sys
+from pathlib import Path
+
+LIBBRAIN_ROOT = Path(__file__).resolve().parents[3]
+if str(LIBBRAIN_ROOT) not in sys.path:
+    sys.path.insert(0, str(LIBBRAIN_ROOT))
@@ -0,0 +1,37 @@
+"""
+Papers/Deco2025_CHARM/tests/test_observables.py
+-------------------------------------------------
+Tests for observables.compute_metastability against the original
+pdist-based formulation.
+
+observables imports neuronumba's matlab_tricks, so the whole module is
+skipped when neuronumba is not importable.
+
+Run with:  python -m pytest Papers/Deco2025_CHARM/tests -v
+"""
+
+import numpy as np
+import pytest
+from scipy import stats
+from scipy.spatial.distance import pdist
+
+pytest.importorskip("neuronumba")
+
+from Papers.Deco2025_CHARM import observables as obs
+
+
+def _reference(ts):
+    N = ts.shape[1]
+    Isubdiag = np.tril_indices(N, k=-1)
+    zPhi = stats.zscore(ts, axis=0)
+    edges = np.zeros((len(Isubdiag[0]), zPhi.shape[0]))
+    for t in range(zPhi.shape[0]):
+        edges[:, t] = np.outer(zPhi[t], zPhi[t])[Isubdiag]
+    return 0.5 * np.log(2 * np.pi * np.var(pdist(edges))) + 0.5
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 256])
+def test_metastability_matches_pdist(chunk_size):
+    ts = np.random.default_rng(0).standard_normal((80, 9))
+    assert np.isclose(obs.compute_metastability(ts, chunk_size=chunk_size),
+                      _reference(ts))
@@ -1,3 +1,4 @@
 from empirical.transition_matrix import EmpiricalTransitionMatrix
+from empirical.subject_cache import SubjectTransitionCache
 
-__all__ = ["EmpiricalTransitionMatrix"]
\ No newline at end of file
+__all__ = ["EmpiricalTransitionMatrix", "SubjectTransitionCache"]
\ No newline at end of file
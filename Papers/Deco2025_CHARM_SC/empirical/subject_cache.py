@@ -0,0 +1,153 @@
+"""
+Deco2025_CHARM_SC/empirical/subject_cache.py
+----------------------------------------
+Persistent per-subject cache of empirical transition counts.
+
+The empirical side of Model_subjects.m never changes while model
+parameters are being explored, yet EmpiricalTransitionMatrix.compute()
+re-filters every subject, re-detects events and re-counts transitions on
+every call. Transition counts are additive across subjects, so they are
+cached once per subject and any group distribution is rebuilt from the
+cached counts:
+
+    Pm2_group  = sum_s Pm2_s
+    Pstatesemp = distribution_from_counts(Pm2_group)
+
+Cache files are keyed by subject ID and by the event-detection parameters
+(TR, band-pass limits, cut). The per-subject stationary distribution is
+stored alongside the counts and recomputed from them (cheap) whenever
+diffusion_steps or exclude_parcels change.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Callable, Hashable, Sequence
+
+import numpy as np
+import scipy.io as sio
+
+from empirical.transition_matrix import EmpiricalTransitionMatrix
+
+
+class SubjectTransitionCache:
+    """
+    Disk-backed cache of per-subject transition counts and distributions.
+
+    Parameters
+    ----------
+    emp_computer : EmpiricalTransitionMatrix
+        Defines the event-detection pipeline and the distribution step.
+    cache_dir : str
+        Directory holding one .mat file per (subject, event parameters).
+    loader : callable
+        ``loader(subject) -> np.ndarray (N, T)``. Only called on a cache
+        miss, so BOLD data is never loaded for cached subjects.
+
+    Example
+    -------
+        cache = SubjectTransitionCache(
+            emp_computer, '_Data_Produced/transition_cache',
+            loader=lambda s: DL.get_subjectData(s)[s]['timeseries'],
+        )
+        P_subj = cache.subject_distributions(subjects)   # (S, N_valid)
+        p_grp  = cache.group_distribution(subjects[:5])  # (N_valid,)
+    """
+
+    def __init__(
+        self,
+        emp_computer: EmpiricalTransitionMatrix,
+        cache_dir:    str,
+        loader:       Callable[[Hashable], np.ndarray],
+    ):
+        self.emp_computer = emp_computer
+        self.cache_dir    = cache_dir
+        self.loader       = loader
+        self._memory: dict[str, dict] = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
+    def counts(self, subject: Hashable) -> np.ndarray:
+        """Transition count matrix Pm2 for one subject, shape (N, N)."""
+        return self._entry(subject)['counts']
+
+    def distribution(self, subject: Hashable) -> np.ndarray:
+        """Empirical stationary distribution for one subject, shape (N_valid,)."""
+        return self._entry(subject)['p_states']
+
+    def subject_distributions(self, subjects: Sequence[Hashable]) -> np.ndarray:
+        """
+        Stack of per-subject distributions, shape (S, N_valid).
+
+        Suitable as the second argument of a vectorised
+        bhattacharyya_distance(p_model, P_subjects).
+        """
+        return np.stack([self.distribution(s) for s in subjects])
+
+    def group_distribution(self, subjects: Sequence[Hashable]) -> np.ndarray:
+        """
+        Group distribution from summed cached counts, shape (N_valid,).
+
+        Identical to ``emp_computer.compute([ts_s for s in subjects])``.
+        """
+        if not subjects:
+            raise ValueError("subjects must not be empty.")
+        Pm2 = sum(self.counts(s) for s in subjects)
+        return self.emp_computer.distribution_from_counts(Pm2)
+
+    def path(self, subject: Hashable) -> str:
+        """Cache file for a subject under the current event parameters."""
+        params = json.dumps(self.emp_computer.event_params(), sort_keys=True)
+        digest = hashlib.sha1(params.encode()).hexdigest()[:12]
+        return os.path.join(self.cache_dir, f'{subject}_{digest}.mat')
+
+    # -------------------------------------------------------------------------
+    # Private helpers
+    # -------------------------------------------------------------------------
+
+    def _dist_params(self) -> np.ndarray:
+        """Parameters that only affect distribution_from_counts()."""
+        emp = self.emp_computer
+        return np.array([emp.diffusion_steps, *sorted(emp.exclude_parcels)],
+                        dtype=np.int64)
+
+    def _entry(self, subject: Hashable) -> dict:
+        path = self.path(subject)
+        dist_params = self._dist_params()
+
+        entry = self._memory.get(path)
+        if entry is None and os.path.isfile(path):
+            loaded = sio.loadmat(path)
+            entry = {
+                'counts':      loaded['counts'],
+                'p_states':    loaded['p_states'].ravel(),
+                'dist_params': loaded['dist_params'].ravel(),
+            }
+
+        if entry is None:
+            ts = self.loader(subject)
+            counts = self.emp_computer.subject_counts(ts)
+            entry = {'counts': counts}
+
+        if not np.array_equal(entry.get('dist_params', []), dist_params):
+            entry['p_states'] = \
+                self.emp_computer.distribution_from_counts(entry['counts'])
+            entry['dist_params'] = dist_params
+            self._save(path, entry)
+
+        self._memory[path] = entry
+        return entry
+
+    def _save(self, path: str, entry: dict) -> None:
+        # Write-then-rename so an interrupted run never leaves a truncated file
+        tmp = path + '.tmp'
+        sio.savemat(tmp, {
+            **entry,
+            'event_params': json.dumps(self.emp_computer.event_params()),
+        }, appendmat=False)
+        os.replace(tmp, path)
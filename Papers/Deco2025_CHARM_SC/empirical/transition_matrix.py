@@ -126,8 +126,44 @@ class EmpiricalTransitionMatrix:
                     f"All timeseries must have {N} parcels. "
                     f"Got shape {ts.shape}."
                 )
-            events = self._detect_events(ts)
-            Pm2   += self._count_transitions(events)
+            Pm2 += self.subject_counts(ts)
+
+        return self.distribution_from_counts(Pm2)
+
+    def subject_counts(self, ts: np.ndarray) -> np.ndarray:
+        """
+        Transition count matrix Pm2 for a single subject.
+
+        Counts are additive across subjects, so a group distribution is
+        ``distribution_from_counts(sum of subject_counts)``. This is what
+        makes per-subject caching possible (see SubjectTransitionCache).
+
+        Parameters
+        ----------
+        ts : np.ndarray, shape (N, T)
+            Raw BOLD timeseries, Neuroreduce (N, T) convention.
+
+        Returns
+        -------
+        Pm2 : np.ndarray, shape (N, N)
+        """
+        return self._count_transitions(self._detect_events(ts))
+
+    def distribution_from_counts(self, Pm2: np.ndarray) -> np.ndarray:
+        """
+        Stationary distribution from an accumulated transition count matrix.
+
+        Parameters
+        ----------
+        Pm2 : np.ndarray, shape (N, N)
+            Transition counts, summed over one or more subjects.
+
+        Returns
+        -------
+        p_states_emp : np.ndarray, shape (N_valid,)
+            Empirical stationary distribution with excluded parcels removed.
+        """
+        N = Pm2.shape[0]
 
         # Row-normalise Pm2 → Pmatrixemp
         # Handle parcels with zero row-sum (no events detected):
@@ -155,8 +191,8 @@ class EmpiricalTransitionMatrix:
             )
             row_sums[zero_mask] = N   # uniform fallback
 
-        D            = np.diag(row_sums)
-        Pmatrixemp   = LA.inv(D) @ Pm2           # (N, N) row-stochastic
+        # D^{-1} Pm2 as a row scaling (D is diagonal)
+        Pmatrixemp   = Pm2 / row_sums[:, None]   # (N, N) row-stochastic
 
         # Stationary distribution: first row of P^diffusion_steps.
         # See base_geometry.py for explanation of why row 0 is taken.
@@ -166,6 +202,21 @@ class EmpiricalTransitionMatrix:
         # Remove excluded parcels
         return self._remove_excluded(p_states, N)
 
+    def event_params(self) -> dict:
+        """
+        Event-detection parameters that determine subject_counts().
+
+        diffusion_steps and exclude_parcels are deliberately absent: they
+        only enter distribution_from_counts(), so cached counts stay valid
+        when they change.
+        """
+        return {
+            'tr_seconds': float(self.tr_seconds),
+            'flp':        float(self.flp),
+            'fhi':        float(self.fhi),
+            'cut':        int(self.cut),
+        }
+
     # -------------------------------------------------------------------------
     # Private helpers
     # -------------------------------------------------------------------------
@@ -246,22 +297,21 @@ class EmpiricalTransitionMatrix:
             Transition count matrix for this subject.
         """
         N, T   = events.shape
-        Pm2    = np.zeros((N, N))
 
-        for seed in range(N):
-            event_times = np.where(events[seed, :])[0]
-            for t in event_times:
-                # Find the next timepoint where any parcel fires
-                found = False
-                for t2 in range(t + 1, T):
-                    firing_parcels = np.where(events[:, t2])[0]
-                    if len(firing_parcels) > 0:
-                        Pm2[seed, firing_parcels] += 1
-                        found = True
-                        break
-                if not found:
-                    # No subsequent event — count self-transition
-                    Pm2[seed, seed] += 1
+        # Every event at time t transitions to the firing set at the next
+        # timepoint t2 > t where any parcel fires, irrespective of the seed.
+        # Resolve t → t2 once for all t, then accumulate all seeds with a
+        # single matrix product instead of the MATLAB triple loop.
+        fire_times = np.flatnonzero(events.any(axis=0))
+        pos        = np.searchsorted(fire_times, np.arange(T), side='right')
+        has_next   = pos < len(fire_times)
+        next_t     = fire_times[pos[has_next]]
+
+        ev  = events.astype(np.float64)
+        Pm2 = ev[:, has_next] @ ev[:, next_t].T
+
+        # No subsequent event — count self-transitions
+        Pm2[np.diag_indices(N)] += ev[:, ~has_next].sum(axis=1)
 
         return Pm2
 
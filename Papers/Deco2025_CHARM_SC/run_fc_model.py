@@ -10,7 +10,7 @@ Original MATLAB               →   This file
 ------------------------------    --------------------------------
 load schaefercog.mat          →   DL.get_parcellation().get_CoGs()
 load hcp_REST_LR_schaefer1000 →   DL (HCP DataLoader)
-filtfilt + corrcoef           →   BandPassFilter + NeuroNumba FC observable
+filtfilt + corrcoef           →   BandPassFilter + Neuroreduce.fc.batch_fc
 %% HARM SC + %% CHARM SC       →   HARM, CHARM_SC (geometry models)
 inner simulation loop         →   BOLDGenerator.simulate_fc()
 corrcoef(FCemp, FCsim)        →   scipy.stats.pearsonr on lower triangles
@@ -45,11 +45,13 @@ import matplotlib.pyplot as plt
 # ── CHARMsc library ───────────────────────────────────────────────────────────
 from geometry import HARM, CHARM_SC
 from simulation.bold_generator import BOLDGenerator
+from run_model_subjects import pearson_rows
 
 # ── NeuroNumba ────────────────────────────────────────────────────────────────
-from neuronumba.observables.fc import FC as _FCObservable
 from neuronumba.tools.filters import BandPassFilter
 
+from Neuroreduce.fc import batch_fc
+
 # ── Your existing data infrastructure ────────────────────────────────────────
 from DataLoaders.HCP_Schaefer2018 import HCP
 
@@ -81,6 +83,9 @@ EXCLUDE_PARCELS = [554, 907]   # Schaefer1000 NaN parcels (0-indexed)
 # Window size for rolling correlation analysis (matches FCmodel.m: NW=10)
 NW = 10
 
+# Filtered subjects per batched FC call in compute_empirical_fc
+FC_BATCH = 32
+
 
 # =============================================================================
 # Step 1: Compute empirical FC from real BOLD
@@ -132,8 +137,15 @@ def compute_empirical_fc(DL: HCP, n_subjects: int) -> np.ndarray:
     N        = DL.N()
     excl = len(EXCLUDE_PARCELS)
     FC_sum   = np.zeros((N-excl, N-excl))
-    fc_obs   = _FCObservable()
     n_valid  = 0
+    batch    = []   # filtered (N, T') subjects awaiting one batched FC call
+
+    def flush():
+        nonlocal FC_sum, n_valid
+        if batch:
+            FC_sum  += batch_fc(np.stack(batch)).sum(axis=0)
+            n_valid += len(batch)
+            batch.clear()
 
     for subj in subjects:
         ts = DL.get_subjectData(subj)[subj]['timeseries']   # (N, T)
@@ -145,10 +157,12 @@ def compute_empirical_fc(DL: HCP, n_subjects: int) -> np.ndarray:
         # Trim 50 timepoints from each end (MATLAB: tfilt(50:end-50))
         ts_trim = ts_filt[:, 49: -50]                       # (N, T')
 
-        # FC observable expects (T, N)
-        result   = fc_obs.from_fmri(ts_trim.T)
-        FC_sum  += result['FC']
-        n_valid += 1
+        if batch and ts_trim.shape != batch[0].shape:
+            flush()
+        batch.append(ts_trim)
+        if len(batch) == FC_BATCH:
+            flush()
+    flush()
 
     FC_emp = FC_sum / max(n_valid, 1)
     print(f"  Empirical FC computed from {n_valid} valid subjects.")
@@ -254,31 +268,23 @@ def compare_fc(
     # GBC (global brain connectivity) = mean FC per parcel
     gbc_emp = FC_emp.mean(axis=0)   # (N,)
 
-    metrics = {k: np.zeros(n_win) for k in [
-        'corr_harm', 'corr_charm', 'mse_harm', 'mse_charm',
-        'corr_gbc_harm', 'corr_gbc_charm', 'mse_gbc_harm', 'mse_gbc_charm',
-    ]}
-
-    for nn, i in enumerate(range(0, n_win * nw, nw)):
-        end  = min(i + nw, n_reps)
-        FCs  = FC_reps_harm[i:end].mean(axis=0)    # (N, N)
-        FCsC = FC_reps_charm[i:end].mean(axis=0)   # (N, N)
-
+    def window_means(FC_reps: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """All rolling-window mean FCs at once: (n_win, n_edges), (n_win, N)."""
+        if n_reps < nw:                        # single (short) window
+            FCs = FC_reps.mean(axis=0)[None]
+        else:
+            FCs = FC_reps[:n_win * nw].reshape(n_win, nw, N, N).mean(axis=1)
+        return FCs[:, i_lt, j_lt], FCs.mean(axis=1)
+
+    metrics = {}
+    for name, FC_reps in (('harm', FC_reps_harm), ('charm', FC_reps_charm)):
+        fc_vec, gbc = window_means(FC_reps)
         # FC lower-triangle correlation and MSE
-        fcs_vec  = FCs[i_lt, j_lt]
-        fcsc_vec = FCsC[i_lt, j_lt]
-        metrics['corr_harm'][nn],  _  = stats.pearsonr(fc_emp_vec, fcs_vec)
-        metrics['corr_charm'][nn], _  = stats.pearsonr(fc_emp_vec, fcsc_vec)
-        metrics['mse_harm'][nn]   = np.nanmean((fc_emp_vec - fcs_vec)  ** 2)
-        metrics['mse_charm'][nn]  = np.nanmean((fc_emp_vec - fcsc_vec) ** 2)
-
+        metrics[f'corr_{name}']     = pearson_rows(fc_emp_vec, fc_vec)
+        metrics[f'mse_{name}']      = np.nanmean((fc_emp_vec - fc_vec) ** 2, axis=1)
         # GBC correlation and MSE
-        gbc_s  = FCs.mean(axis=0)
-        gbc_sc = FCsC.mean(axis=0)
-        metrics['corr_gbc_harm'][nn],  _ = stats.pearsonr(gbc_emp, gbc_s)
-        metrics['corr_gbc_charm'][nn], _ = stats.pearsonr(gbc_emp, gbc_sc)
-        metrics['mse_gbc_harm'][nn]  = np.nanmean((gbc_emp - gbc_s)  ** 2)
-        metrics['mse_gbc_charm'][nn] = np.nanmean((gbc_emp - gbc_sc) ** 2)
+        metrics[f'corr_gbc_{name}'] = pearson_rows(gbc_emp, gbc)
+        metrics[f'mse_gbc_{name}']  = np.nanmean((gbc_emp - gbc) ** 2, axis=1)
 
     return metrics
 
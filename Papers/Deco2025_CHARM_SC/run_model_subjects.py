@@ -46,6 +46,7 @@ import matplotlib.pyplot as plt
 # ── CHARMsc library ───────────────────────────────────────────────────────────
 from geometry import HARM, CHARM_SC
 from empirical.transition_matrix import EmpiricalTransitionMatrix
+from empirical.subject_cache import SubjectTransitionCache
 
 # ── Our existing data infrastructure ────────────────────────────────────────
 from DataLoaders.HCP_Schaefer2018 import HCP
@@ -63,6 +64,7 @@ EPSILON     = 1400.0
 T_HORIZON   = 2
 DIFF_STEPS  = 50
 OUTPUT_DIR  = '_Data_Produced'
+CACHE_DIR   = f'{OUTPUT_DIR}/transition_cache'   # per-subject counts
 
 # Parcels to exclude: 0-indexed [554, 907] = MATLAB 1-indexed [555, 908]
 # These two parcels have NaN BOLD in the Schaefer 1000 atlas.
@@ -74,7 +76,7 @@ EXCLUDE_PARCELS = [554, 907]
 # Corresponds to MATLAB: -log(nansum(sqrt(p .* q)))
 # =============================================================================
 
-def bhattacharyya_distance(p: np.ndarray, q: np.ndarray) -> float:
+def bhattacharyya_distance(p: np.ndarray, q: np.ndarray) -> float | np.ndarray:
     """
     Bhattacharyya distance between two probability distributions.
 
@@ -83,17 +85,45 @@ def bhattacharyya_distance(p: np.ndarray, q: np.ndarray) -> float:
     Lower = more similar distributions. 0 = identical.
     Matches the MATLAB KLfitt computation.
 
+    The sum runs over the last axis and the leading axes broadcast, so one
+    model distribution can be compared against a whole stack of cached
+    subject distributions in a single array operation:
+        bhattacharyya_distance(p_model, P_subjects)   # (S,)
+
     Parameters
     ----------
-    p, q : np.ndarray, shape (N,)
+    p, q : np.ndarray, shape (..., N)
         Non-negative arrays (need not sum to 1, but should).
 
     Returns
     -------
-    float
+    float if both inputs are 1-D, else np.ndarray of the broadcast
+    leading shape.
+    """
+    bc = np.nansum(np.sqrt(np.asarray(p) * np.asarray(q)), axis=-1)
+    with np.errstate(divide='ignore'):
+        bd = np.where(bc > 0, -np.log(np.where(bc > 0, bc, 1.0)), np.inf)
+    return float(bd) if bd.ndim == 0 else bd
+
+
+def pearson_rows(p: np.ndarray, Q: np.ndarray) -> np.ndarray:
     """
-    bc = np.nansum(np.sqrt(p * q))
-    return float(-np.log(bc)) if bc > 0 else np.inf
+    Pearson correlation between p and every row of Q.
+
+    Vectorised equivalent of [scipy.stats.pearsonr(p, q)[0] for q in Q].
+
+    Parameters
+    ----------
+    p : np.ndarray, shape (N,)
+    Q : np.ndarray, shape (S, N)
+
+    Returns
+    -------
+    np.ndarray, shape (S,)
+    """
+    pc = p - p.mean()
+    Qc = Q - Q.mean(axis=-1, keepdims=True)
+    return (Qc @ pc) / (np.linalg.norm(Qc, axis=-1) * np.linalg.norm(pc))
 
 
 # =============================================================================
@@ -164,19 +194,24 @@ def compute_empirical_distributions(
     DL:         HCP,
     n_subjects: int,
     group_size: int,
-) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    cache_dir:  str = CACHE_DIR,
+) -> np.ndarray:
     """
     Compute empirical parcel state distributions for each subject group.
 
     Divides the first n_subjects into groups of group_size, computes
     Pstatesemp for each group, and returns arrays of per-group metrics.
 
+    Per-subject transition counts are read from (or written to) a
+    SubjectTransitionCache in cache_dir, so BOLD is only loaded, filtered
+    and event-detected the first time a subject is seen with a given set
+    of event-detection parameters. Re-running after changing a model
+    parameter is then bound by the model, not by the data.
+
     Returns
     -------
     pstates_emp : np.ndarray, shape (n_groups, N_valid)
         Per-group empirical distributions.
-    kl_harm  : np.ndarray, shape (n_groups,)   — placeholder, filled later
-    kl_charm : np.ndarray, shape (n_groups,)   — placeholder, filled later
     """
     emp_computer = EmpiricalTransitionMatrix(
         tr_seconds      = DL.TR(),
@@ -186,6 +221,11 @@ def compute_empirical_distributions(
         diffusion_steps = DIFF_STEPS,
         exclude_parcels = EXCLUDE_PARCELS,
     )
+    # Each timeseries is (N, T) in Neuroreduce convention
+    cache = SubjectTransitionCache(
+        emp_computer, cache_dir,
+        loader=lambda subj: DL.get_subjectData(subj)[subj]['timeseries'],
+    )
 
     subjects   = DL.get_groupSubjects('REST1')[:n_subjects]
     n_groups   = max(1, len(subjects) // group_size)
@@ -196,13 +236,7 @@ def compute_empirical_distributions(
     for g in range(n_groups):
         group_subjs = subjects[g * group_size: (g + 1) * group_size]
         print(f"  Group {g + 1}/{n_groups} ({len(group_subjs)} subjects)...")
-
-        # Load timeseries for this group: each is (N, T) in Neuroreduce convention
-        ts_list = [
-            DL.get_subjectData(subj)[subj]['timeseries']
-            for subj in group_subjs
-        ]
-        p_emp = emp_computer.compute(ts_list)   # (N_valid,)
+        p_emp = cache.group_distribution(group_subjs)   # (N_valid,)
         pstates_emp.append(p_emp)
 
     return np.array(pstates_emp)   # (n_groups, N_valid)
@@ -237,17 +271,11 @@ def compare_distributions(
         'kl_harm', 'kl_charm'   : np.ndarray, shape (n_groups,)
         'corr_harm', 'corr_charm': np.ndarray, shape (n_groups,)
     """
-    n_groups = len(pstates_emp)
-    kl_harm   = np.zeros(n_groups)
-    kl_charm  = np.zeros(n_groups)
-    corr_harm = np.zeros(n_groups)
-    corr_charm = np.zeros(n_groups)
-
-    for g, p_emp in enumerate(pstates_emp):
-        kl_harm[g]    = bhattacharyya_distance(p_emp, p_harm)
-        kl_charm[g]   = bhattacharyya_distance(p_emp, p_charm)
-        corr_harm[g], _  = stats.pearsonr(p_harm,  p_emp)
-        corr_charm[g], _ = stats.pearsonr(p_charm, p_emp)
+    # Each metric is one broadcast operation over all groups
+    kl_harm    = bhattacharyya_distance(p_harm,  pstates_emp)
+    kl_charm   = bhattacharyya_distance(p_charm, pstates_emp)
+    corr_harm  = pearson_rows(p_harm,  pstates_emp)
+    corr_charm = pearson_rows(p_charm, pstates_emp)
 
     return {
         'kl_harm':    kl_harm,
@@ -0,0 +1,112 @@
+"""
+CHARMsc/tests/test_empirical.py
+-------------------------------
+Tests for EmpiricalTransitionMatrix and SubjectTransitionCache.
+
+All tests use synthetic BOLD — no real HCP data needed.
+EmpiricalTransitionMatrix filters with neuronumba's BandPassFilter, so
+the whole module is skipped when neuronumba is not importable.
+
+Run with:  python -m pytest tests/ -v
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("neuronumba")
+
+from empirical import EmpiricalTransitionMatrix, SubjectTransitionCache
+
+
+# ── shared parameters ─────────────────────────────────────────────────────────
+
+N = 12
+T = 300
+
+
+# ── fixtures ──────────────────────────────────────────────────────────────────
+
+@pytest.fixture
+def emp():
+    return EmpiricalTransitionMatrix(cut=10, diffusion_steps=10,
+                                     exclude_parcels=[])
+
+
+@pytest.fixture
+def subjects():
+    rng = np.random.default_rng(0)
+    return {f'sub{i}': rng.standard_normal((N, T)) for i in range(4)}
+
+
+def _count_transitions_loop(events):
+    """Reference: direct port of the MATLAB triple loop."""
+    n, t_max = events.shape
+    Pm2 = np.zeros((n, n))
+    for seed in range(n):
+        for t in np.where(events[seed])[0]:
+            for t2 in range(t + 1, t_max):
+                lista = np.where(events[:, t2])[0]
+                if len(lista) > 0:
+                    Pm2[seed, lista] += 1
+                    break
+            else:
+                Pm2[seed, seed] += 1
+    return Pm2
+
+
+# ── EmpiricalTransitionMatrix ─────────────────────────────────────────────────
+
+class TestTransitionCounts:
+
+    def test_matches_matlab_loop(self, emp):
+        rng = np.random.default_rng(1)
+        events = rng.random((N, 80)) < 0.05
+        assert np.array_equal(emp._count_transitions(events),
+                              _count_transitions_loop(events))
+
+    def test_trailing_event_is_self_transition(self, emp):
+        events = np.zeros((3, 5), dtype=bool)
+        events[1, 4] = True
+        Pm2 = emp._count_transitions(events)
+        assert Pm2[1, 1] == 1 and Pm2.sum() == 1
+
+    def test_compute_equals_summed_counts(self, emp, subjects):
+        ts_list = list(subjects.values())
+        Pm2 = sum(emp.subject_counts(ts) for ts in ts_list)
+        assert np.allclose(emp.compute(ts_list),
+                           emp.distribution_from_counts(Pm2))
+
+
+# ── SubjectTransitionCache ────────────────────────────────────────────────────
+
+class TestSubjectTransitionCache:
+
+    def test_group_matches_compute(self, emp, subjects, tmp_path):
+        cache = SubjectTransitionCache(emp, str(tmp_path), subjects.__getitem__)
+        ids = list(subjects)
+        assert np.allclose(cache.group_distribution(ids),
+                           emp.compute([subjects[s] for s in ids]))
+
+    def test_persistent_hit_skips_loader(self, emp, subjects, tmp_path):
+        SubjectTransitionCache(emp, str(tmp_path),
+                               subjects.__getitem__).subject_distributions(list(subjects))
+
+        def fail(_):
+            raise AssertionError("loader called on a cached subject")
+
+        P = SubjectTransitionCache(emp, str(tmp_path),
+                                   fail).subject_distributions(list(subjects))
+        assert P.shape == (len(subjects), N)
+
+    def test_key_depends_on_event_params(self, emp, tmp_path):
+        other = EmpiricalTransitionMatrix(cut=20, exclude_parcels=[])
+        a = SubjectTransitionCache(emp,   str(tmp_path), lambda s: None)
+        b = SubjectTransitionCache(other, str(tmp_path), lambda s: None)
+        assert a.path('sub0') != b.path('sub0')
+
+    def test_diffusion_steps_reuse_counts(self, emp, subjects, tmp_path):
+        cache = SubjectTransitionCache(emp, str(tmp_path), subjects.__getitem__)
+        cache.distribution('sub0')
+        emp.diffusion_steps = 3
+        p = cache.distribution('sub0')
+        assert np.allclose(p, emp.distribution_from_counts(cache.counts('sub0')))
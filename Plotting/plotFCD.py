@@ -30,6 +30,24 @@ def plot_from_fMRI(ts,
     phFCD.saveMatrix = False
 
 
+def plot_streaming_FCD(ts, window, step,
+                       spill_file="./Data_Produced/FCD_streaming.npy", max_display=2000,
+                       axisName="Time windows", matrixName="FC dynamics (FCD)", showAxis='on'):
+    # Sliding-window FCD for long recordings (e.g. MEG_Vidaurre2018, 72500 samples per
+    # subject), where the windows x windows matrix does not fit in RAM. Statistics are
+    # streamed block by block; the full matrix is spilled to a .npy memmap only here,
+    # for plotting, and displayed subsampled to at most max_display windows per side.
+    # ts is in (time, RoIs) format.
+    from Neuroreduce.utils.fcd import StreamingFCD
+    from Plotting.plot_SC_FC import plot_fancy_matrix
+    print(f'plotting streaming FCD (window={window}, step={step})...')
+    fcd = StreamingFCD(window=window, step=step, spill_path=spill_file).fit(ts)
+    stride = max(1, -(-fcd.n_windows_ // max_display))
+    plot_fancy_matrix(fcd.fcd_[::stride, ::stride],
+                      axisName=axisName, matrixName=matrixName, showAxis=showAxis)
+    return fcd
+
+
 # =====================================================================================================
 # =====================================================================================================
 # =====================================================================================================eof
\ No newline at end of file
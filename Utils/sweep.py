@@ -0,0 +1,270 @@
+# --------------------------------------------------------------------------------------
+# Resumable, parallel parameter sweeps.
+#
+# A sweep is a list of independent (parameter, subject, seed) tasks, e.g. the
+# G x subject grid of Papers/Deco2025_CHARM/main_Fig3B.py. SweepScheduler
+# - runs the tasks in a process pool (joblib/loky), with the BLAS threads of
+#   every worker capped so that workers do not oversubscribe the cores;
+# - appends each finished task to an HDF5 store, atomically: the result is
+#   written under a temporary group name and renamed once complete, so a
+#   killed job never leaves a half-written entry behind;
+# - skips tasks that are already in the store when it is restarted, provided
+#   the store was written with the same settings (a fingerprint of the fixed
+#   arguments is kept in the store and checked on every run);
+# - reports progress, throughput and an ETA.
+#
+# Only the parent process writes to the store. Results are dicts of scalars
+# or arrays (one HDF5 dataset each).
+#
+# Usage:
+#     tasks = make_tasks(params=G_range, subjects=range(30), base_seed=42)
+#     SweepScheduler('results.h5', n_jobs=8).run(simulate_one, tasks, SC=SC, dt=dt)
+#     results = load_results('results.h5', tasks)   # {SweepTask: {name: value}}
+#
+# --------------------------------------------------------------------------------------
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import h5py
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs, parallel_config
+from threadpoolctl import threadpool_limits
+
+
+@dataclass(frozen=True)
+class SweepTask:
+    """One independent unit of a sweep."""
+    param: Any
+    subject: Any
+    seed: int
+
+    @property
+    def key(self) -> str:
+        """Stable identifier, used as the HDF5 group name."""
+        return f'param={self.param}|subject={self.subject}|seed={self.seed}'
+
+
+def make_tasks(
+    params: Iterable,
+    subjects: Iterable,
+    n_seeds: int = 1,
+    base_seed: int = 0,
+) -> List[SweepTask]:
+    """
+    Enumerate the (parameter, subject, seed) grid.
+
+    Each task gets its own seed, derived from base_seed and the task's grid
+    position (np.random.SeedSequence), so seeds do not depend on which tasks
+    have already run or on the number of workers.
+
+    Parameters
+    ----------
+    params : iterable
+        Parameter values (e.g. G).
+    subjects : iterable
+        Subject identifiers.
+    n_seeds : int
+        Noise realisations per (parameter, subject). Default: 1.
+    base_seed : int
+        Root seed of the sweep. Default: 0.
+
+    Returns
+    -------
+    list of SweepTask, subject-major (all parameters of a subject together)
+    """
+    params, subjects = list(params), list(subjects)
+    tasks = []
+    for i_s, subject in enumerate(subjects):
+        for i_p, param in enumerate(params):
+            for r in range(n_seeds):
+                seq = np.random.SeedSequence([base_seed, i_s, i_p, r])
+                tasks.append(SweepTask(param, subject, int(seq.generate_state(1)[0] >> 1)))
+    return tasks
+
+
+def settings_fingerprint(settings: Dict[str, Any]) -> str:
+    """sha1 of a dict of scalars / arrays, independent of key order."""
+    digest = hashlib.sha1()
+    for name in sorted(settings):
+        value = np.asarray(settings[name])
+        digest.update(name.encode())
+        digest.update(str((value.dtype.str, value.shape)).encode())
+        digest.update(np.ascontiguousarray(value).tobytes() if value.dtype != object
+                      else repr(settings[name]).encode())
+    return digest.hexdigest()
+
+
+def _format_duration(seconds: float) -> str:
+    """H:MM:SS, without wrapping at 24 h."""
+    if not np.isfinite(seconds):
+        return '--:--:--'
+    seconds = int(seconds)
+    return f'{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}'
+
+
+def _run_batch(fn, batch, batched, blas_threads, kwargs):
+    """Worker: evaluate a batch of tasks with capped BLAS threads."""
+    with threadpool_limits(limits=blas_threads):
+        if batched:
+            results = list(fn(batch, **kwargs))
+        else:
+            results = [fn(task, **kwargs) for task in batch]
+    if len(results) != len(batch):
+        raise ValueError(f'Sweep function returned {len(results)} results for {len(batch)} tasks.')
+    return batch, results
+
+
+class SweepScheduler:
+    """
+    Run a sweep in parallel, checkpointing every finished task.
+
+    Parameters
+    ----------
+    store_path : str
+        HDF5 results file. Created if missing; reused (and its finished tasks
+        skipped) if it exists and was written with the same settings.
+    n_jobs : int
+        Worker processes. -1 uses all cores. Default: 1 (in-process).
+    blas_threads : int
+        BLAS / OpenMP threads per worker. Default: 1.
+    report_every : float
+        Minimum seconds between progress lines. Default: 10.
+    """
+
+    def __init__(self, store_path: str, n_jobs: int = 1, blas_threads: int = 1,
+                 report_every: float = 10.0):
+        self.store_path = store_path
+        self.n_jobs = n_jobs
+        self.blas_threads = blas_threads
+        self.report_every = report_every
+
+    def completed(self) -> set:
+        """Keys of the tasks already in the store."""
+        try:
+            with h5py.File(self.store_path, 'r') as f:
+                return set(f['tasks'].keys()) if 'tasks' in f else set()
+        except FileNotFoundError:
+            return set()
+
+    def run(
+        self,
+        fn: Callable,
+        tasks: Sequence[SweepTask],
+        batch_size: Optional[int] = None,
+        **kwargs,
+    ) -> int:
+        """
+        Run every task not yet in the store.
+
+        Parameters
+        ----------
+        fn : callable
+            fn(task, **kwargs) -> dict of results. With batch_size set,
+            fn(list_of_tasks, **kwargs) -> list of dicts (one per task), so
+            that several tasks can share work (e.g. an ensemble simulation).
+            Must be picklable when n_jobs != 1.
+        tasks : sequence of SweepTask
+        batch_size : int or None
+            Consecutive pending tasks handed to fn at once. Default: None
+            (one task per call).
+        **kwargs :
+            Fixed arguments passed to every fn call. Their fingerprint
+            (settings_fingerprint) is stored; resuming a store written with
+            different arguments raises a ValueError.
+
+        Returns
+        -------
+        int : number of tasks run in this call
+        """
+        fingerprint = settings_fingerprint(kwargs)
+        with h5py.File(self.store_path, 'a') as store:
+            tasks_grp = store.require_group('tasks')
+            stored = store.attrs.get('settings_sha1')
+            if stored is None and len(tasks_grp) == 0:
+                store.attrs['settings_sha1'] = fingerprint
+            elif stored != fingerprint:
+                raise ValueError(
+                    f"Sweep store '{self.store_path}' was written with different settings "
+                    f"(fingerprint {stored}, expected {fingerprint}). Use another store_path."
+                )
+            for name in [k for k in tasks_grp if k.startswith('.tmp')]:
+                del tasks_grp[name]                      # leftovers of a killed run
+
+            done = set(tasks_grp.keys())
+            pending = [t for t in tasks if t.key not in done]
+            print(f'Sweep: {len(tasks)} tasks, {len(tasks) - len(pending)} already done, '
+                  f'{len(pending)} to run.')
+            if not pending:
+                return 0
+
+            batched = batch_size is not None
+            step = max(1, batch_size) if batched else 1
+            batches = [pending[i:i + step] for i in range(0, len(pending), step)]
+
+            n_jobs = min(effective_n_jobs(self.n_jobs), len(batches))
+            t0 = time.perf_counter()
+            if n_jobs == 1:
+                runs = (_run_batch(fn, b, batched, self.blas_threads, kwargs) for b in batches)
+                self._collect(runs, tasks_grp, store, len(pending), t0)
+            else:
+                with parallel_config(backend='loky', inner_max_num_threads=self.blas_threads):
+                    runs = Parallel(n_jobs=n_jobs, return_as='generator_unordered')(
+                        delayed(_run_batch)(fn, b, batched, self.blas_threads, kwargs)
+                        for b in batches)
+                    self._collect(runs, tasks_grp, store, len(pending), t0)
+        return len(pending)
+
+    def _collect(self, runs, tasks_grp, store, n_total, t0):
+        """Write results as they arrive and report throughput / ETA."""
+        n_done, last = 0, t0
+        for batch, results in runs:
+            for task, result in zip(batch, results):
+                self._write(tasks_grp, task, result)
+            store.flush()
+            n_done += len(batch)
+            now = time.perf_counter()
+            if now - last >= self.report_every or n_done == n_total:
+                rate = n_done / (now - t0)
+                eta = (n_total - n_done) / rate if rate > 0 else float('inf')
+                print(f'  {n_done}/{n_total} tasks | {rate:.2f} tasks/s | '
+                      f'ETA {_format_duration(eta)}')
+                last = now
+
+    @staticmethod
+    def _write(tasks_grp, task: SweepTask, result: Dict[str, Any]) -> None:
+        tmp = f'.tmp_{task.key}'
+        if tmp in tasks_grp:
+            del tasks_grp[tmp]
+        grp = tasks_grp.create_group(tmp)
+        grp.attrs['param'] = task.param
+        grp.attrs['subject'] = task.subject
+        grp.attrs['seed'] = task.seed
+        for name, value in result.items():
+            grp.create_dataset(name, data=value)
+        tasks_grp.move(tmp, task.key)                   # commit
+
+
+def load_results(
+    store_path: str,
+    tasks: Optional[Iterable[SweepTask]] = None,
+) -> Dict[SweepTask, Dict[str, Any]]:
+    """
+    Finished tasks of a store, {SweepTask: {name: value}}.
+
+    With tasks given, only those of them that are finished are loaded, so
+    that other sweeps sharing the store (e.g. another base seed) do not
+    leak into the results.
+    """
+    keys = None if tasks is None else {t.key for t in tasks}
+    res = {}
+    with h5py.File(store_path, 'r') as f:
+        for key, grp in f.get('tasks', {}).items():
+            if key.startswith('.tmp') or (keys is not None and key not in keys):
+                continue
+            param, subject = (getattr(v, 'item', lambda: v)()
+                              for v in (grp.attrs['param'], grp.attrs['subject']))
+            task = SweepTask(param, subject, int(grp.attrs['seed']))
+            res[task] = {name: ds[()] for name, ds in grp.items()}
+    return res
@@ -0,0 +1,11 @@
+# LibBrain/Utils/tests/conftest.py
+# ----------------------------------
+# Pytest path configuration for Utils tests: adds LibBrain/ (the root that
+# CONTAINS the Utils folder) to sys.path, so `from Utils.sweep import ...`
+# works however pytest is invoked. Same approach as Neuroreduce/tests.
+import sys
+from pathlib import Path
+
+LIBBRAIN_ROOT = Path(__file__).resolve().parents[2]
+if str(LIBBRAIN_ROOT) not in sys.path:
+    sys.path.insert(0, str(LIBBRAIN_ROOT))
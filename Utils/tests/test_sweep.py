@@ -0,0 +1,116 @@
+"""
+Utils/tests/test_sweep.py
+---------------------------
+Tests for the resumable sweep scheduler (Utils/sweep.py).
+
+Run with:  python -m pytest Utils/tests/test_sweep.py -v
+"""
+
+import h5py
+import numpy as np
+import pytest
+
+from Utils.sweep import SweepScheduler, SweepTask, _format_duration, load_results, make_tasks
+
+
+def _square(task, offset=0.0):
+    return {'value': task.param ** 2 + offset, 'seed': task.seed}
+
+
+def _square_batch(tasks, offset=0.0):
+    return [_square(t, offset) for t in tasks]
+
+
+def _short_batch(tasks):
+    return [{'value': 0.0}]
+
+
+@pytest.fixture
+def tasks():
+    return make_tasks(params=[0.1, 0.2, 0.3], subjects=range(2), n_seeds=2, base_seed=5)
+
+
+def test_tasks_round_trip(tasks, tmp_path):
+    path = str(tmp_path / 'sweep.h5')
+    assert SweepScheduler(path).run(_square, tasks) == len(tasks)
+    res = load_results(path, tasks)
+    assert set(res) == set(tasks)
+    assert len({t.seed for t in tasks}) == len(tasks)
+    for task, values in res.items():
+        assert values['value'] == pytest.approx(task.param ** 2)
+        assert values['seed'] == task.seed
+
+
+def test_seeds_do_not_depend_on_grid_extent():
+    small = make_tasks([0.1, 0.2], range(2), base_seed=5)
+    large = make_tasks([0.1, 0.2, 0.3], range(3), base_seed=5)
+    assert {t.key for t in small} <= {t.key for t in large}
+
+
+def test_rerun_skips_completed(tasks, tmp_path):
+    path = str(tmp_path / 'sweep.h5')
+    sched = SweepScheduler(path)
+    sched.run(_square, tasks[:5])
+    assert sched.run(_square, tasks) == len(tasks) - 5
+    assert sched.run(_square, tasks) == 0
+    assert len(sched.completed()) == len(tasks)
+
+
+def test_load_results_only_requested_tasks(tasks, tmp_path):
+    path = str(tmp_path / 'sweep.h5')
+    other = make_tasks(params=[0.1, 0.2, 0.3], subjects=range(2), base_seed=6)
+    sched = SweepScheduler(path)
+    sched.run(_square, tasks)
+    sched.run(_square, other)
+    assert set(load_results(path, other)) == set(other)
+    assert len(load_results(path)) == len(tasks) + len(other)
+
+
+def test_leftover_tmp_groups_are_purged(tasks, tmp_path):
+    path = str(tmp_path / 'sweep.h5')
+    sched = SweepScheduler(path)
+    sched.run(_square, tasks[:2])
+    with h5py.File(path, 'a') as f:                    # simulate a killed write
+        f['tasks'].create_group(f'.tmp_{tasks[2].key}')
+    assert tasks[2] not in load_results(path)
+    sched.run(_square, tasks)
+    with h5py.File(path, 'r') as f:
+        assert not [k for k in f['tasks'] if k.startswith('.tmp')]
+    assert set(load_results(path)) == set(tasks)
+
+
+def test_batched_matches_unbatched(tasks, tmp_path):
+    a = str(tmp_path / 'a.h5')
+    b = str(tmp_path / 'b.h5')
+    SweepScheduler(a).run(_square, tasks)
+    SweepScheduler(b).run(_square_batch, tasks, batch_size=4)
+    ra, rb = load_results(a), load_results(b)
+    assert all(ra[t]['value'] == rb[t]['value'] for t in tasks)
+
+
+def test_batch_length_mismatch_raises(tasks, tmp_path):
+    with pytest.raises(ValueError, match="returned 1 results"):
+        SweepScheduler(str(tmp_path / 'sweep.h5')).run(_short_batch, tasks, batch_size=3)
+
+
+def test_settings_mismatch_raises(tasks, tmp_path):
+    path = str(tmp_path / 'sweep.h5')
+    SweepScheduler(path).run(_square, tasks[:2], offset=np.zeros(3))
+    SweepScheduler(path).run(_square, tasks, offset=np.zeros(3))   # same settings resume
+    with pytest.raises(ValueError, match="different settings"):
+        SweepScheduler(path).run(_square, tasks, offset=np.ones(3))
+
+
+def test_parallel_workers(tasks, tmp_path):
+    path = str(tmp_path / 'sweep.h5')
+    SweepScheduler(path, n_jobs=2).run(_square_batch, tasks, batch_size=2)
+    assert set(load_results(path)) == set(tasks)
+
+
+def test_task_key_is_stable():
+    assert SweepTask(0.5, 3, 7).key == 'param=0.5|subject=3|seed=7'
+
+
+def test_eta_does_not_wrap_at_one_day():
+    assert _format_duration(30 * 3600 + 61) == '30:01:01'
+    assert _format_duration(float('inf')) == '--:--:--'